@@ -0,0 +1,567 @@
+# benchmark.py
+# Benchmark yang dapat diulang untuk jalur solver, grafik, dan UI.
+#
+#   python benchmark.py -o benchmark_hasil.json
+#   python benchmark.py --baseline benchmark_baseline.json   # exit 1 jika ada regresi
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+from data import DATASET_KAIN
+from gulungan import rencanakan_potong
+from logic import hitung, kurva_keuntungan
+from pareto import frontier_pareto
+from pembelian import CacheKurvaBeli, rencanakan_pembelian
+
+DIREKTORI = os.path.dirname(os.path.abspath(__file__))
+PANJANG_KAIN = (10, 100, 1000, 10000, 100000)
+JUMLAH_UKURAN = (4, 8, 16, 32, 64)
+PERSENTASE_CONTOH = {"S": 30, "M": 30, "L": 20}
+
+# Modul headless tidak boleh menarik dependensi GUI/plotting saat diimpor
+MODUL_HEADLESS = ("logic", "cache", "indeks", "katalog", "instrumentasi", "gulungan", "pembelian", "laporan", "cli",
+                  "layanan", "pareto", "marker", "riwayat")
+MODUL_TERLARANG = ("tkinter", "_tkinter", "matplotlib", "PIL")
+ANGGARAN_IMPOR_LOGIC_MS = 50.0
+
+
+def ukur(fungsi, ulang=5):
+    """Waktu per panggilan (detik): median dan minimum dari beberapa pengulangan"""
+    timer = timeit.Timer(fungsi)
+    jumlah, _ = timer.autorange()
+    waktu = [t / jumlah for t in timer.repeat(repeat=ulang, number=jumlah)]
+    return {"detik": statistics.median(waktu), "min_detik": min(waktu), "panggilan": jumlah}
+
+
+def puncak_memori(fungsi):
+    """Puncak alokasi memori Python (byte) selama satu panggilan"""
+    tracemalloc.start()
+    try:
+        fungsi()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def dataset_sintetis(jumlah_ukuran, seed=0):
+    """Satu kain dengan banyak ukuran (meter 0.8-4.0 m, kelipatan 5 cm)"""
+    rng = random.Random(seed)
+    meter = {}
+    keuntungan = {}
+    for i in range(jumlah_ukuran):
+        ukuran = f"U{i:02d}"
+        meter[ukuran] = round(rng.randrange(16, 81) * 0.05, 2)
+        keuntungan[ukuran] = int(meter[ukuran] * rng.randrange(20000, 40000)) // 1000 * 1000
+    return {"Sintetis": {
+        "meter_per_ukuran": meter,
+        "harga_per_meter": 15000,
+        "keuntungan_per_pakaian": keuntungan,
+        "elastisitas": "Sedang",
+        "rekomendasi_penggunaan": [],
+    }}
+
+
+def bench_panjang_kain():
+    hasil = {}
+    for solver in ("greedy", "exact"):
+        for total in PANJANG_KAIN:
+            hasil[f"{solver}/{total}m"] = ukur(
+                lambda: hitung(total, "Katun", DATASET_KAIN, persentase=PERSENTASE_CONTOH, solver=solver))
+    return hasil
+
+
+def bench_batas():
+    """Solver dengan batas min/maks per ukuran (bounded knapsack untuk mode eksak)"""
+    hasil = {}
+    for solver in ("greedy", "exact"):
+        for total in PANJANG_KAIN:
+            # Kuota sebanding panjang kain agar batas benar-benar aktif
+            batas_max = {"S": int(total * 0.2), "M": int(total * 0.15), "XL": int(total * 0.05)}
+            hasil[f"{solver}/{total}m"] = ukur(lambda: hitung(
+                total, "Katun", DATASET_KAIN, solver=solver, batas_min={"L": int(total * 0.05)}, batas_max=batas_max))
+    return hasil
+
+
+def bench_jumlah_ukuran():
+    hasil = {}
+    for n in JUMLAH_UKURAN:
+        dataset = dataset_sintetis(n)
+        for solver in ("greedy", "exact"):
+            hasil[f"{solver}/{n}_ukuran"] = ukur(lambda: hitung(1000, "Sintetis", dataset, solver=solver))
+    return hasil
+
+
+def bench_per_kain():
+    hasil = {}
+    for jenis_kain in DATASET_KAIN:
+        for solver in ("greedy", "exact"):
+            hasil[f"{solver}/{jenis_kain}"] = ukur(lambda: hitung(1000, jenis_kain, DATASET_KAIN, solver=solver))
+    return hasil
+
+
+def bench_selisih_solver():
+    """Kecepatan dan selisih keuntungan greedy terhadap solver eksak"""
+    rng = random.Random(42)
+    kasus = [(rng.choice(list(DATASET_KAIN)), round(rng.uniform(5, 5000), 1)) for _ in range(200)]
+    hasil = {}
+    for solver in ("greedy", "exact"):
+        mulai = time.perf_counter()
+        for jenis_kain, total in kasus:
+            hitung(total, jenis_kain, DATASET_KAIN, solver=solver)
+        hasil[f"{solver}/200_kasus"] = {"detik": time.perf_counter() - mulai}
+
+    selisih = []
+    for jenis_kain, total in kasus:
+        greedy = hitung(total, jenis_kain, DATASET_KAIN).total_keuntungan
+        exact = hitung(total, jenis_kain, DATASET_KAIN, solver="exact").total_keuntungan
+        selisih.append((exact - greedy) / exact * 100 if exact else 0.0)
+    hasil["selisih_keuntungan_persen"] = {
+        "rata_rata": statistics.mean(selisih),
+        "maksimum": max(selisih),
+        "kasus_greedy_kalah": sum(1 for s in selisih if s > 0),
+    }
+    return hasil
+
+
+def bench_kurva():
+    """Satu sapuan kurva 0..N m vs N/resolusi panggilan hitung() terpisah"""
+    hasil = {}
+    for panjang_maks, resolusi in ((1000, 1.0), (10000, 1.0), (1000, 0.01)):
+        hasil[f"kurva/{panjang_maks}m@{resolusi}m"] = ukur(
+            lambda: kurva_keuntungan("Katun", DATASET_KAIN, panjang_maks, resolusi), ulang=3)
+    titik = [float(p) for p in range(0, 1001)]
+    hasil["hitung_per_titik/1000m@1.0m"] = ukur(
+        lambda: [hitung(p, "Katun", DATASET_KAIN, solver="exact") for p in titik], ulang=3)
+    return hasil
+
+
+def bench_pareto():
+    """Frontier Pareto (keuntungan/sisa/deviasi) tanpa dan dengan persentase, plus ukuran frontier"""
+    hasil = {}
+    for panjang in (100, 1000, 10000):
+        for nama, persentase in (("bebas", None), ("persentase", PERSENTASE_CONTOH)):
+            waktu = ukur(lambda: frontier_pareto(panjang, "Rayon", DATASET_KAIN, persentase), ulang=3)
+            waktu["titik"] = len(frontier_pareto(panjang, "Rayon", DATASET_KAIN, persentase))
+            hasil[f"{nama}/{panjang}m"] = waktu
+    return hasil
+
+
+def bench_marker():
+    """Nesting marker: satu marker penuh (cold), meter efektif semua ukuran (cold vs cache), hitung() berlebar"""
+    from marker import CacheMarker, buat_marker, meter_efektif, pola_kain
+
+    data_kain = DATASET_KAIN["Katun"]
+    pola = {uk: pola_kain(data_kain, uk) for uk in data_kain["meter_per_ukuran"]}
+    hasil = {}
+    for n in (1, 3, 6):
+        waktu = ukur(lambda: buat_marker(pola, {uk: n for uk in pola}, 1.5), ulang=3)
+        waktu["potongan"] = sum(len(p) for p in pola.values()) * n
+        hasil[f"marker_penuh/{n}x"] = waktu
+    hasil["meter_efektif/cold"] = ukur(lambda: meter_efektif(data_kain, 1.5, cache=CacheMarker()), ulang=3)
+    cache = CacheMarker()
+    meter_efektif(data_kain, 1.5, cache=cache)
+    hasil["meter_efektif/cache"] = ukur(lambda: meter_efektif(data_kain, 1.5, cache=cache), ulang=20)
+    hasil["hitung/lebar"] = ukur(lambda: hitung(1000, "Katun", DATASET_KAIN, solver="exact", lebar_kain=1.5),
+                                 ulang=5)
+    return hasil
+
+
+def bench_simulasi():
+    """Monte Carlo susut/cacat: evaluasi rencana dan solusi ulang per undian, 1 proses vs semua CPU"""
+    from simulasi import simulasikan
+
+    rencana = hitung(1000, "Spandex", DATASET_KAIN, persentase=PERSENTASE_CONTOH, solver="exact")
+    hasil = {}
+    for mode in ("evaluasi", "solusi_ulang"):
+        for sampel in (10_000, 200_000):
+            hasil[f"{mode}/{sampel}"] = ukur(lambda: simulasikan(rencana, DATASET_KAIN, sampel, seed=0, mode=mode,
+                                                                 persentase=PERSENTASE_CONTOH, workers=1), ulang=3)
+    for workers in sorted({1, os.cpu_count() or 1}):
+        hasil[f"evaluasi/1000000/{workers}w"] = ukur(
+            lambda: simulasikan(rencana, DATASET_KAIN, 1_000_000, seed=0, workers=workers), ulang=1)
+    return hasil
+
+
+def horizon_sintetis(jumlah_periode, seed=0):
+    """Horizon mingguan acak: kiriman 0-300 m, permintaan 0-60 per ukuran, biaya simpan 50-150 Rp/m"""
+    rng = random.Random(seed)
+    return [{"kiriman": rng.choice((0, 100, 200, 300)), "biaya_simpan": rng.randint(50, 150),
+             "permintaan": {uk: rng.randint(0, 60) for uk in ("S", "M", "L", "XL")}}
+            for _ in range(jumlah_periode)]
+
+
+def bench_jadwal():
+    """Jadwal multi-periode 52 minggu: dingin (semua tabel dihitung) vs ubah satu minggu (tabel lain dari cache)"""
+    from jadwal import CacheTabelPeriode, rencanakan_jadwal
+
+    periode = horizon_sintetis(52)
+    hasil = {"dingin/52": ukur(lambda: rencanakan_jadwal("Rayon", DATASET_KAIN, periode, stok_awal=50,
+                                                         cache_tabel=CacheTabelPeriode()), ulang=3)}
+    cache = CacheTabelPeriode()
+    rencanakan_jadwal("Rayon", DATASET_KAIN, periode, stok_awal=50, cache_tabel=cache)
+    langkah = iter(range(1_000_000))
+
+    def ubah_satu_minggu():
+        # Permintaan minggu 26 selalu baru sehingga tepat satu tabel dihitung ulang
+        periode[25] = dict(periode[25], permintaan={"S": next(langkah) % 500, "M": 40})
+        return rencanakan_jadwal("Rayon", DATASET_KAIN, periode, stok_awal=50, cache_tabel=cache)
+
+    hasil["ubah_satu/52"] = ukur(ubah_satu_minggu, ulang=3)
+    jadwal = ubah_satu_minggu()
+    hasil["ubah_satu/52/gap"] = {
+        "keuntungan_bersih": jadwal.keuntungan_bersih,
+        "batas_atas": jadwal.batas_atas,
+        "gap_persen": 100 * (jadwal.batas_atas - jadwal.keuntungan_bersih) / jadwal.batas_atas,
+    }
+    return hasil
+
+
+def gudang_sintetis(jumlah_gulungan, seed=0):
+    """Gulungan acak 20-150 m (presisi cm) dari semua kain di dataset"""
+    rng = random.Random(seed)
+    kain = list(DATASET_KAIN)
+    return [{"id": f"G{i}", "jenis_kain": rng.choice(kain), "panjang": round(rng.uniform(20, 150), 2)}
+            for i in range(jumlah_gulungan)]
+
+
+def bench_gulungan():
+    """Rencana potong multi-gulungan: tanpa pesanan dan dengan buku pesanan yang mengikat"""
+    hasil = {}
+    for jumlah in (100, 500):
+        gudang = gudang_sintetis(jumlah)
+        pesanan = {"S": 6 * jumlah, "M": 4 * jumlah, "L": 2 * jumlah, "XL": jumlah // 2}
+        hasil[f"tanpa_pesanan/{jumlah}_gulungan"] = ukur(lambda: rencanakan_potong(gudang, DATASET_KAIN), ulang=3)
+        hasil[f"pesanan/{jumlah}_gulungan"] = ukur(
+            lambda: rencanakan_potong(gudang, DATASET_KAIN, pesanan=pesanan), ulang=3)
+        rencana = rencanakan_potong(gudang, DATASET_KAIN, pesanan=pesanan)
+        hasil[f"pesanan/{jumlah}_gulungan/gap"] = {
+            "keuntungan": rencana.total_keuntungan,
+            "batas_atas": rencana.batas_atas,
+            "gap_persen": 100 * (rencana.batas_atas - rencana.total_keuntungan) / rencana.batas_atas,
+        }
+    return hasil
+
+
+def bench_pembelian():
+    """Rencana pembelian dengan anggaran: kurva dingin (tanpa cache) vs hangat, dan selisih terhadap batas LP"""
+    hasil = {}
+    cache = CacheKurvaBeli()
+    for anggaran in (1_000_000, 100_000_000):
+        hasil[f"dingin/{anggaran}"] = ukur(lambda: rencanakan_pembelian(anggaran, DATASET_KAIN, workers=1), ulang=3)
+        hasil[f"hangat/{anggaran}"] = ukur(lambda: rencanakan_pembelian(anggaran, DATASET_KAIN, cache_kurva=cache))
+        rencana = rencanakan_pembelian(anggaran, DATASET_KAIN, meter_maks={"Spandex": 100}, cache_kurva=cache)
+        hasil[f"meter_maks/{anggaran}/gap"] = {
+            "keuntungan_bersih": rencana.keuntungan_bersih,
+            "batas_atas": rencana.batas_atas,
+            "gap_persen": 100 * (rencana.batas_atas - rencana.keuntungan_bersih) / rencana.batas_atas,
+        }
+    return hasil
+
+
+def bench_layanan(jumlah=1000):
+    """Layanan HTTP lokal: pesanan /hitung serentak (satu koneksi per pesanan), throughput dan latensi"""
+    import asyncio
+
+    from layanan import LayananOptimasi, minta
+
+    async def jalankan():
+        async with LayananOptimasi(port=0, workers=1) as layanan:
+            pesanan = [{"jenis_kain": "Katun", "total_kain": 10 + i % 500} for i in range(jumlah)]
+            mulai = time.perf_counter()
+            await asyncio.gather(*(minta("127.0.0.1", layanan.port, "POST", "/hitung", p) for p in pesanan))
+            detik = time.perf_counter() - mulai
+            metrik = layanan.metrik.ringkasan()
+        hitung_ep = metrik["endpoint"]["/hitung"]
+        return {
+            f"hitung/{jumlah}_serentak": {"detik": detik, "pesanan_per_detik": jumlah / detik},
+            "hitung/latensi": {k: hitung_ep[k] for k in ("p50_ms", "p95_ms", "maks_ms")},
+            "hitung/batch": {k: metrik["batch"][k] for k in ("jumlah", "rata_ukuran", "rata_ms")},
+        }
+
+    return asyncio.run(jalankan())
+
+
+def bench_batch():
+    try:
+        from skenario import hitung_batch
+    except ImportError:
+        return {"dilewati": "numpy tidak terpasang"}
+    totals = [float(t) for t in range(10, 2010, 10)]
+    campuran = [{"S": s, "M": 100 - s - 10} for s in range(0, 90, 5)]
+    hasil = {"batch/7_kain_x_200_x_18": ukur(lambda: hitung_batch(DATASET_KAIN, totals, campuran), ulang=3)}
+    hasil["batch/puncak_memori_byte"] = {"byte": puncak_memori(lambda: hitung_batch(DATASET_KAIN, totals, campuran))}
+    return hasil
+
+
+def bench_grafik():
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+    except ImportError:
+        return {"dilewati": "matplotlib tidak terpasang"}
+    from grafik import GrafikProduksi
+    from logic import buat_grafik, gambar_grafik
+
+    a = hitung(100, "Katun", DATASET_KAIN, persentase=PERSENTASE_CONTOH)
+    b = hitung(100, "Katun", DATASET_KAIN, persentase={"S": 20, "M": 40, "L": 20})
+
+    def figure_baru():
+        fig = buat_grafik(a.hasil_produksi, a.meter_per_ukuran, a.total_kain, a.sisa_kain)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    fig = Figure(figsize=(12, 5))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(1, 2)
+    artist = gambar_grafik(ax1, ax2, a.hasil_produksi, a.meter_per_ukuran, a.total_kain, a.sisa_kain)
+    fig.canvas.draw()
+    bergantian = [a, b]
+
+    def update_di_tempat():
+        h = bergantian[0]
+        bergantian.reverse()
+        for bar, jumlah in zip(artist[0], h.hasil_produksi.values()):
+            bar.set_height(jumlah)
+        meter_pakai = [h.meter_per_ukuran[uk] * n for uk, n in h.hasil_produksi.items()]
+        GrafikProduksi._atur_pie(artist[1], artist[2], artist[3], meter_pakai + [h.sisa_kain])
+        fig.canvas.draw()
+
+    return {
+        "grafik/figure_baru": ukur(figure_baru, ulang=3),
+        "grafik/update_di_tempat": ukur(update_di_tempat, ulang=3),
+        "grafik/puncak_memori_byte": {"byte": puncak_memori(figure_baru)},
+    }
+
+
+def bench_laporan(jumlah=24):
+    """Laporan per pesanan (Figure OO + Agg): render tunggal, ekspor paralel, dan ekspor ulang dari cache"""
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        return {"dilewati": "matplotlib tidak terpasang"}
+    import shutil
+    import tempfile
+
+    from laporan import ekspor_laporan, render_laporan
+
+    contoh = hitung(100, "Katun", DATASET_KAIN, persentase=PERSENTASE_CONTOH)
+    daftar = [(f"P{i}", hitung(20 + i, "Katun", DATASET_KAIN)) for i in range(jumlah)]
+    folder = tempfile.mkdtemp(prefix="laporan_bench_")
+    try:
+        hasil = {f"render/{fmt}": ukur(lambda: render_laporan(contoh, os.path.join(folder, f"a.{fmt}")), ulang=3)
+                 for fmt in ("png", "pdf")}
+        for workers in sorted({1, os.cpu_count() or 1}):
+            cache = os.path.join(folder, f"cache_{workers}")
+            mulai = time.perf_counter()
+            for _ in ekspor_laporan(daftar, folder, "png", cache, workers=workers, dataset=DATASET_KAIN):
+                pass
+            hasil[f"ekspor/{jumlah}_png/{workers}_worker"] = {"detik": time.perf_counter() - mulai}
+        mulai = time.perf_counter()
+        for _ in ekspor_laporan(daftar, folder, "png", cache, workers=1, dataset=DATASET_KAIN):
+            pass
+        hasil[f"ekspor/{jumlah}_png/cache"] = {"detik": time.perf_counter() - mulai}
+        return hasil
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def bench_riwayat(jumlah=20_000):
+    """Riwayat run SQLite: simpan per run, COUNT + halaman dalam (filter berindeks), buka satu run"""
+    import shutil
+    import tempfile
+
+    from riwayat import RiwayatRun
+
+    acak = random.Random(0)
+    contoh = [hitung(panjang, kain, DATASET_KAIN) for kain in DATASET_KAIN for panjang in (50, 200)]
+    folder = tempfile.mkdtemp(prefix="riwayat_bench_")
+    riwayat = RiwayatRun(os.path.join(folder, "riwayat.sqlite"))
+    try:
+        mulai = time.perf_counter()
+        for i in range(jumlah):
+            riwayat.simpan(acak.choice(contoh), {"solver": "greedy", "persentase": PERSENTASE_CONTOH},
+                           produk=acak.choice(("Kemeja", "Jas", "Dress")), durasi_ms=1.0, waktu=1.7e9 + i * 60)
+        hasil = {f"simpan/{jumlah}": {"detik": time.perf_counter() - mulai}}
+        kain = next(iter(DATASET_KAIN))
+        for nama, filter_run in (("semua", {}), ("kain_produk", {"jenis_kain": kain, "produk": "Jas"})):
+            total = riwayat.jumlah(**filter_run)
+            hasil[f"halaman/{nama}"] = ukur(
+                lambda: (riwayat.jumlah(**filter_run), riwayat.halaman(total // 2, 100, **filter_run)), ulang=5)
+        hasil["halaman/urut_keuntungan"] = ukur(lambda: riwayat.halaman(jumlah // 2, 100, "keuntungan"), ulang=5)
+        hasil["muat_run"] = ukur(lambda: riwayat.muat(jumlah // 2).hasil(), ulang=20)
+        return hasil
+    finally:
+        riwayat.tutup()
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def bench_memori_solver():
+    return {
+        f"{solver}/100000m/puncak_memori_byte": {"byte": puncak_memori(
+            lambda: hitung(100000, "Rayon", DATASET_KAIN, solver=solver))}
+        for solver in ("greedy", "exact")
+    }
+
+
+def bench_cold_start(ulang=5):
+    """Waktu proses baru sampai modul selesai diimpor (termasuk startup interpreter)"""
+    hasil = {}
+    for modul in ("logic", "ui"):
+        waktu = []
+        for _ in range(ulang):
+            mulai = time.perf_counter()
+            proses = subprocess.run([sys.executable, "-c", f"import {modul}"], cwd=DIREKTORI,
+                                    capture_output=True)
+            waktu.append(time.perf_counter() - mulai)
+            if proses.returncode != 0:
+                hasil[f"impor/{modul}"] = {"dilewati": proses.stderr.decode(errors="replace")[-200:]}
+                break
+        else:
+            hasil[f"impor/{modul}"] = {"detik": statistics.median(waktu), "min_detik": min(waktu)}
+    return hasil
+
+
+def cek_anggaran_impor(anggaran_ms=ANGGARAN_IMPOR_LOGIC_MS):
+    """
+    Memeriksa di proses baru bahwa modul headless tidak mengimpor GUI/plotting,
+    bahwa `import ui` belum memuat matplotlib, dan bahwa `import logic` di bawah anggaran waktu.
+    """
+    hasil = {}
+    kode = ("import sys, time; t = time.perf_counter(); import {modul}; "
+            "print((time.perf_counter() - t) * 1000); "
+            "print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}} & set({terlarang!r}))))")
+    for modul in MODUL_HEADLESS + ("ui",):
+        terlarang = MODUL_TERLARANG if modul != "ui" else ("matplotlib", "PIL")
+        proses = subprocess.run([sys.executable, "-c", kode.format(modul=modul, terlarang=terlarang)],
+                                cwd=DIREKTORI, capture_output=True, text=True)
+        if proses.returncode != 0:
+            hasil[f"impor/{modul}"] = {"dilewati": proses.stderr[-200:]}
+            continue
+        baris = proses.stdout.splitlines()
+        ms = float(baris[0])
+        dimuat = baris[1].split() if len(baris) > 1 else []
+        hasil[f"impor/{modul}"] = {"ms": ms, "terlarang": dimuat,
+                                   "lolos": not dimuat and (modul != "logic" or ms <= anggaran_ms)}
+    return hasil
+
+
+def bench_ui():
+    """Jalur tampilkan_hasil di OptimasiApp (dilewati jika tidak ada display)"""
+    try:
+        import tkinter
+    except ImportError as e:
+        return {"dilewati": str(e)}
+    from ui import OptimasiApp
+    try:
+        app = OptimasiApp()
+    except tkinter.TclError as e:
+        return {"dilewati": str(e)}
+    try:
+        app.withdraw()
+        a = hitung(100, "Katun", DATASET_KAIN, persentase=PERSENTASE_CONTOH)
+        b = hitung(100, "Katun", DATASET_KAIN, persentase={"S": 20, "M": 40, "L": 20})
+        bergantian = [a, b]
+
+        def tampilkan():
+            app.tampilkan_hasil(bergantian[0])
+            bergantian.reverse()
+            app.update()
+
+        return {"ui/tampilkan_hasil": ukur(tampilkan, ulang=3)}
+    finally:
+        app.destroy()
+
+
+GRUP = {
+    "panjang_kain": bench_panjang_kain,
+    "batas": bench_batas,
+    "jumlah_ukuran": bench_jumlah_ukuran,
+    "per_kain": bench_per_kain,
+    "selisih_solver": bench_selisih_solver,
+    "kurva": bench_kurva,
+    "pareto": bench_pareto,
+    "marker": bench_marker,
+    "gulungan": bench_gulungan,
+    "pembelian": bench_pembelian,
+    "jadwal": bench_jadwal,
+    "layanan": bench_layanan,
+    "batch": bench_batch,
+    "simulasi": bench_simulasi,
+    "grafik": bench_grafik,
+    "laporan": bench_laporan,
+    "riwayat": bench_riwayat,
+    "memori_solver": bench_memori_solver,
+    "cold_start": bench_cold_start,
+    "anggaran_impor": cek_anggaran_impor,
+    "ui": bench_ui,
+}
+
+
+def bandingkan(hasil, baseline, toleransi):
+    """Daftar metrik waktu/memori yang lebih buruk dari baseline melebihi toleransi"""
+    regresi = []
+    for grup, metrik in hasil.items():
+        for nama, nilai in metrik.items():
+            acuan = baseline.get(grup, {}).get(nama, {})
+            for kunci in ("detik", "byte"):
+                if kunci in nilai and kunci in acuan and acuan[kunci] > 0:
+                    rasio = nilai[kunci] / acuan[kunci]
+                    if rasio > 1 + toleransi:
+                        regresi.append(f"{grup}/{nama}: {acuan[kunci]:.6g} -> {nilai[kunci]:.6g} {kunci} (x{rasio:.2f})")
+    return regresi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark solver, grafik, dan UI")
+    parser.add_argument("-o", "--output", default="benchmark_hasil.json")
+    parser.add_argument("-g", "--grup", nargs="*", choices=sorted(GRUP), help="Default: semua grup")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--toleransi", type=float, default=0.25, help="Batas perlambatan relatif (default 0.25)")
+    args = parser.parse_args(argv)
+
+    hasil = {}
+    for nama in args.grup or GRUP:
+        print(f"[benchmark] {nama} ...", file=sys.stderr)
+        hasil[nama] = GRUP[nama]()
+
+    laporan = {
+        "meta": {
+            "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu": os.cpu_count(),
+        },
+        "hasil": hasil,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(laporan, f, indent=2)
+    print(f"[benchmark] hasil ditulis ke {args.output}", file=sys.stderr)
+
+    gagal = [f"{nama}: {nilai}" for nama, nilai in hasil.get("anggaran_impor", {}).items()
+             if nilai.get("lolos") is False]
+    for baris in gagal:
+        print(f"ANGGARAN IMPOR {baris}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["hasil"]
+        regresi = bandingkan(hasil, baseline, args.toleransi)
+        for baris in regresi:
+            print(f"REGRESI {baris}")
+        return 1 if regresi or gagal else 0
+    return 1 if gagal else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# cache.py
+# Memoisasi hasil hitung(): LRU di memori + penyimpanan SQLite opsional.
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from logic import HasilProduksi, fase_instrumen, hitung, ke_basis_poin, ke_meter, ke_mm
+
+
+def hash_kain(data_kain):
+    """Hash isi definisi satu kain; berubah otomatis jika dataset kain diubah"""
+    teks = json.dumps(data_kain, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(teks.encode("utf-8")).hexdigest()
+
+
+def normalisasi_input(total_kain, ukuran_fokus=None, optimasi_sisa=False, persentase=None, solver="greedy",
+                      batas_min=None, batas_max=None, lebar_kain=None):
+    """
+    Menormalkan input sehingga input yang setara menghasilkan kunci yang sama.
+
+    Returns:
+        Tuple: (total_mm, ukuran_fokus, optimasi_sisa, persentase dalam basis poin, solver,
+        batas_min, batas_max, lebar_mm) yang sudah dinormalkan
+    """
+    # Kunci memakai satuan bulat yang sama dengan inti solver (mm, basis poin)
+    total_mm = ke_mm(total_kain)
+    fokus = tuple(sorted(ukuran_fokus)) if ukuran_fokus else None
+    persen = None
+    if persentase:
+        # Nilai 0 tidak mempengaruhi hasil hitung(), jadi dibuang dari kunci
+        persen = tuple(sorted((uk, ke_basis_poin(v)) for uk, v in persentase.items() if ke_basis_poin(v) != 0)) or None
+    # Minimum 0 tidak berpengaruh; maksimum kosong berarti tidak dibatasi
+    bmin = tuple(sorted((uk, int(v)) for uk, v in (batas_min or {}).items() if v not in (None, "") and int(v) > 0))
+    bmax = tuple(sorted((uk, int(v)) for uk, v in (batas_max or {}).items() if v not in (None, "")))
+    # Lebar gulungan mengubah meter efektif per ukuran (nesting marker), jadi ikut kunci
+    lebar_mm = ke_mm(lebar_kain) if lebar_kain else None
+    return total_mm, fokus, bool(optimasi_sisa), persen, solver, bmin or None, bmax or None, lebar_mm
+
+
+class CacheHasil:
+    """
+    Cache hasil hitung() dengan LRU terbatas dan penyimpanan SQLite opsional.
+
+    Kunci berisi hash isi kain, sehingga entri otomatis tidak terpakai lagi
+    (dan dihapus) ketika definisi kain di dataset berubah.
+    """
+
+    def __init__(self, kapasitas=256, path_db=None):
+        self.kapasitas = kapasitas
+        self.hit = 0
+        self.miss = 0
+        self._lru = OrderedDict()
+        self._hash_terakhir = {}  # jenis_kain -> hash kain yang terakhir dipakai
+        self._lock = threading.Lock()
+        self._db = None
+        if path_db:
+            self._db = sqlite3.connect(path_db, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS hasil ("
+                "kunci TEXT PRIMARY KEY, jenis_kain TEXT NOT NULL, hash_kain TEXT NOT NULL, nilai TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_hasil_kain ON hasil (jenis_kain)")
+            self._db.commit()
+
+    def kunci(self, jenis_kain, hash_isi, total_mm, ukuran_fokus, optimasi_sisa, persentase, solver,
+              batas_min=None, batas_max=None, lebar_mm=None):
+        bagian = [jenis_kain, hash_isi, total_mm, ukuran_fokus, optimasi_sisa, persentase, solver, batas_min, batas_max]
+        if lebar_mm is not None:
+            # Hanya ditambahkan jika dipakai, agar kunci lama di SQLite tetap berlaku
+            bagian.append(lebar_mm)
+        teks = json.dumps(bagian, ensure_ascii=False)
+        return hashlib.sha1(teks.encode("utf-8")).hexdigest()
+
+    def hitung(self, total_kain, jenis_kain, dataset, ukuran_fokus=None, optimasi_sisa=False, persentase=None,
+               solver="greedy", indeks=None, instrumen=None, batas_min=None, batas_max=None, lebar_kain=None):
+        """Sama dengan logic.hitung(), tetapi hasil diambil dari cache jika tersedia"""
+        if jenis_kain not in dataset:
+            return hitung(total_kain, jenis_kain, dataset, ukuran_fokus, optimasi_sisa, persentase, solver, indeks,
+                          instrumen, batas_min, batas_max, lebar_kain)
+
+        total_mm, fokus, optimasi_sisa, persen, solver, bmin, bmax, lebar_mm = normalisasi_input(
+            total_kain, ukuran_fokus, optimasi_sisa, persentase, solver, batas_min, batas_max, lebar_kain)
+        hash_isi = hash_kain(dataset[jenis_kain])
+        kunci = self.kunci(jenis_kain, hash_isi, total_mm, fokus, optimasi_sisa, persen, solver, bmin, bmax,
+                           lebar_mm)
+
+        with fase_instrumen(instrumen, "cache") as catat, self._lock:
+            self._periksa_versi(jenis_kain, hash_isi)
+            hasil = self._lru.get(kunci)
+            if hasil is not None:
+                self._lru.move_to_end(kunci)
+                self.hit += 1
+            else:
+                hasil = self._baca_db(kunci)
+                if hasil is not None:
+                    self.hit += 1
+                    self._simpan_lru(kunci, hasil)
+                else:
+                    self.miss += 1
+            if catat is not None:
+                catat(hit=int(hasil is not None), miss=int(hasil is None))
+        if hasil is not None:
+            # Setiap pemanggil mendapat salinan sendiri: perubahan di UI/riwayat tidak bocor ke hit berikutnya
+            return copy.deepcopy(hasil)
+
+        hasil = hitung(ke_meter(total_mm), jenis_kain, dataset, list(fokus) if fokus else None, optimasi_sisa,
+                       {uk: bp / 100 for uk, bp in persen} if persen else None, solver, indeks, instrumen,
+                       dict(bmin) if bmin else None, dict(bmax) if bmax else None,
+                       ke_meter(lebar_mm) if lebar_mm else None)
+
+        with self._lock:
+            self._simpan_lru(kunci, copy.deepcopy(hasil))
+            self._tulis_db(kunci, jenis_kain, hash_isi, hasil)
+        return hasil
+
+    def statistik(self):
+        total = self.hit + self.miss
+        return {
+            "hit": self.hit,
+            "miss": self.miss,
+            "rasio_hit": self.hit / total if total else 0.0,
+            "ukuran": len(self._lru),
+            "kapasitas": self.kapasitas,
+        }
+
+    def bersihkan(self):
+        with self._lock:
+            self._lru.clear()
+            self._hash_terakhir.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM hasil")
+                self._db.commit()
+
+    def tutup(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _periksa_versi(self, jenis_kain, hash_isi):
+        # Definisi kain berubah: buang semua entri lama untuk kain tersebut
+        if self._hash_terakhir.get(jenis_kain) == hash_isi:
+            return
+        if jenis_kain in self._hash_terakhir:
+            for k in [k for k, v in self._lru.items() if v.jenis_kain == jenis_kain]:
+                del self._lru[k]
+        self._hash_terakhir[jenis_kain] = hash_isi
+        if self._db is not None:
+            self._db.execute("DELETE FROM hasil WHERE jenis_kain = ? AND hash_kain != ?", (jenis_kain, hash_isi))
+            self._db.commit()
+
+    def _simpan_lru(self, kunci, hasil):
+        self._lru[kunci] = hasil
+        self._lru.move_to_end(kunci)
+        while len(self._lru) > self.kapasitas:
+            self._lru.popitem(last=False)
+
+    def _baca_db(self, kunci):
+        if self._db is None:
+            return None
+        baris = self._db.execute("SELECT nilai FROM hasil WHERE kunci = ?", (kunci,)).fetchone()
+        if baris is None:
+            return None
+        nilai = json.loads(baris[0])
+        return HasilProduksi(nilai["hasil_produksi"], nilai["total_keuntungan"], nilai["sisa_kain"],
+                             nilai["total_kain"], nilai["jenis_kain"], nilai["meter_per_ukuran"], nilai.get("kendala"))
+
+    def _tulis_db(self, kunci, jenis_kain, hash_isi, hasil):
+        if self._db is None:
+            return
+        nilai = json.dumps({
+            "hasil_produksi": hasil.hasil_produksi,
+            "total_keuntungan": hasil.total_keuntungan,
+            "sisa_kain": hasil.sisa_kain,
+            "total_kain": hasil.total_kain,
+            "jenis_kain": hasil.jenis_kain,
+            "meter_per_ukuran": hasil.meter_per_ukuran,
+            "kendala": hasil.kendala,
+        }, ensure_ascii=False)
+        self._db.execute("INSERT OR REPLACE INTO hasil VALUES (?, ?, ?, ?)", (kunci, jenis_kain, hash_isi, nilai))
+        self._db.commit()
@@ -0,0 +1,551 @@
+# cli.py
+# Mode tanpa tampilan (headless): tidak pernah mengimpor Tkinter, dan matplotlib
+# hanya diimpor jika ekspor grafik diminta.
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from cache import CacheHasil
+from data import DATASET_KAIN
+from gulungan import rencanakan_potong
+from indeks import IndeksKain
+from katalog import KatalogKain
+from logic import hitung
+from marker import meter_efektif
+from pembelian import rencanakan_pembelian
+
+NILAI_BENAR = ("1", "true", "ya", "y", "yes")
+KOLOM_BATCH = ["id", "jenis_kain", "total_kain", "hasil_produksi", "total_keuntungan", "sisa_kain", "kendala", "grafik",
+               "laporan", "error"]
+KOLOM_POTONG = ["id", "jenis_kain", "panjang", "hasil_produksi", "keuntungan", "sisa_kain", "urutan_potong"]
+
+_cache = None  # CacheHasil per proses worker (hanya jika --cache dipakai)
+_indeks = None  # IndeksKain per proses worker, dibangun sekali
+_dataset = None  # DATASET_KAIN atau KatalogKain (--katalog) per proses worker
+
+
+class BarisRusak:
+    """Penanda baris input yang gagal dibaca (di luar isi baris, sehingga kolom bernama "error" tetap data biasa)"""
+
+    __slots__ = ("pesan",)
+
+    def __init__(self, pesan):
+        self.pesan = pesan
+
+    def __repr__(self):
+        return f"BarisRusak({self.pesan!r})"
+
+
+def _parse_bool(nilai):
+    if isinstance(nilai, bool):
+        return nilai
+    return str(nilai or "").strip().lower() in NILAI_BENAR
+
+
+def _parse_fokus(nilai):
+    if not nilai:
+        return None
+    if isinstance(nilai, str):
+        nilai = [uk.strip() for uk in nilai.replace(",", ";").split(";")]
+    return [uk for uk in nilai if uk] or None
+
+
+def _parse_persentase(nilai):
+    """Menerima dict atau string "S=30;M=70" """
+    if not nilai:
+        return None
+    if isinstance(nilai, dict):
+        return {uk: float(v) for uk, v in nilai.items()}
+    persentase = {}
+    for bagian in str(nilai).split(";"):
+        if not bagian.strip():
+            continue
+        uk, _, v = bagian.partition("=")
+        persentase[uk.strip()] = float(v)
+    return persentase
+
+
+def _parse_batas(nilai):
+    """Menerima dict atau string "M=20;XL=10" (jumlah pakaian)"""
+    if not nilai:
+        return None
+    if isinstance(nilai, dict):
+        return {uk: int(v) for uk, v in nilai.items()}
+    batas = {}
+    for bagian in str(nilai).split(";"):
+        if not bagian.strip():
+            continue
+        uk, _, v = bagian.partition("=")
+        batas[uk.strip()] = int(v)
+    return batas
+
+
+def normalisasi_pesanan(baris, nomor):
+    """Mengubah satu baris CSV/JSONL menjadi argumen hitung()"""
+    return {
+        "id": baris.get("id") or str(nomor),
+        "jenis_kain": baris["jenis_kain"],
+        "total_kain": float(baris["total_kain"]),
+        "ukuran_fokus": _parse_fokus(baris.get("ukuran_fokus")),
+        "persentase": _parse_persentase(baris.get("persentase")),
+        "optimasi_sisa": _parse_bool(baris.get("optimasi_sisa")),
+        "solver": baris.get("solver") or "greedy",
+        "batas_min": _parse_batas(baris.get("batas_min")),
+        "batas_max": _parse_batas(baris.get("batas_max")),
+        "lebar_kain": float(baris["lebar_kain"]) if baris.get("lebar_kain") not in (None, "") else None,
+    }
+
+
+def baca_pesanan(berkas, format_input):
+    """
+    Membaca pesanan produksi baris demi baris (generator, tidak memuat seluruh file).
+
+    Baris JSONL yang rusak tidak menghentikan pembacaan: baris itu diganti BarisRusak
+    yang dilaporkan proses_potongan sebagai error untuk nomor baris tersebut.
+
+    Args:
+        berkas: File object teks yang sudah dibuka
+        format_input: "csv" atau "jsonl"
+    """
+    if format_input == "csv":
+        for nomor, baris in enumerate(csv.DictReader(berkas), start=1):
+            yield nomor, baris
+    else:
+        for nomor, baris in enumerate(berkas, start=1):
+            if not baris.strip():
+                continue
+            try:
+                pesanan = json.loads(baris)
+            except json.JSONDecodeError as e:
+                yield nomor, BarisRusak(f"JSON tidak valid: {e}")
+                continue
+            if not isinstance(pesanan, dict):
+                yield nomor, BarisRusak("Baris JSONL harus berupa objek")
+                continue
+            yield nomor, pesanan
+
+
+def _siapkan_worker(path_cache=None, path_katalog=None):
+    """Dataset, indeks, dan cache per proses worker; dibangun sekali pada panggilan pertama"""
+    global _cache, _indeks, _dataset
+    if _dataset is None:
+        # Katalog dimuat lazy: hanya kain yang dipakai pesanan yang di-parse
+        _dataset = KatalogKain(path_katalog) if path_katalog else DATASET_KAIN
+    # Indeks tidak dipakai untuk katalog: membangunnya akan memuat semua kain dan
+    # bisa tertinggal ketika katalog dimuat ulang
+    if _indeks is None and not path_katalog:
+        _indeks = IndeksKain(_dataset)
+    if path_cache and _cache is None:
+        _cache = CacheHasil(path_db=path_cache)
+    return _dataset, _indeks, _cache
+
+
+def proses_potongan(potongan, folder_grafik=None, path_cache=None, path_katalog=None, opsi_laporan=None):
+    """
+    Dijalankan di worker: menghitung sekumpulan pesanan, satu hasil per pesanan.
+    opsi_laporan (folder, format, folder_cache) menulis laporan per pesanan langsung dari worker.
+    """
+    _siapkan_worker(path_cache, path_katalog)
+    hasil = []
+    for nomor, baris in potongan:
+        if isinstance(baris, BarisRusak):
+            hasil.append({"id": str(nomor), "error": baris.pesan})
+            continue
+        try:
+            pesanan = normalisasi_pesanan(baris, nomor)
+            produksi = _hitung_pesanan(pesanan)
+            keluaran = {
+                "id": pesanan["id"],
+                "jenis_kain": pesanan["jenis_kain"],
+                "total_kain": pesanan["total_kain"],
+                "hasil_produksi": produksi.hasil_produksi,
+                "total_keuntungan": produksi.total_keuntungan,
+                "sisa_kain": round(produksi.sisa_kain, 4),
+            }
+            if produksi.kendala is not None:
+                keluaran["kendala"] = produksi.kendala
+            if folder_grafik:
+                keluaran["grafik"] = _simpan_grafik(produksi, folder_grafik, pesanan["id"])
+            if opsi_laporan:
+                from laporan import simpan_laporan
+
+                folder, format_laporan, folder_cache = opsi_laporan
+                keluaran["laporan"], _ = simpan_laporan(
+                    produksi, folder, pesanan["id"], format_laporan, folder_cache,
+                    keuntungan_per_pakaian=_dataset[produksi.jenis_kain]["keuntungan_per_pakaian"])
+        except (KeyError, ValueError, TypeError) as e:
+            keluaran = {"id": baris.get("id") or str(nomor), "error": str(e)}
+        hasil.append(keluaran)
+    return hasil
+
+
+def _hitung_pesanan(pesanan):
+    argumen = (pesanan["total_kain"], pesanan["jenis_kain"], _dataset, pesanan["ukuran_fokus"],
+               pesanan["optimasi_sisa"], pesanan["persentase"], pesanan["solver"], _indeks)
+    batas = {"batas_min": pesanan["batas_min"], "batas_max": pesanan["batas_max"], "lebar_kain": pesanan["lebar_kain"]}
+    if _cache is not None:
+        try:
+            return _cache.hitung(*argumen, **batas)
+        except sqlite3.OperationalError:
+            # File --cache dipakai bersama semua worker (mis. "database is locked"): pesanan tetap
+            # dihitung, hanya tanpa cache
+            pass
+    return hitung(*argumen, **batas)
+
+
+def _simpan_grafik(produksi, folder_grafik, id_pesanan):
+    # API Figure + kanvas Agg langsung, tanpa state global pyplot
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from logic import gambar_grafik
+
+    path = os.path.join(folder_grafik, f"{id_pesanan}.png")
+    fig = Figure(figsize=(12, 5))
+    ax1, ax2 = fig.subplots(1, 2)
+    gambar_grafik(ax1, ax2, produksi.hasil_produksi, produksi.meter_per_ukuran, produksi.total_kain,
+                  produksi.sisa_kain)
+    fig.tight_layout()
+    FigureCanvasAgg(fig).print_png(path)
+    return path
+
+
+def _potong(iterable, ukuran):
+    iterator = iter(iterable)
+    while True:
+        potongan = list(islice(iterator, ukuran))
+        if not potongan:
+            return
+        yield potongan
+
+
+def jalankan_batch(pesanan, tulis, workers=None, chunk_size=64, folder_grafik=None, path_cache=None,
+                   path_katalog=None, opsi_laporan=None):
+    """
+    Menjalankan pesanan secara paralel dengan process pool dan menulis hasil
+    sesuai urutan input. Hanya sejumlah kecil potongan yang berjalan sekaligus
+    sehingga memori tetap kecil untuk input sebesar apa pun.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for potongan in _potong(pesanan, chunk_size):
+            for keluaran in proses_potongan(potongan, folder_grafik, path_cache, path_katalog, opsi_laporan):
+                tulis(keluaran)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        antrian = deque()
+        for potongan in _potong(pesanan, chunk_size):
+            antrian.append(executor.submit(proses_potongan, potongan, folder_grafik, path_cache, path_katalog,
+                                           opsi_laporan))
+            if len(antrian) >= workers * 2:
+                for keluaran in antrian.popleft().result():
+                    tulis(keluaran)
+        while antrian:
+            for keluaran in antrian.popleft().result():
+                tulis(keluaran)
+
+
+def _penulis(berkas, format_output, kolom=KOLOM_BATCH):
+    if format_output == "jsonl":
+        def tulis(keluaran):
+            berkas.write(json.dumps(keluaran, ensure_ascii=False) + "\n")
+        return tulis
+
+    writer = csv.DictWriter(berkas, fieldnames=kolom)
+    writer.writeheader()
+
+    def tulis(keluaran):
+        baris = dict(keluaran)
+        if "hasil_produksi" in baris:
+            baris["hasil_produksi"] = ";".join(f"{uk}={n}" for uk, n in baris["hasil_produksi"].items())
+        if "kendala" in baris:
+            baris["kendala"] = ";".join(f"{uk}={info['status']}" for uk, info in baris["kendala"].items())
+        if "urutan_potong" in baris:
+            baris["urutan_potong"] = ";".join(f"{uk}@{mulai:g}-{selesai:g}"
+                                              for uk, mulai, selesai in baris["urutan_potong"])
+        writer.writerow(baris)
+    return tulis
+
+
+def _baca_buku_pesanan(nilai):
+    """Menerima string "S=100;M=50" (semua kain) atau path file JSON {ukuran: n} / {jenis_kain: {ukuran: n}}"""
+    if not nilai:
+        return None
+    if nilai.lower().endswith(".json"):
+        with open(nilai, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return _parse_batas(nilai)
+
+
+def jalankan_potong(args):
+    """Subperintah `potong`: rencana potong seluruh gulungan, satu baris daftar potong per gulungan"""
+    format_input = args.format_input or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    dataset = KatalogKain(args.katalog) if args.katalog else DATASET_KAIN
+    berkas_in = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    try:
+        gulungan = []
+        for nomor, baris in baca_pesanan(berkas_in, format_input):
+            if isinstance(baris, BarisRusak):
+                raise ValueError(f"Baris {nomor}: {baris.pesan}")
+            gulungan.append({"id": baris.get("id") or str(nomor), "jenis_kain": baris["jenis_kain"],
+                             "panjang": float(baris["panjang"])})
+        rencana = rencanakan_potong(gulungan, dataset, pesanan=_baca_buku_pesanan(args.pesanan),
+                                    ukuran_fokus=_parse_fokus(args.fokus))
+    except (KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if berkas_in is not sys.stdin:
+            berkas_in.close()
+
+    berkas_out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        tulis = _penulis(berkas_out, args.format_output, KOLOM_POTONG)
+        for i, entri in enumerate(rencana.gulungan):
+            tulis(dict(entri, urutan_potong=rencana.urutan_potong(i)))
+    finally:
+        if berkas_out is not sys.stdout:
+            berkas_out.close()
+
+    ringkasan = {k: v for k, v in rencana.ke_dict().items() if k != "gulungan"}
+    teks = json.dumps(ringkasan, ensure_ascii=False, indent=2)
+    if args.ringkasan:
+        with open(args.ringkasan, "w", encoding="utf-8") as f:
+            f.write(teks + "\n")
+    else:
+        print(teks, file=sys.stderr)
+    return 0
+
+
+def jalankan_beli(args):
+    """Subperintah `beli`: rencana pembelian kain dengan anggaran, dicetak sebagai JSON"""
+    dataset = KatalogKain(args.katalog) if args.katalog else DATASET_KAIN
+    try:
+        rencana = rencanakan_pembelian(args.anggaran, dataset, produk_target=args.produk,
+                                       jenis_kain=_parse_fokus(args.kain), ukuran_fokus=_parse_fokus(args.fokus),
+                                       meter_maks=_parse_persentase(args.meter_maks), workers=args.workers)
+    except (KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    teks = json.dumps(rencana.ke_dict(), ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(teks)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(teks + "\n")
+    return 0
+
+
+def jalankan_simulasi(args):
+    """Subperintah `simulasi`: rencana hitung() lalu Monte Carlo susut/cacat, ringkasan dicetak sebagai JSON"""
+    # NumPy hanya diimpor untuk subperintah ini
+    from simulasi import simulasikan
+
+    dataset = KatalogKain(args.katalog) if args.katalog else DATASET_KAIN
+    persentase = _parse_persentase(args.persentase)
+    ukuran_fokus = _parse_fokus(args.fokus)
+    try:
+        rencana = hitung(args.panjang, args.kain, dataset, ukuran_fokus, args.optimasi_sisa, persentase, args.solver)
+        hasil = simulasikan(rencana, dataset, args.sampel, args.seed, args.mode, persentase, ukuran_fokus,
+                            args.optimasi_sisa, tingkat_kepercayaan=args.kepercayaan, workers=args.workers)
+    except (KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    teks = json.dumps(hasil.ke_dict(), ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(teks)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(teks + "\n")
+    return 0
+
+
+def jalankan_jadwal(args):
+    """Subperintah `jadwal`: rencana produksi multi-periode dari file JSON horizon, dicetak sebagai JSON"""
+    from jadwal import rencanakan_jadwal
+
+    dataset = KatalogKain(args.katalog) if args.katalog else DATASET_KAIN
+    try:
+        with open(args.input, "r", encoding="utf-8") as f:
+            horizon = json.load(f)
+        jadwal = rencanakan_jadwal(args.kain or horizon.get("jenis_kain"), dataset, horizon.get("periode"),
+                                   stok_awal=horizon.get("stok_awal", 0), biaya_simpan=horizon.get("biaya_simpan", 0),
+                                   ukuran_fokus=_parse_fokus(args.fokus or horizon.get("fokus")))
+    except (KeyError, ValueError, TypeError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    teks = json.dumps(jadwal.ke_dict(), ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(teks)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(teks + "\n")
+    return 0
+
+
+def jalankan_marker(args):
+    """Subperintah `marker`: nesting pola per ukuran pada lebar kain, meter efektif dan layout dicetak sebagai JSON"""
+    dataset = KatalogKain(args.katalog) if args.katalog else DATASET_KAIN
+    kombinasi = {uk: int(n) for uk, n in (_parse_persentase(args.kombinasi) or {}).items()}
+    try:
+        data_kain = dataset[args.kain]
+        meter, marker = meter_efektif(data_kain, args.lebar, kombinasi or None, rotasi=not args.tanpa_rotasi)
+    except (KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    data = {
+        "jenis_kain": args.kain,
+        "lebar": args.lebar,
+        "meter_per_ukuran": data_kain["meter_per_ukuran"],
+        "meter_efektif": meter,
+        "marker": {nama: m.ke_dict() for nama, m in marker.items()},
+    }
+    teks = json.dumps(data, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(teks)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(teks + "\n")
+    return 0
+
+
+def buat_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Optimasi Produksi Pakaian (mode headless)")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    batch = sub.add_parser("batch", help="Hitung pesanan produksi dari file CSV/JSONL")
+    batch.add_argument("input", help="File pesanan (.csv atau .jsonl), '-' untuk stdin")
+    batch.add_argument("-o", "--output", default="-", help="File hasil, '-' untuk stdout")
+    batch.add_argument("--format-input", choices=("csv", "jsonl"), help="Default: dari ekstensi file")
+    batch.add_argument("--format-output", choices=("csv", "jsonl"), default="jsonl")
+    batch.add_argument("-w", "--workers", type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    batch.add_argument("-c", "--chunk-size", type=int, default=64, help="Jumlah pesanan per tugas worker")
+    batch.add_argument("--grafik", metavar="FOLDER", help="Ekspor grafik PNG per pesanan ke folder ini")
+    batch.add_argument("--laporan", metavar="FOLDER", help="Ekspor laporan per pesanan (grafik + tabel) ke folder ini")
+    batch.add_argument("--format-laporan", choices=("png", "pdf"), default="pdf")
+    batch.add_argument("--cache-laporan", metavar="FOLDER",
+                       help="Folder cache render laporan (default: FOLDER_LAPORAN/.cache)")
+    batch.add_argument("--cache", metavar="FILE", help="File SQLite untuk cache hasil antar-run")
+    batch.add_argument("--katalog", metavar="FILE", help="Katalog kain JSON/CSV/SQLite (default: data.py)")
+
+    potong = sub.add_parser("potong", help="Rencana potong seluruh gulungan di gudang (multi-gulungan, multi-kain)")
+    potong.add_argument("input", help="File gulungan (.csv/.jsonl) berkolom id, jenis_kain, panjang; '-' untuk stdin")
+    potong.add_argument("-o", "--output", default="-", help="File daftar potong per gulungan, '-' untuk stdout")
+    potong.add_argument("--format-input", choices=("csv", "jsonl"), help="Default: dari ekstensi file")
+    potong.add_argument("--format-output", choices=("csv", "jsonl"), default="jsonl")
+    potong.add_argument("--pesanan", help='Buku pesanan "S=100;M=50" untuk semua kain, atau file .json '
+                                          '({ukuran: jumlah} atau {jenis_kain: {ukuran: jumlah}})')
+    potong.add_argument("--fokus", help="Ukuran yang difokuskan, mis. S;M")
+    potong.add_argument("--katalog", metavar="FILE", help="Katalog kain JSON/CSV/SQLite (default: data.py)")
+    potong.add_argument("--ringkasan", metavar="FILE", help="File JSON ringkasan rencana (default: stderr)")
+
+    beli = sub.add_parser("beli", help="Rencana pembelian kain (kain + meter) dengan anggaran tertentu")
+    beli.add_argument("--anggaran", type=float, required=True, help="Anggaran pembelian kain (rupiah)")
+    beli.add_argument("--produk", help="Produk target, mis. Kemeja (kandidat = rekomendasi kain)")
+    beli.add_argument("--kain", help="Kain kandidat eksplisit, mis. Katun;Rayon")
+    beli.add_argument("--fokus", help="Ukuran yang boleh diproduksi, mis. S;M")
+    beli.add_argument("--meter-maks", help="Batas pembelian per kain, mis. Spandex=100;Polyester=50")
+    beli.add_argument("-w", "--workers", type=int, default=None, help="Proses untuk kurva kain (default: jumlah CPU)")
+    beli.add_argument("-o", "--output", default="-", help="File JSON rencana, '-' untuk stdout")
+    beli.add_argument("--katalog", metavar="FILE", help="Katalog kain JSON/CSV/SQLite (default: data.py)")
+
+    jadwal = sub.add_parser("jadwal", help="Rencana produksi multi-periode dengan stok kain bergulir")
+    jadwal.add_argument("input", help='File JSON horizon: {"jenis_kain", "stok_awal", "biaya_simpan", '
+                                      '"periode": [{"kiriman", "permintaan": {ukuran: jumlah}, "biaya_simpan"}]}')
+    jadwal.add_argument("--kain", help="Jenis kain (menimpa jenis_kain di file)")
+    jadwal.add_argument("--fokus", help="Ukuran yang boleh diproduksi, mis. S;M")
+    jadwal.add_argument("-o", "--output", default="-", help="File JSON jadwal, '-' untuk stdout")
+    jadwal.add_argument("--katalog", metavar="FILE", help="Katalog kain JSON/CSV/SQLite (default: data.py)")
+
+    simulasi = sub.add_parser("simulasi",
+                              help="Analisis ketahanan rencana (Monte Carlo susut kain, susut potong, cacat)")
+    simulasi.add_argument("--kain", required=True, help="Jenis kain, mis. Spandex")
+    simulasi.add_argument("--panjang", type=float, required=True, help="Total kain (meter)")
+    simulasi.add_argument("--persentase", help="Persentase per ukuran, mis. S=30;M=30")
+    simulasi.add_argument("--fokus", help="Ukuran yang difokuskan, mis. S;M")
+    simulasi.add_argument("--solver", choices=("greedy", "exact"), default="greedy")
+    simulasi.add_argument("--optimasi-sisa", action="store_true")
+    simulasi.add_argument("--mode", choices=("evaluasi", "solusi_ulang"), default="evaluasi",
+                          help="evaluasi = potong rencana apa adanya; solusi_ulang = hitung ulang per undian")
+    simulasi.add_argument("--sampel", type=int, default=10000, help="Jumlah undian (default 10000)")
+    simulasi.add_argument("--seed", type=int, default=None, help="Seed agar hasil bisa diulang")
+    simulasi.add_argument("--kepercayaan", type=float, default=0.95, help="Tingkat interval (default 0.95)")
+    simulasi.add_argument("-w", "--workers", type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    simulasi.add_argument("-o", "--output", default="-", help="File JSON ringkasan, '-' untuk stdout")
+    simulasi.add_argument("--katalog", metavar="FILE", help="Katalog kain JSON/CSV/SQLite (default: data.py)")
+
+    marker = sub.add_parser("marker", help="Nesting pola pada lebar kain (meter efektif per ukuran + layout marker)")
+    marker.add_argument("--kain", required=True, help="Jenis kain, mis. Katun")
+    marker.add_argument("--lebar", type=float, required=True, help="Lebar gulungan (meter)")
+    marker.add_argument("--kombinasi", help="Marker campuran, mis. S=2;M=1 (default: marker per ukuran)")
+    marker.add_argument("--tanpa-rotasi", action="store_true", help="Potongan tidak boleh diputar 90 derajat")
+    marker.add_argument("-o", "--output", default="-", help="File JSON marker, '-' untuk stdout")
+    marker.add_argument("--katalog", metavar="FILE", help="Katalog kain JSON/CSV/SQLite (default: data.py)")
+
+    layanan = sub.add_parser("layanan", help="Layanan HTTP/JSON lokal (hitung, rekomendasi, sweep, metrik)")
+    layanan.add_argument("--host", default="127.0.0.1")
+    layanan.add_argument("--port", type=int, default=8080, help="0 untuk port bebas")
+    layanan.add_argument("-w", "--workers", type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    layanan.add_argument("--ukuran-batch", type=int, default=64, help="Maksimum pesanan per batch mikro")
+    layanan.add_argument("--jendela-batch", type=float, default=2.0,
+                         help="Milidetik menunggu pesanan lain sebelum batch dikirim")
+    layanan.add_argument("--cache", metavar="FILE", help="File SQLite untuk cache hasil antar-run")
+    layanan.add_argument("--katalog", metavar="FILE", help="Katalog kain JSON/CSV/SQLite (default: data.py)")
+    return parser
+
+
+def main(argv=None):
+    args = buat_parser().parse_args(argv)
+
+    if args.perintah == "potong":
+        return jalankan_potong(args)
+    if args.perintah == "beli":
+        return jalankan_beli(args)
+    if args.perintah == "jadwal":
+        return jalankan_jadwal(args)
+    if args.perintah == "simulasi":
+        return jalankan_simulasi(args)
+    if args.perintah == "marker":
+        return jalankan_marker(args)
+    if args.perintah == "layanan":
+        # asyncio hanya diimpor untuk subperintah ini
+        from layanan import jalankan_layanan
+        return jalankan_layanan(args.host, args.port, workers=args.workers, path_cache=args.cache,
+                                path_katalog=args.katalog, ukuran_batch=args.ukuran_batch,
+                                jendela_batch=args.jendela_batch / 1000)
+    if args.perintah == "batch":
+        format_input = args.format_input or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+        if args.grafik:
+            os.makedirs(args.grafik, exist_ok=True)
+        opsi_laporan = None
+        if args.laporan:
+            folder_cache = args.cache_laporan or os.path.join(args.laporan, ".cache")
+            os.makedirs(args.laporan, exist_ok=True)
+            os.makedirs(folder_cache, exist_ok=True)
+            opsi_laporan = (args.laporan, args.format_laporan, folder_cache)
+        berkas_in = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+        berkas_out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        try:
+            jalankan_batch(
+                baca_pesanan(berkas_in, format_input),
+                _penulis(berkas_out, args.format_output),
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                folder_grafik=args.grafik,
+                path_cache=args.cache,
+                path_katalog=args.katalog,
+                opsi_laporan=opsi_laporan,
+            )
+        finally:
+            if berkas_in is not sys.stdin:
+                berkas_in.close()
+            if berkas_out is not sys.stdout:
+                berkas_out.close()
+    return 0
@@ -0,0 +1,174 @@
+# grafik.py
+# Grafik hasil yang bertahan lama di tab hasil: artist diperbarui di tempat
+# (tinggi batang, sudut pie, teks) alih-alih membuat figure baru tiap perhitungan.
+import math
+
+
+def pramuat_matplotlib():
+    """
+    Mengimpor modul matplotlib yang dipakai GrafikProduksi tanpa membuat widget,
+    sehingga bisa dijalankan di thread latar setelah jendela pertama tampil.
+    """
+    try:
+        import matplotlib.figure
+        import matplotlib.backends.backend_tkagg
+    except ImportError:
+        pass  # Kesalahan impor ditampilkan saat grafik benar-benar dibuat
+
+
+class GrafikProduksi:
+    """Satu figure + canvas Tk yang dipakai ulang untuk setiap hasil"""
+
+    def __init__(self, master):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        from logic import gambar_grafik
+
+        self._gambar_grafik = gambar_grafik
+        self.fig = Figure(figsize=(12, 5))
+        self.ax1, self.ax2 = self.fig.subplots(1, 2)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self._ukuran = None
+        self._artist = None
+
+    def gambar_ulang(self, hasil):
+        """Menggambar ulang seluruh axes (dipakai bila susunan ukuran berubah)"""
+        self.ax1.clear()
+        self.ax2.clear()
+        self._artist = self._gambar_grafik(self.ax1, self.ax2, hasil.hasil_produksi, hasil.meter_per_ukuran,
+                                           hasil.total_kain, hasil.sisa_kain)
+        self._ukuran = list(hasil.hasil_produksi)
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    def perbarui(self, hasil, berubah=None):
+        """
+        Memperbarui artist yang sudah ada; hanya batang untuk ukuran di `berubah`
+        yang diubah tingginya. Jika daftar ukuran berbeda, grafik digambar ulang.
+        """
+        if self._artist is None or list(hasil.hasil_produksi) != self._ukuran:
+            self.gambar_ulang(hasil)
+            return
+
+        bars, wedges, label_pie, teks_persen = self._artist
+        for bar, (ukuran, jumlah) in zip(bars, hasil.hasil_produksi.items()):
+            if berubah is None or ukuran in berubah:
+                bar.set_height(jumlah)
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+
+        meter_pakai = [hasil.meter_per_ukuran[uk] * n for uk, n in hasil.hasil_produksi.items()]
+        self._atur_pie(wedges, label_pie, teks_persen, meter_pakai + [hasil.sisa_kain])
+        self.ax2.set_title(f'Pemakaian Kain (Total: {hasil.total_kain}m)')
+        self.canvas.draw_idle()
+
+    @staticmethod
+    def _atur_pie(wedges, label_pie, teks_persen, sizes, startangle=90):
+        # Mengikuti tata letak Axes.pie: labeldistance 1.1, pctdistance 0.6, berlawanan jarum jam
+        total = float(sum(sizes)) or 1.0
+        theta1 = startangle / 360.0
+        for wedge, label, teks, nilai in zip(wedges, label_pie, teks_persen, sizes):
+            frac = nilai / total
+            theta2 = theta1 + frac
+            wedge.set_theta1(360.0 * theta1)
+            wedge.set_theta2(360.0 * theta2)
+            tengah = math.pi * (theta1 + theta2)
+            x, y = math.cos(tengah), math.sin(tengah)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            teks.set_position((0.6 * x, 0.6 * y))
+            teks.set_text(f'{100 * frac:.1f}%')
+            theta1 = theta2
+
+
+class GrafikKurva:
+    """Kurva keuntungan optimal vs panjang kain (+ nilai marjinal), dipakai ulang antar perhitungan"""
+
+    def __init__(self, master):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig = Figure(figsize=(12, 3.5))
+        self.ax = self.fig.add_subplot(1, 1, 1)
+        self.ax_marjinal = self.ax.twinx()
+        self.ax.set_xlabel('Panjang Kain (m)')
+        self.ax.set_ylabel('Keuntungan Optimal (Rp)')
+        self.ax_marjinal.set_ylabel('Nilai Meter Berikutnya (Rp)')
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self._garis = None
+        self._garis_marjinal = None
+        self._penanda = None
+
+    def gambar(self, kurva, panjang_sekarang=None):
+        if self._garis is None:
+            self._garis, = self.ax.plot(kurva.panjang, kurva.keuntungan, color='#3498db',
+                                        drawstyle='steps-post', label='Keuntungan')
+            self._garis_marjinal, = self.ax_marjinal.plot(kurva.panjang, kurva.nilai_marjinal, color='#e67e22',
+                                                          alpha=0.6, linewidth=0.8, label='Marjinal / meter')
+            self._penanda = self.ax.axvline(0, color='#e74c3c', linestyle='--', linewidth=1)
+        else:
+            self._garis.set_data(kurva.panjang, kurva.keuntungan)
+            self._garis_marjinal.set_data(kurva.panjang, kurva.nilai_marjinal)
+        for ax in (self.ax, self.ax_marjinal):
+            ax.relim()
+            ax.autoscale_view()
+
+        self._penanda.set_visible(panjang_sekarang is not None)
+        if panjang_sekarang is not None:
+            self._penanda.set_xdata([panjang_sekarang, panjang_sekarang])
+        self.ax.set_title(f'Kurva Keuntungan {kurva.jenis_kain} (resolusi {kurva.resolusi} m)')
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+
+class GrafikPareto:
+    """Scatter frontier Pareto (sisa kain vs keuntungan, warna = deviasi); klik titik memanggil saat_dipilih(i)"""
+
+    def __init__(self, master, saat_dipilih):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig = Figure(figsize=(12, 3.5))
+        self.ax = self.fig.add_subplot(1, 1, 1)
+        self.ax.set_xlabel('Sisa Kain (m)')
+        self.ax.set_ylabel('Total Keuntungan (Rp)')
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas.mpl_connect('pick_event', self._saat_pick)
+        self._saat_dipilih = saat_dipilih
+        self._titik = None
+        self._colorbar = None
+        self._terpilih = None
+
+    def gambar(self, frontier):
+        if self._titik is None:
+            self._titik = self.ax.scatter(frontier.sisa_kain, frontier.keuntungan, c=frontier.deviasi, cmap='viridis',
+                                          s=28, picker=True, pickradius=5, edgecolors='none')
+            self._colorbar = self.fig.colorbar(self._titik, ax=self.ax)
+            self._colorbar.set_label('Deviasi Campuran (%)')
+            self._terpilih, = self.ax.plot([], [], 'o', markersize=12, markerfacecolor='none',
+                                           markeredgecolor='#e74c3c', markeredgewidth=2)
+        else:
+            self._titik.set_offsets(list(zip(frontier.sisa_kain, frontier.keuntungan)))
+            self._titik.set_array(frontier.deviasi)
+        # Frontier selalu berisi minimal satu titik (rencana tanpa pakaian)
+        self._titik.set_clim(min(frontier.deviasi), max(max(frontier.deviasi), min(frontier.deviasi) + 1e-9))
+        self._terpilih.set_data([], [])
+        # relim() mengabaikan scatter, jadi batas data diatur ulang dari titik frontier
+        self.ax.ignore_existing_data_limits = True
+        self.ax.update_datalim(self._titik.get_offsets())
+        self.ax.autoscale_view()
+        self.ax.set_title(f'Frontier Pareto {frontier.jenis_kain} ({frontier.total_kain} m, {len(frontier)} titik)')
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    def tandai(self, sisa_kain, keuntungan):
+        self._terpilih.set_data([sisa_kain], [keuntungan])
+        self.canvas.draw_idle()
+
+    def _saat_pick(self, event):
+        if event.artist is self._titik and len(event.ind):
+            self._saat_dipilih(int(event.ind[0]))
@@ -0,0 +1,401 @@
+# gulungan.py
+# Rencana potong multi-gulungan, multi-kain: setiap gulungan di gudang mendapat
+# pola potong sendiri dari knapsack eksak, dengan cache pola yang dipakai ulang
+# antar gulungan (dan antar rencana) yang panjang efektif serta kuotanya sama.
+import math
+from collections import OrderedDict
+
+from logic import _isi_knapsack, _isi_knapsack_terbatas, fase_instrumen, ke_meter, ke_mm, satuan_kain
+
+MAKS_ITERASI_HARGA = 500
+MAKS_PUTARAN_PERBAIKAN = 5
+
+
+class CachePola:
+    """
+    LRU pola potong per (isi kain, panjang efektif dalam mm, kuota efektif).
+
+    Kunci dibentuk dari isi kain (ukuran, berat mm, keuntungan), bukan nama kain,
+    sehingga satu cache aman dipakai ulang walaupun dataset/katalog berubah.
+    """
+
+    def __init__(self, kapasitas=4096):
+        self.kapasitas = kapasitas
+        self.hit = 0
+        self.miss = 0
+        self._lru = OrderedDict()
+
+    def __len__(self):
+        return len(self._lru)
+
+    def pola(self, barang, panjang_mm, kuota):
+        """
+        Args:
+            barang: Tuple ((ukuran, berat_mm, keuntungan), ...)
+            panjang_mm: Panjang gulungan (mm), sudah dibulatkan ke kelipatan FPB berat
+            kuota: Tuple sejajar barang berisi jumlah maksimum (None = tidak dibatasi)
+
+        Returns:
+            Tuple jumlah pakaian sejajar barang
+        """
+        kunci = (barang, panjang_mm, kuota)
+        if kunci in self._lru:
+            self.hit += 1
+            self._lru.move_to_end(kunci)
+            return self._lru[kunci]
+        self.miss += 1
+        hasil = _selesaikan_pola(barang, panjang_mm, kuota)
+        self._lru[kunci] = hasil
+        if len(self._lru) > self.kapasitas:
+            self._lru.popitem(last=False)
+        return hasil
+
+
+def _selesaikan_pola(barang, panjang_mm, kuota):
+    berat_mm = {uk: w for uk, w, _ in barang}
+    untung = {uk: v for uk, _, v in barang}
+    ukuran_tersedia = [uk for (uk, _, _), q in zip(barang, kuota) if q != 0]
+    batas = {uk: q for (uk, _, _), q in zip(barang, kuota) if q}
+    if batas:
+        tambahan = _isi_knapsack_terbatas(panjang_mm, ukuran_tersedia, berat_mm, untung, batas)
+    else:
+        tambahan = _isi_knapsack(panjang_mm, ukuran_tersedia, berat_mm, untung)
+    return tuple(tambahan.get(uk, 0) for uk, _, _ in barang)
+
+
+class RencanaPotong:
+    """
+    Rencana potong seluruh gulungan.
+
+    Atribut gulungan berisi satu dict per gulungan (urutan input): id, jenis_kain,
+    panjang, hasil_produksi, keuntungan, sisa_kain. Daftar potong per gulungan
+    (posisi tiap potongan) dibuat saat diminta lewat urutan_potong(i).
+    """
+
+    __slots__ = ("gulungan", "total_kain", "total_keuntungan", "total_sisa", "produksi", "pesanan_sisa",
+                 "batas_atas", "statistik", "_berat_mm")
+
+    def __init__(self, gulungan, total_kain, total_keuntungan, total_sisa, produksi, pesanan_sisa, batas_atas,
+                 statistik, berat_mm):
+        self.gulungan = gulungan
+        self.total_kain = total_kain
+        self.total_keuntungan = total_keuntungan
+        self.total_sisa = total_sisa
+        self.produksi = produksi
+        self.pesanan_sisa = pesanan_sisa
+        self.batas_atas = batas_atas
+        self.statistik = statistik
+        self._berat_mm = berat_mm
+
+    def __len__(self):
+        return len(self.gulungan)
+
+    def __repr__(self):
+        return (f"RencanaPotong(gulungan={len(self.gulungan)}, total_keuntungan={self.total_keuntungan!r}, "
+                f"total_sisa={self.total_sisa!r})")
+
+    def urutan_potong(self, i):
+        """Daftar potong gulungan ke-i: [(ukuran, mulai_m, selesai_m)] dari ujung gulungan"""
+        entri = self.gulungan[i]
+        berat_mm = self._berat_mm[entri["jenis_kain"]]
+        posisi_mm = 0
+        daftar = []
+        for ukuran, jumlah in entri["hasil_produksi"].items():
+            for _ in range(jumlah):
+                daftar.append((ukuran, ke_meter(posisi_mm), ke_meter(posisi_mm + berat_mm[ukuran])))
+                posisi_mm += berat_mm[ukuran]
+        return daftar
+
+    def ke_dict(self, dengan_urutan=False):
+        gulungan = self.gulungan
+        if dengan_urutan:
+            gulungan = [dict(g, urutan_potong=self.urutan_potong(i)) for i, g in enumerate(gulungan)]
+        return {
+            "gulungan": gulungan,
+            "total_kain": self.total_kain,
+            "total_keuntungan": self.total_keuntungan,
+            "total_sisa": self.total_sisa,
+            "produksi": self.produksi,
+            "pesanan_sisa": self.pesanan_sisa,
+            "batas_atas": self.batas_atas,
+            "statistik": self.statistik,
+        }
+
+
+def _normalisasi_gulungan(gulungan):
+    """Menerima dict {id, jenis_kain, panjang} atau tuple (jenis_kain, panjang[, id])"""
+    daftar = []
+    for nomor, g in enumerate(gulungan, start=1):
+        if isinstance(g, dict):
+            jenis_kain, panjang, id_gulungan = g["jenis_kain"], g["panjang"], g.get("id")
+        else:
+            jenis_kain, panjang = g[0], g[1]
+            id_gulungan = g[2] if len(g) > 2 else None
+        panjang = float(panjang)
+        if panjang < 0:
+            raise ValueError(f"Panjang gulungan {id_gulungan or nomor} tidak boleh negatif")
+        daftar.append((str(id_gulungan or nomor), jenis_kain, panjang))
+    return daftar
+
+
+def _normalisasi_pesanan(pesanan):
+    """
+    Returns:
+        Tuple: (permintaan {kunci: jumlah} atau None, per_kain). Kunci adalah ukuran untuk
+        pesanan bersama, atau (jenis_kain, ukuran) untuk pesanan per kain.
+    """
+    if pesanan is None:
+        return None, False
+    if any(isinstance(v, dict) for v in pesanan.values()):
+        return {(kain, uk): int(n) for kain, isi in pesanan.items() for uk, n in isi.items()}, True
+    return {uk: int(n) for uk, n in pesanan.items()}, False
+
+
+def _fpb_berat(barang):
+    fpb = 0
+    for _, w, _ in barang:
+        fpb = math.gcd(fpb, w)
+    return fpb or 1
+
+
+def _harga_bayangan(kapasitas_kain, barang_kain, permintaan, kunci, batas_bawah):
+    """
+    Harga bayangan per kunci pesanan dari relaksasi LP agregat (seluruh panjang satu
+    kain dianggap satu gulungan pecahan), diminimalkan dengan subgradien.
+
+    Returns:
+        Tuple: (harga terbaik, batas atas LP pada harga tersebut, jumlah iterasi)
+    """
+    harga = dict.fromkeys(permintaan, 0.0)
+    harga_terbaik, batas_terbaik = harga, math.inf
+    langkah_relatif, tanpa_perbaikan = 2.0, 0
+    iterasi = 0
+    for iterasi in range(1, MAKS_ITERASI_HARGA + 1):
+        batas = sum(harga[k] * n for k, n in permintaan.items())
+        terpakai = dict.fromkeys(permintaan, 0.0)
+        for jenis_kain, kapasitas in kapasitas_kain.items():
+            # Fractional knapsack satu kain: seluruh kapasitas ke ukuran nilai bersih/mm terbaik
+            pilihan, rasio_terbaik = None, 0.0
+            for uk, w, v in barang_kain[jenis_kain]:
+                k = kunci(jenis_kain, uk)
+                if k in permintaan and (v - harga[k]) / w > rasio_terbaik:
+                    pilihan, rasio_terbaik = (k, w), (v - harga[k]) / w
+            if pilihan is not None:
+                batas += kapasitas * rasio_terbaik
+                terpakai[pilihan[0]] += kapasitas / pilihan[1]
+
+        if batas < batas_terbaik:
+            harga_terbaik, batas_terbaik, tanpa_perbaikan = harga, batas, 0
+        else:
+            tanpa_perbaikan += 1
+            if tanpa_perbaikan >= 5:
+                langkah_relatif, tanpa_perbaikan = langkah_relatif / 2, 0
+
+        gradien = {k: terpakai[k] - n for k, n in permintaan.items()}
+        norma = sum(g * g for k, g in gradien.items() if g > 0 or harga[k] > 0)
+        if norma == 0 or langkah_relatif < 1e-4 or batas_terbaik - batas_bawah <= 1e-4 * batas_terbaik:
+            break
+        langkah = langkah_relatif * (batas - batas_bawah) / norma
+        harga = {k: max(0.0, harga[k] + langkah * g) for k, g in gradien.items()}
+    return harga_terbaik, batas_terbaik, iterasi
+
+
+def rencanakan_potong(gulungan, dataset, pesanan=None, ukuran_fokus=None, cache_pola=None, instrumen=None):
+    """
+    Membagi ukuran pakaian ke setiap gulungan sehingga total keuntungan maksimal
+    dan sisa ujung gulungan sekecil mungkin.
+
+    Gulungan dikelompokkan per (kain, panjang efektif) dan setiap kelompok cukup
+    diselesaikan sekali dengan knapsack eksak; tanpa pesanan (atau bila pesanan
+    tidak mengikat) hasil ini sudah optimal. Jika pesanan mengikat, harga bayangan
+    per ukuran diambil dari relaksasi LP agregat, lalu rencana layak disusun:
+    gulungan dengan nilai bersih per mm tertinggi mendapat pesanan lebih dulu
+    (bounded knapsack terhadap sisa pesanan), dan setiap gulungan dioptimasi ulang
+    terhadap pesanan yang belum terpakai. Rencana terbaik (dengan dan tanpa harga
+    bayangan) yang dikembalikan; batas_atas LP menunjukkan seberapa dekat ke optimal.
+
+    Args:
+        gulungan: Iterable gulungan: dict {id, jenis_kain, panjang} atau tuple (jenis_kain, panjang[, id])
+        dataset: Dataset parameter kain (DATASET_KAIN atau KatalogKain)
+        pesanan: Buku pesanan opsional, {ukuran: jumlah} untuk semua kain atau
+            {jenis_kain: {ukuran: jumlah}} per kain. Ukuran/kain yang tidak ada di
+            pesanan tidak diproduksi. None berarti semua hasil bisa dijual.
+        ukuran_fokus: List ukuran yang difokuskan (None untuk semua ukuran)
+        cache_pola: CachePola opsional untuk dipakai ulang antar rencana
+        instrumen: Instrumentasi opsional (fase "rencana_potong")
+
+    Returns:
+        RencanaPotong (batas_atas: keuntungan maksimum yang mungkin, untuk menilai gap)
+    """
+    daftar = _normalisasi_gulungan(gulungan)
+    permintaan, per_kain = _normalisasi_pesanan(pesanan)
+    cache_pola = cache_pola if cache_pola is not None else CachePola()
+    hit_awal, miss_awal = cache_pola.hit, cache_pola.miss
+
+    def kunci(jenis_kain, ukuran):
+        return (jenis_kain, ukuran) if per_kain else ukuran
+
+    # Parameter per kain dalam mm dan rupiah, sekali per jenis kain
+    barang_kain, fpb_kain = {}, {}
+    for _, jenis_kain, _ in daftar:
+        if jenis_kain in barang_kain:
+            continue
+        try:
+            data_kain = dataset[jenis_kain]
+        except KeyError:
+            raise ValueError(f"Jenis kain '{jenis_kain}' tidak ditemukan")
+        berat_mm, untung = satuan_kain(data_kain)
+        barang = tuple((uk, berat_mm[uk], untung[uk]) for uk in berat_mm if not ukuran_fokus or uk in ukuran_fokus)
+        barang_kain[jenis_kain] = tuple(b for b in barang if b[1] > 0 and b[2] > 0)
+        fpb_kain[jenis_kain] = _fpb_berat(barang_kain[jenis_kain])
+
+    # Panjang terpakai selalu kelipatan FPB berat, jadi gulungan dengan panjang
+    # efektif yang sama memakai pola yang sama
+    kelompok_gulungan = []
+    anggota = {}
+    for i, (_, jenis_kain, panjang) in enumerate(daftar):
+        panjang_mm = ke_mm(panjang)
+        k = (jenis_kain, panjang_mm - panjang_mm % fpb_kain[jenis_kain])
+        kelompok_gulungan.append(k)
+        anggota.setdefault(k, []).append(i)
+
+    def pola(kelompok, harga=None, sisa=None):
+        """Pola terbaik (sejajar barang kain) dengan nilai dikurangi harga bayangan, dibatasi sisa pesanan"""
+        jenis_kain, panjang_mm = kelompok
+        barang, kuota, posisi = [], [], []
+        for j, (uk, w, v) in enumerate(barang_kain[jenis_kain]):
+            k = kunci(jenis_kain, uk)
+            if permintaan is not None and k not in permintaan:
+                continue
+            nilai_bersih = v - harga[k] if harga is not None else v
+            batas = sisa[k] if sisa is not None else None
+            if nilai_bersih <= 0 or batas == 0:
+                continue
+            # Kuota yang tidak mungkin tercapai di gulungan ini sama dengan tak terbatas
+            if batas is not None and batas >= panjang_mm // w:
+                batas = None
+            barang.append((uk, w, nilai_bersih))
+            kuota.append(batas)
+            posisi.append(j)
+        hasil = [0] * len(barang_kain[jenis_kain])
+        if barang:
+            for j, n in zip(posisi, cache_pola.pola(tuple(barang), panjang_mm, tuple(kuota))):
+                hasil[j] = n
+        return tuple(hasil)
+
+    def nilai(kelompok, p, harga=None):
+        jenis_kain = kelompok[0]
+        return sum(n * (v - (harga[kunci(jenis_kain, uk)] if harga is not None else 0))
+                   for (uk, _, v), n in zip(barang_kain[jenis_kain], p) if n)
+
+    def pakai(kelompok, p, sisa, arah):
+        jenis_kain = kelompok[0]
+        for (uk, _, _), n in zip(barang_kain[jenis_kain], p):
+            if n:
+                sisa[kunci(jenis_kain, uk)] -= arah * n
+
+    def susun(harga, pola_kelompok):
+        """Rencana layak dari harga bayangan; returns (pola per gulungan, keuntungan, sisa pesanan)"""
+        sisa = dict(permintaan)
+        urutan = sorted(range(len(daftar)), key=lambda i: (
+            -nilai(kelompok_gulungan[i], pola_kelompok[kelompok_gulungan[i]], harga) / (kelompok_gulungan[i][1] or 1),
+            -kelompok_gulungan[i][1]))
+        pola_gulungan = [None] * len(daftar)
+        for i in urutan:
+            pola_gulungan[i] = pola(kelompok_gulungan[i], harga, sisa)
+            pakai(kelompok_gulungan[i], pola_gulungan[i], sisa, 1)
+
+        # Perbaikan: satu gulungan dioptimasi ulang (nilai asli) terhadap pesanan yang belum terpakai
+        for _ in range(MAKS_PUTARAN_PERBAIKAN):
+            membaik = False
+            for i in urutan:
+                kelompok, lama = kelompok_gulungan[i], pola_gulungan[i]
+                pakai(kelompok, lama, sisa, -1)
+                baru = pola(kelompok, None, sisa)
+                if nilai(kelompok, baru) > nilai(kelompok, lama):
+                    pola_gulungan[i] = lama = baru
+                    membaik = True
+                pakai(kelompok, lama, sisa, 1)
+            if not membaik:
+                break
+        keuntungan = sum(nilai(kelompok_gulungan[i], p) for i, p in enumerate(pola_gulungan))
+        return pola_gulungan, keuntungan, sisa
+
+    with fase_instrumen(instrumen, "rencana_potong") as catat:
+        iterasi = 0
+        if permintaan is None:
+            pola_kelompok = {k: pola(k) for k in anggota}
+            pola_gulungan = [pola_kelompok[k] for k in kelompok_gulungan]
+            batas_atas = sum(nilai(k, p) for k, p in zip(kelompok_gulungan, pola_gulungan))
+            sisa_pesanan = None
+        else:
+            pola_nol = {k: pola(k) for k in anggota}
+            terpakai = dict.fromkeys(permintaan, 0)
+            for k, p in pola_nol.items():
+                for (uk, _, _), n in zip(barang_kain[k[0]], p):
+                    if n:
+                        terpakai[kunci(k[0], uk)] += n * len(anggota[k])
+
+            if all(terpakai[k] <= n for k, n in permintaan.items()):
+                # Pesanan tidak mengikat: setiap gulungan sudah optimal sendiri-sendiri
+                pola_gulungan = [pola_nol[k] for k in kelompok_gulungan]
+                batas_atas = sum(nilai(k, p) for k, p in zip(kelompok_gulungan, pola_gulungan))
+                sisa_pesanan = {k: n - terpakai[k] for k, n in permintaan.items()}
+            else:
+                # Batas atas: setiap gulungan optimal tanpa kendala pesanan, atau seluruh
+                # pesanan terjual dengan keuntungan per pakaian terbaik
+                terbaik = {}
+                for jenis_kain, barang in barang_kain.items():
+                    for uk, _, v in barang:
+                        k = kunci(jenis_kain, uk)
+                        terbaik[k] = max(terbaik.get(k, 0), v)
+                batas_atas = min(sum(nilai(k, p) * len(anggota[k]) for k, p in pola_nol.items()),
+                                 sum(n * terbaik.get(k, 0) for k, n in permintaan.items()))
+
+                pola_gulungan, keuntungan_terbaik, sisa_pesanan = susun(dict.fromkeys(permintaan, 0), pola_nol)
+                if keuntungan_terbaik < batas_atas:
+                    kapasitas_kain = {}
+                    for jenis_kain, panjang_mm in anggota:
+                        kapasitas_kain[jenis_kain] = (kapasitas_kain.get(jenis_kain, 0)
+                                                      + panjang_mm * len(anggota[(jenis_kain, panjang_mm)]))
+                    harga, batas_lp, iterasi = _harga_bayangan(kapasitas_kain, barang_kain, permintaan, kunci,
+                                                               keuntungan_terbaik)
+                    batas_atas = min(batas_atas, int(batas_lp + 1e-6))
+                    if any(harga.values()):
+                        harga = {k: round(h) for k, h in harga.items()}
+                        hasil_susun = susun(harga, {k: pola(k, harga) for k in anggota})
+                        if hasil_susun[1] > keuntungan_terbaik:
+                            pola_gulungan, keuntungan_terbaik, sisa_pesanan = hasil_susun
+
+        if catat is not None:
+            catat(iterasi=iterasi, pakaian_ditambah=sum(sum(p) for p in pola_gulungan),
+                  cache_hit=cache_pola.hit - hit_awal, cache_miss=cache_pola.miss - miss_awal)
+
+    hasil_gulungan, produksi = [], {}
+    total_kain_mm = total_keuntungan = total_sisa_mm = 0
+    for (id_gulungan, jenis_kain, panjang), p in zip(daftar, pola_gulungan):
+        barang = barang_kain[jenis_kain]
+        hasil_produksi = {uk: n for (uk, _, _), n in zip(barang, p) if n}
+        keuntungan = sum(n * v for (_, _, v), n in zip(barang, p))
+        panjang_mm = ke_mm(panjang)
+        sisa_mm = panjang_mm - sum(n * w for (_, w, _), n in zip(barang, p))
+        for uk, n in hasil_produksi.items():
+            per_ukuran = produksi.setdefault(jenis_kain, {})
+            per_ukuran[uk] = per_ukuran.get(uk, 0) + n
+        hasil_gulungan.append({"id": id_gulungan, "jenis_kain": jenis_kain, "panjang": panjang,
+                               "hasil_produksi": hasil_produksi, "keuntungan": keuntungan,
+                               "sisa_kain": ke_meter(sisa_mm)})
+        total_kain_mm += panjang_mm
+        total_keuntungan += keuntungan
+        total_sisa_mm += sisa_mm
+
+    pesanan_sisa = sisa_pesanan
+    if per_kain and sisa_pesanan is not None:
+        pesanan_sisa = {}
+        for (kain, uk), n in sisa_pesanan.items():
+            pesanan_sisa.setdefault(kain, {})[uk] = n
+    statistik = {"kelompok_gulungan": len(anggota), "iterasi_harga": iterasi,
+                 "pola_dihitung": cache_pola.miss - miss_awal, "cache_hit": cache_pola.hit - hit_awal}
+    berat_mm = {kain: {uk: w for uk, w, _ in barang} for kain, barang in barang_kain.items()}
+    return RencanaPotong(hasil_gulungan, ke_meter(total_kain_mm), total_keuntungan, ke_meter(total_sisa_mm), produksi,
+                         pesanan_sisa, batas_atas, statistik, berat_mm)
@@ -0,0 +1,141 @@
+# indeks.py
+# Indeks kain terkompilasi: tabel ukuran berbasis array, urutan greedy yang sudah
+# diurutkan, lookup ukuran terkecil, dan peta terbalik produk -> kain.
+from array import array
+
+from logic import satuan_kain
+
+
+class KainTerkompilasi:
+    """Tabel satu kain yang sudah dikompilasi dari dataset"""
+
+    __slots__ = ("jenis_kain", "ukuran", "posisi", "meter", "keuntungan", "harga_per_meter", "rasio",
+                 "urutan_greedy", "urutan_meter", "rekomendasi_penggunaan", "satuan")
+
+    def __init__(self, jenis_kain, data_kain):
+        meter_per_ukuran = data_kain["meter_per_ukuran"]
+        keuntungan_per_pakaian = data_kain["keuntungan_per_pakaian"]
+        harga_per_meter = data_kain["harga_per_meter"]
+
+        self.jenis_kain = jenis_kain
+        self.ukuran = tuple(meter_per_ukuran.keys())
+        self.posisi = {uk: i for i, uk in enumerate(self.ukuran)}
+        self.meter = array("d", (meter_per_ukuran[uk] for uk in self.ukuran))
+        self.keuntungan = array("d", (keuntungan_per_pakaian[uk] for uk in self.ukuran))
+        self.harga_per_meter = harga_per_meter
+
+        # Rasio dan urutan dihitung dengan rumus yang sama seperti hitung()
+        rasio = []
+        for uk in self.ukuran:
+            biaya = meter_per_ukuran[uk] * harga_per_meter
+            keuntungan_bersih = keuntungan_per_pakaian[uk] - biaya
+            rasio.append(keuntungan_bersih / meter_per_ukuran[uk])
+        self.rasio = array("d", rasio)
+        n = len(self.ukuran)
+        self.urutan_greedy = tuple(sorted(range(n), key=lambda i: rasio[i], reverse=True))
+        self.urutan_meter = tuple(sorted(range(n), key=lambda i: meter_per_ukuran[self.ukuran[i]]))
+        self.rekomendasi_penggunaan = tuple(data_kain.get("rekomendasi_penggunaan", ()))
+        # ({ukuran: berat_mm}, {ukuran: keuntungan_rupiah}) untuk inti solver bilangan bulat
+        self.satuan = satuan_kain(data_kain)
+
+    def urutan(self, ukuran_tersedia=None):
+        """Urutan greedy (rasio menurun) yang dibatasi pada ukuran_tersedia"""
+        if ukuran_tersedia is None:
+            return [self.ukuran[i] for i in self.urutan_greedy]
+        tersedia = set(ukuran_tersedia)
+        return [self.ukuran[i] for i in self.urutan_greedy if self.ukuran[i] in tersedia]
+
+    def ukuran_terkecil(self, ukuran_tersedia=None):
+        """Ukuran dengan meter paling sedikit (sama dengan min() pada urutan dataset)"""
+        tersedia = set(ukuran_tersedia) if ukuran_tersedia is not None else None
+        for i in self.urutan_meter:
+            if tersedia is None or self.ukuran[i] in tersedia:
+                return self.ukuran[i]
+        return None
+
+
+class IndeksKain:
+    """
+    Indeks terkompilasi untuk dataset kain, dibangun lazy.
+
+    Satu kain dikompilasi saat pertama diakses (indeks[jenis_kain]), sehingga
+    KatalogKain tetap hanya mem-parse kain yang dipakai. Peta produk -> kain
+    dibangun saat rekomendasi pertama dari produk_per_kain() katalog (tanpa
+    memuat isi kain) jika dataset menyediakannya. Jika satu entri kain berubah,
+    panggil perbarui(jenis_kain) untuk mengompilasi ulang kain itu saja beserta
+    entri peta produknya.
+    """
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.kain = {}
+        self.produk = None  # produk -> set jenis_kain, dibangun saat rekomendasi pertama
+        self._produk_kain = {}  # jenis_kain -> produk yang dicatat di self.produk (untuk hapus)
+        self._posisi = {}  # jenis_kain -> urutan dataset; kain baru ditambahkan di akhir
+        self._posisi_berikut = 0
+
+    def __getitem__(self, jenis_kain):
+        kain = self.kain.get(jenis_kain)
+        if kain is None:
+            kain = KainTerkompilasi(jenis_kain, self.dataset[jenis_kain])
+            self.kain[jenis_kain] = kain
+        return kain
+
+    def __contains__(self, jenis_kain):
+        return jenis_kain in self.kain or jenis_kain in self.dataset
+
+    def perbarui(self, jenis_kain, data_kain=None):
+        """Mengompilasi ulang satu kain (data_kain opsional, default dari dataset)"""
+        if data_kain is None:
+            data_kain = self.dataset[jenis_kain]
+        baru = KainTerkompilasi(jenis_kain, data_kain)
+        self.kain[jenis_kain] = baru
+        if self.produk is not None:
+            self._hapus_produk(jenis_kain)
+            self._tambah_produk(jenis_kain, baru.rekomendasi_penggunaan)
+        return baru
+
+    def hapus(self, jenis_kain):
+        self.kain.pop(jenis_kain, None)
+        if self.produk is not None:
+            self._hapus_produk(jenis_kain, posisi=True)
+
+    def rekomendasi(self, produk_target):
+        """Daftar kain untuk produk, urut sesuai dataset (kosong jika tidak ada)"""
+        if self.produk is None:
+            self._bangun_produk()
+        kandidat = self.produk.get(produk_target)
+        if not kandidat:
+            return []
+        return sorted(kandidat, key=self._posisi.__getitem__)
+
+    def _bangun_produk(self):
+        self.produk = {}
+        self._produk_kain = {}
+        self._posisi = {}
+        self._posisi_berikut = 0
+        produk_per_kain = getattr(self.dataset, "produk_per_kain", None)
+        if produk_per_kain is not None:
+            peta = produk_per_kain()
+        else:
+            peta = {jenis_kain: data.get("rekomendasi_penggunaan", ()) for jenis_kain, data in self.dataset.items()}
+        for jenis_kain, daftar in peta.items():
+            self._tambah_produk(jenis_kain, daftar)
+
+    def _tambah_produk(self, jenis_kain, daftar):
+        if jenis_kain not in self._posisi:
+            self._posisi[jenis_kain] = self._posisi_berikut
+            self._posisi_berikut += 1
+        self._produk_kain[jenis_kain] = tuple(daftar)
+        for produk in daftar:
+            self.produk.setdefault(produk, set()).add(jenis_kain)
+
+    def _hapus_produk(self, jenis_kain, posisi=False):
+        for produk in self._produk_kain.pop(jenis_kain, ()):
+            daftar = self.produk.get(produk)
+            if daftar is not None:
+                daftar.discard(jenis_kain)
+                if not daftar:
+                    del self.produk[produk]
+        if posisi:
+            self._posisi.pop(jenis_kain, None)
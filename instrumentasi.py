@@ -0,0 +1,105 @@
+# instrumentasi.py
+# Instrumentasi opsional untuk pipeline optimasi: timer resolusi tinggi per fase,
+# counter, hook callback, log JSON terstruktur, dan capture cProfile satu run.
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("optimasi.instrumentasi")
+
+
+class Instrumentasi:
+    """
+    Pengumpul waktu dan counter per fase untuk satu run.
+
+    Fase yang dicatat oleh pipeline: alokasi_persentase, isi_greedy /
+    isi_knapsack, optimasi_sisa, cache, buat_grafik, grafik, render_canvas.
+    Counter umum: iterasi, pakaian_ditambah, meter_terpakai.
+
+    Hook dipanggil setiap fase selesai: hook(nama_fase, data_fase).
+    """
+
+    def __init__(self, hook=None):
+        self.fase_tercatat = {}
+        self._hooks = [hook] if hook is not None else []
+        self._mulai = time.perf_counter_ns()
+
+    def tambah_hook(self, hook):
+        self._hooks.append(hook)
+
+    @contextmanager
+    def fase(self, nama):
+        """Context manager pengukur satu fase; yield fungsi catat(**counter)"""
+        counter = {}
+
+        def catat(**nilai):
+            for kunci, angka in nilai.items():
+                counter[kunci] = counter.get(kunci, 0) + angka
+
+        mulai = time.perf_counter_ns()
+        try:
+            yield catat
+        finally:
+            durasi = time.perf_counter_ns() - mulai
+            data = self.fase_tercatat.setdefault(nama, {"ns": 0, "panggilan": 0})
+            data["ns"] += durasi
+            data["panggilan"] += 1
+            for kunci, angka in counter.items():
+                data[kunci] = data.get(kunci, 0) + angka
+            for hook in self._hooks:
+                hook(nama, dict(data, ns_terakhir=durasi))
+
+    def ringkasan(self):
+        """Dict siap-JSON: {fase: {ms, panggilan, counter...}, total_ms}"""
+        fase = {}
+        for nama, data in self.fase_tercatat.items():
+            entri = {k: v for k, v in data.items() if k != "ns"}
+            entri["ms"] = data["ns"] / 1e6
+            fase[nama] = entri
+        return {"fase": fase, "total_ms": (time.perf_counter_ns() - self._mulai) / 1e6}
+
+    def teks_status(self):
+        """Ringkasan satu baris untuk status bar"""
+        return " | ".join(f"{nama} {data['ns'] / 1e6:.2f} ms" for nama, data in self.fase_tercatat.items())
+
+    def log_json(self, **konteks):
+        """Menulis satu baris JSON terstruktur ke logger 'optimasi.instrumentasi'"""
+        data = dict(konteks, **self.ringkasan())
+        logger.info(json.dumps(data, ensure_ascii=False, default=str))
+        return data
+
+
+def aktifkan_log_file(path):
+    """Menulis log JSON instrumentasi (satu objek per baris) ke file; aman dipanggil berulang"""
+    path = os.path.abspath(path)
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == path:
+            return handler
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return handler
+
+
+def profil(fungsi, *args, path=None, baris=25, **kwargs):
+    """
+    Menjalankan satu panggilan di bawah cProfile.
+
+    Returns:
+        Tuple: (hasil fungsi, teks statistik teratas berdasarkan waktu kumulatif)
+    """
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    hasil = profiler.runcall(fungsi, *args, **kwargs)
+    if path:
+        profiler.dump_stats(path)
+    keluaran = io.StringIO()
+    pstats.Stats(profiler, stream=keluaran).sort_stats("cumulative").print_stats(baris)
+    return hasil, keluaran.getvalue()
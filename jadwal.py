@@ -0,0 +1,430 @@
+# jadwal.py
+# Rencana produksi multi-periode (mis. mingguan) dengan stok kain bergulir: sisa
+# kain satu periode menjadi stok periode berikutnya bersama kiriman baru, permintaan
+# per ukuran membatasi produksi, dan kain yang disimpan dikenai biaya simpan.
+#
+# Biaya simpan total = sum_t h_t * stok_akhir_t = konstanta - sum_t B_t * pakai_t,
+# dengan B_t = sum_{tau >= t} h_tau, sehingga memakai kain lebih awal bernilai B_t per
+# meter. Setiap periode punya tabel knapsack terbatas (batas = permintaan) untuk
+# semua pemakaian 0..kapasitas permintaan; tabel hanya bergantung pada kain dan
+# permintaan periode itu dan di-cache, jadi periode yang tidak berubah tidak
+# dihitung ulang. Pemakaian per periode dipilih eksak dengan DP atas pemakaian
+# kumulatif (= stok dibawa) dalam satuan FPB: langkah max-plus NumPy antar tabel,
+# dengan status yang batas Lagrange-nya (harga dual LP) di bawah solusi greedy
+# dipangkas sehingga hanya pita sempit di sekitar optimum yang dihitung.
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from logic import HasilProduksi, MM_PER_METER, fase_instrumen, ke_meter, ke_mm, ke_rupiah, satuan_kain
+
+# Penanda pemakaian tak tercapai; dua penanda dijumlahkan tetap tidak overflow int64
+TAK_TERCAPAI = -(1 << 60)
+
+
+class TabelPeriode:
+    """
+    Keuntungan maksimum satu periode untuk setiap pemakaian tepat 0..kapasitas (satuan FPB).
+
+    isi = ((ukuran, berat, keuntungan, permintaan), ...) dengan berat dalam satuan FPB.
+    Knapsack terbatas lewat potongan biner 1, 2, 4, ... per ukuran (NumPy per potongan).
+    """
+
+    __slots__ = ("kapasitas", "nilai", "_potongan", "_ambil")
+
+    def __init__(self, isi):
+        potongan = []
+        for ukuran, w, v, permintaan in isi:
+            k = 1
+            while permintaan > 0:
+                jumlah = min(k, permintaan)
+                potongan.append((ukuran, w, v, jumlah))
+                permintaan -= jumlah
+                k *= 2
+        self.kapasitas = sum(w * jumlah for _, w, _, jumlah in potongan)
+        nilai = np.full(self.kapasitas + 1, TAK_TERCAPAI, dtype=np.int64)
+        nilai[0] = 0
+        ambil = np.zeros((len(potongan), self.kapasitas + 1), dtype=bool)
+        for j, (_, w, v, jumlah) in enumerate(potongan):
+            berat, untung = w * jumlah, v * jumlah
+            dasar = nilai[:-berat]
+            kandidat = np.where(dasar != TAK_TERCAPAI, dasar + untung, TAK_TERCAPAI)
+            lebih_baik = kandidat > nilai[berat:]
+            ambil[j, berat:] = lebih_baik
+            nilai[berat:] = np.where(lebih_baik, kandidat, nilai[berat:])
+        self.nilai = nilai
+        self._potongan = potongan
+        self._ambil = ambil
+
+    def komposisi(self, c):
+        """Dict {ukuran: jumlah_pakaian} untuk pemakaian tepat c"""
+        hasil = {}
+        for j in range(len(self._potongan) - 1, -1, -1):
+            if c > 0 and self._ambil[j, c]:
+                ukuran, w, _, jumlah = self._potongan[j]
+                hasil[ukuran] = hasil.get(ukuran, 0) + jumlah
+                c -= w * jumlah
+        return hasil
+
+
+class CacheTabelPeriode:
+    """
+    LRU TabelPeriode per isi periode (berat, keuntungan, permintaan per ukuran).
+
+    Seperti CachePola, kunci dibentuk dari isi, bukan nomor periode, sehingga
+    minggu dengan permintaan yang sama (atau periode yang tidak berubah antar
+    perencanaan) memakai tabel yang sama.
+    """
+
+    def __init__(self, kapasitas=512):
+        self.kapasitas = kapasitas
+        self.hit = 0
+        self.miss = 0
+        self._lru = OrderedDict()
+
+    def __len__(self):
+        return len(self._lru)
+
+    def __contains__(self, kunci):
+        return kunci in self._lru
+
+    def tabel(self, isi):
+        tabel = self._lru.get(isi)
+        if tabel is not None:
+            self.hit += 1
+            self._lru.move_to_end(isi)
+            return tabel
+        self.miss += 1
+        tabel = TabelPeriode(isi)
+        self._lru[isi] = tabel
+        while len(self._lru) > self.kapasitas:
+            self._lru.popitem(last=False)
+        return tabel
+
+    def statistik(self):
+        return {"ukuran": len(self._lru), "hit": self.hit, "miss": self.miss}
+
+
+class JadwalProduksi:
+    """
+    Rencana produksi untuk seluruh horizon.
+
+    periode: satu dict per periode (stok_awal, kiriman, tersedia, hasil_produksi,
+    kekurangan permintaan, pakai, keuntungan, stok_akhir, biaya_simpan). Panjang
+    dalam meter, uang dalam rupiah. batas_atas adalah relaksasi LP keuntungan bersih.
+    """
+
+    __slots__ = ("jenis_kain", "meter_per_ukuran", "periode", "total_keuntungan", "total_biaya_simpan",
+                 "keuntungan_bersih", "batas_atas", "statistik")
+
+    def __init__(self, jenis_kain, meter_per_ukuran, periode, total_keuntungan, total_biaya_simpan, keuntungan_bersih,
+                 batas_atas, statistik):
+        self.jenis_kain = jenis_kain
+        self.meter_per_ukuran = meter_per_ukuran
+        self.periode = periode
+        self.total_keuntungan = total_keuntungan
+        self.total_biaya_simpan = total_biaya_simpan
+        self.keuntungan_bersih = keuntungan_bersih
+        self.batas_atas = batas_atas
+        self.statistik = statistik
+
+    def __len__(self):
+        return len(self.periode)
+
+    def __repr__(self):
+        return (f"JadwalProduksi(jenis_kain={self.jenis_kain!r}, periode={len(self)}, "
+                f"keuntungan_bersih={self.keuntungan_bersih!r})")
+
+    def hasil(self, t):
+        """HasilProduksi periode ke-t (total_kain = kain tersedia, sisa_kain = stok yang dibawa ke periode berikut)"""
+        p = self.periode[t]
+        return HasilProduksi(p["hasil_produksi"], p["keuntungan"], p["stok_akhir"], p["tersedia"], self.jenis_kain,
+                             self.meter_per_ukuran)
+
+    def ke_dict(self):
+        return {
+            "jenis_kain": self.jenis_kain,
+            "periode": self.periode,
+            "total_keuntungan": self.total_keuntungan,
+            "total_biaya_simpan": self.total_biaya_simpan,
+            "keuntungan_bersih": self.keuntungan_bersih,
+            "batas_atas": self.batas_atas,
+            "statistik": self.statistik,
+        }
+
+
+def _kurangi_slack(slack, t, jumlah):
+    for i in range(t, len(slack)):
+        slack[i] -= jumlah
+
+
+def _alokasi_greedy(slot, slack, pecahan=False):
+    """
+    Mengisi slot (t, indeks_ukuran, berat, nilai_mili, permintaan) urut kepadatan nilai di bawah
+    kendala stok kumulatif. Versi pecahan adalah optimum relaksasi LP (polimatroid: greedy optimal).
+
+    Returns:
+        Tuple: (jumlah per slot, total nilai mili-rupiah)
+    """
+    slack = list(slack)
+    jumlah = []
+    total = 0
+    for t, _, w, nilai, permintaan in slot:
+        ruang = min(slack[t:])
+        n = min(permintaan, ruang / w if pecahan else ruang // w)
+        if n > 0:
+            _kurangi_slack(slack, t, n * w)
+            total += n * nilai
+        jumlah.append(max(n, 0))
+    return jumlah, total
+
+
+def _harga_dual(slot, jumlah, slack, n_periode):
+    """
+    Harga kain per periode (mili-rupiah per satuan FPB) dari solusi LP pecahan.
+
+    Kendala stok kumulatif yang ketat membagi horizon menjadi blok; harga periode t adalah
+    kepadatan terbesar slot yang belum penuh sejak awal bloknya. Urutan harga tidak naik,
+    sehingga setiap harga ini memberi batas atas Lagrange yang sah.
+    """
+    pakai = [0] * n_periode
+    for (t, _, w, _, _), n in zip(slot, jumlah):
+        pakai[t] += n * w
+    terbaik = [0] * (n_periode + 1)
+    for (t, _, w, nilai, permintaan), n in zip(slot, jumlah):
+        if n < permintaan:
+            terbaik[t] = max(terbaik[t], nilai // w)
+    for t in range(n_periode - 1, -1, -1):
+        terbaik[t] = max(terbaik[t], terbaik[t + 1])
+    harga, awal, kumulatif = [], 0, 0
+    for t in range(n_periode):
+        harga.append(terbaik[awal])
+        kumulatif += pakai[t]
+        if slack[t] - kumulatif < 1e-9:
+            awal = t + 1
+    return np.minimum.accumulate(np.array(harga + [0], dtype=np.int64))
+
+
+def _dp_stok(nilai, calon, batas_sisa, harga, slack, target):
+    """
+    DP eksak atas pemakaian kumulatif U (stok dibawa = slack[t] - U) dengan langkah max-plus.
+
+    Status yang nilai + batas sisa horizonnya di bawah target dipangkas, begitu juga pemakaian
+    periode yang reduced cost-nya melebihi celah batas - target. calon per periode adalah
+    (pemakaian, reduced cost terhadap maksimumnya) untuk pemakaian yang tidak didominasi.
+
+    Returns:
+        Tuple: (pemakaian per periode atau None jika tidak ada solusi >= target, jumlah sel)
+    """
+    n_periode = len(nilai)
+    celah = batas_sisa[0] - target
+    if celah < 0:
+        return None, 0
+    bawah, f = 0, np.zeros(1, dtype=np.int64)
+    jejak = []
+    sel = 0
+    for t in range(n_periode):
+        pemakaian, kurang = calon[t]
+        c = pemakaian[kurang <= celah]
+        lebar = len(f)
+        atas = min(bawah + lebar - 1 + int(c[-1]), slack[t])
+        bawah_baru = bawah + int(c[0])
+        u = np.arange(bawah_baru, atas + 1)
+        sumber = u[:, None] - bawah - c[None, :]
+        sah = (sumber >= 0) & (sumber < lebar)
+        f_pad = np.append(f, TAK_TERCAPAI)
+        kandidat = np.where(sah, f_pad[np.where(sah, sumber, lebar)] + nilai[t][c], TAK_TERCAPAI)
+        sel += kandidat.size
+        pilih = kandidat.argmax(axis=1)
+        f = kandidat[np.arange(len(u)), pilih]
+        hidup = np.flatnonzero((f > TAK_TERCAPAI // 2) & (f + batas_sisa[t + 1] - harga[t + 1] * u >= target))
+        if not len(hidup):
+            return None, sel
+        a, b = int(hidup[0]), int(hidup[-1]) + 1
+        jejak.append((bawah_baru + a, c[pilih[a:b]]))
+        f, bawah = f[a:b], bawah_baru + a
+    if int(f.max()) < target:
+        return None, sel
+    u = bawah + int(f.argmax())
+    pakai = [0] * n_periode
+    for t in range(n_periode - 1, -1, -1):
+        awal, pilihan = jejak[t]
+        pakai[t] = int(pilihan[u - awal])
+        u -= pakai[t]
+    return pakai, sel
+
+
+def _jadwal_optimal(tabel, bonus, slack, slot):
+    """
+    Pemakaian per periode (satuan FPB) yang memaksimalkan keuntungan bersih secara eksak.
+
+    Batas atas Lagrange memakai harga dual LP (_harga_dual); solusi greedy bulat menjadi
+    batas bawah. DP dicoba dulu dengan target dekat batas atas (pita sempit) dan target
+    diturunkan bertahap hingga batas bawah greedy, yang selalu berhasil.
+
+    Returns:
+        Tuple: (pemakaian per periode, nilai LP mili-rupiah, jumlah sel DP)
+    """
+    n_periode = len(tabel)
+    nilai = []
+    for t, tb in enumerate(tabel):
+        tercapai = tb.nilai != TAK_TERCAPAI
+        nilai.append(np.where(tercapai, np.where(tercapai, tb.nilai, 0) * MM_PER_METER
+                              + bonus[t] * np.arange(tb.kapasitas + 1), TAK_TERCAPAI))
+    jumlah_lp, nilai_lp = _alokasi_greedy(slot, slack, pecahan=True)
+    jumlah, _ = _alokasi_greedy(slot, slack)
+    pakai = [0] * n_periode
+    for (t, _, w, _, _), n in zip(slot, jumlah):
+        pakai[t] += n * w
+    bawah = sum(int(nilai[t][c]) for t, c in enumerate(pakai))
+
+    harga = _harga_dual(slot, jumlah_lp, slack, n_periode)
+    batas_sisa = [0] * (n_periode + 1)
+    calon = []
+    for t in range(n_periode - 1, -1, -1):
+        reduced = nilai[t] - harga[t] * np.arange(len(nilai[t]))
+        maks = int(reduced.max())
+        batas_sisa[t] = batas_sisa[t + 1] + maks + int(harga[t] - harga[t + 1]) * slack[t]
+        # Pemakaian yang nilainya tidak melebihi pemakaian lebih kecil tidak pernah perlu dipilih
+        pemakaian = np.flatnonzero(nilai[t] > np.maximum.accumulate(np.append(TAK_TERCAPAI, nilai[t][:-1])))
+        calon.append((pemakaian, maks - reduced[pemakaian]))
+    calon.reverse()
+    celah_greedy = batas_sisa[0] - bawah
+    sel = 0
+    for bagi in (16, 4, 1):
+        hasil, n_sel = _dp_stok(nilai, calon, batas_sisa, harga, slack, batas_sisa[0] - celah_greedy // bagi)
+        sel += n_sel
+        if hasil is not None:
+            return hasil, nilai_lp, sel
+    return pakai, nilai_lp, sel
+
+
+def rencanakan_jadwal(jenis_kain, dataset, periode, stok_awal=0, biaya_simpan=0, ukuran_fokus=None, cache_tabel=None,
+                      instrumen=None):
+    """
+    Menyusun rencana produksi seluruh horizon dengan stok kain bergulir.
+
+    Setiap periode memakai stok awal + kiriman; kain yang tidak dipakai menjadi stok
+    periode berikutnya dan dikenai biaya simpan per meter. Produksi per ukuran dibatasi
+    permintaan periode itu. Tabel knapsack per periode di-cache berdasarkan isinya,
+    sehingga perencanaan ulang setelah satu periode berubah hanya menghitung tabel
+    periode itu; penjadwalan seluruh horizon sendiri hanya operasi pada tabel.
+
+    Args:
+        jenis_kain: Jenis kain yang direncanakan
+        dataset: Dataset parameter kain
+        periode: List dict per periode: "kiriman" (meter, default 0), "permintaan"
+            ({ukuran: jumlah_maksimum}), "biaya_simpan" (opsional, rupiah/meter/periode)
+        stok_awal: Stok kain sebelum periode pertama (meter)
+        biaya_simpan: Biaya simpan default (rupiah per meter stok akhir per periode)
+        ukuran_fokus: List ukuran yang boleh diproduksi (None untuk semua ukuran)
+        cache_tabel: CacheTabelPeriode opsional untuk dipakai ulang antar perencanaan
+        instrumen: Instrumentasi opsional (fase "jadwal")
+
+    Returns:
+        JadwalProduksi
+    """
+    if not periode:
+        raise ValueError("Horizon harus berisi minimal satu periode")
+    if jenis_kain not in dataset:
+        raise ValueError(f"Jenis kain '{jenis_kain}' tidak ditemukan")
+    data_kain = dataset[jenis_kain]
+    meter_per_ukuran = data_kain["meter_per_ukuran"]
+    berat_mm, untung = satuan_kain(data_kain)
+    ukuran = [uk for uk in meter_per_ukuran if (not ukuran_fokus or uk in ukuran_fokus) and berat_mm[uk] > 0]
+    if not ukuran:
+        raise ValueError("Tidak ada ukuran yang valid untuk difokuskan")
+    fpb = 0
+    for uk in ukuran:
+        fpb = math.gcd(fpb, berat_mm[uk])
+    fpb = fpb or 1
+
+    stok_mm = ke_mm(stok_awal)
+    if stok_mm < 0:
+        raise ValueError("Stok awal tidak boleh negatif")
+    kiriman_mm, simpan, permintaan = [], [], []
+    for t, p in enumerate(periode, 1):
+        kiriman = ke_mm(p.get("kiriman", 0))
+        h = ke_rupiah(p.get("biaya_simpan", biaya_simpan))
+        if kiriman < 0 or h < 0:
+            raise ValueError(f"Periode {t}: kiriman dan biaya simpan tidak boleh negatif")
+        minta = {}
+        for uk, n in (p.get("permintaan") or {}).items():
+            if uk not in meter_per_ukuran:
+                raise ValueError(f"Periode {t}: ukuran '{uk}' tidak ada di kain {jenis_kain}")
+            if int(n) != n or n < 0:
+                raise ValueError(f"Periode {t}: permintaan {uk} harus bilangan bulat >= 0")
+            minta[uk] = int(n)
+        kiriman_mm.append(kiriman)
+        simpan.append(h)
+        permintaan.append(minta)
+
+    cache_tabel = cache_tabel if cache_tabel is not None else CacheTabelPeriode()
+    hit_awal, miss_awal = cache_tabel.hit, cache_tabel.miss
+    with fase_instrumen(instrumen, "jadwal") as catat:
+        n_periode = len(periode)
+        # Stok kumulatif (mm) dan nilai pemakaian awal B_t (rupiah/m = mili-rupiah/mm)
+        kumulatif, total = [], stok_mm
+        for kiriman in kiriman_mm:
+            total += kiriman
+            kumulatif.append(total)
+        bonus_mm = [sum(simpan[t:]) for t in range(n_periode)]
+        bonus = [b * fpb for b in bonus_mm]
+
+        tabel = []
+        for minta in permintaan:
+            isi = tuple((uk, berat_mm[uk] // fpb, untung[uk], minta.get(uk, 0)) for uk in ukuran
+                        if minta.get(uk, 0) > 0)
+            tabel.append(cache_tabel.tabel(isi))
+
+        slack_awal = [k // fpb for k in kumulatif]
+        slot = []
+        for t, minta in enumerate(permintaan):
+            for j, uk in enumerate(ukuran):
+                w = berat_mm[uk] // fpb
+                nilai = untung[uk] * MM_PER_METER + bonus[t] * w
+                if minta.get(uk, 0) > 0 and nilai > 0:
+                    slot.append((t, j, w, nilai, minta[uk]))
+        slot.sort(key=lambda s: (-s[3] / s[2], s[0]))
+
+        pakai, nilai_lp, sel = _jadwal_optimal(tabel, bonus, slack_awal, slot)
+        if catat is not None:
+            catat(iterasi=sel)
+
+    hasil_periode = []
+    total_keuntungan = 0
+    total_biaya_simpan = 0
+    stok = stok_mm
+    for t in range(n_periode):
+        tersedia = stok + kiriman_mm[t]
+        produksi = tabel[t].komposisi(pakai[t])
+        produksi = {uk: produksi[uk] for uk in ukuran if uk in produksi}
+        keuntungan = int(tabel[t].nilai[pakai[t]])
+        stok = tersedia - pakai[t] * fpb
+        biaya = simpan[t] * stok / MM_PER_METER
+        total_keuntungan += keuntungan
+        total_biaya_simpan += biaya
+        hasil_periode.append({
+            "periode": t + 1,
+            "stok_awal": ke_meter(tersedia - kiriman_mm[t]),
+            "kiriman": ke_meter(kiriman_mm[t]),
+            "tersedia": ke_meter(tersedia),
+            "hasil_produksi": produksi,
+            "kekurangan": {uk: n - produksi.get(uk, 0) for uk, n in permintaan[t].items()
+                           if n > produksi.get(uk, 0)},
+            "pakai": ke_meter(pakai[t] * fpb),
+            "keuntungan": keuntungan,
+            "stok_akhir": ke_meter(stok),
+            "biaya_simpan": biaya,
+        })
+
+    konstanta = sum(h * k for h, k in zip(simpan, kumulatif))
+    statistik = {
+        "periode": n_periode,
+        "tabel_dihitung": cache_tabel.miss - miss_awal,
+        "tabel_dari_cache": cache_tabel.hit - hit_awal,
+        "fpb_mm": fpb,
+    }
+    return JadwalProduksi(jenis_kain, meter_per_ukuran, hasil_periode, total_keuntungan, total_biaya_simpan,
+                          total_keuntungan - total_biaya_simpan, (nilai_lp - konstanta) / MM_PER_METER, statistik)
@@ -0,0 +1,385 @@
+# katalog.py
+# Katalog kain eksternal (JSON, CSV, SQLite) yang dimuat secara lazy dan
+# dimuat ulang otomatis ketika file berubah (berdasarkan mtime).
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from collections.abc import Mapping
+
+UKURAN_BLOK = 1 << 16
+_TOKEN_JSON = re.compile(rb'["\\{}\[\],:]')
+_TOKEN_STRING = re.compile(rb'["\\]')
+# Daftar produk satu kain JSON tanpa mem-parse seluruh objeknya (lihat produk_per_kain)
+_PRODUK_JSON = re.compile(rb'"rekomendasi_penggunaan"\s*:\s*(\[[^\]]*\])')
+KOLOM_CSV = ("jenis_kain", "ukuran", "meter", "keuntungan", "harga_per_meter", "elastisitas",
+             "rekomendasi_penggunaan")
+
+
+def validasi_kain(jenis_kain, data_kain):
+    """
+    Memastikan satu definisi kain lengkap dan masuk akal.
+
+    Raises:
+        ValueError: Jika ada field yang hilang atau nilainya tidak valid
+    """
+    for field in ("meter_per_ukuran", "harga_per_meter", "keuntungan_per_pakaian"):
+        if field not in data_kain:
+            raise ValueError(f"Kain '{jenis_kain}': field '{field}' tidak ditemukan")
+    meter_per_ukuran = data_kain["meter_per_ukuran"]
+    keuntungan_per_pakaian = data_kain["keuntungan_per_pakaian"]
+    if not meter_per_ukuran:
+        raise ValueError(f"Kain '{jenis_kain}': tidak memiliki ukuran")
+    if set(meter_per_ukuran) != set(keuntungan_per_pakaian):
+        raise ValueError(f"Kain '{jenis_kain}': ukuran pada meter dan keuntungan tidak sama")
+    for ukuran, meter in meter_per_ukuran.items():
+        if not isinstance(meter, (int, float)) or meter <= 0:
+            raise ValueError(f"Kain '{jenis_kain}': meter ukuran {ukuran} harus lebih besar dari 0")
+        if not isinstance(keuntungan_per_pakaian[ukuran], (int, float)):
+            raise ValueError(f"Kain '{jenis_kain}': keuntungan ukuran {ukuran} harus berupa angka")
+    harga = data_kain["harga_per_meter"]
+    if not isinstance(harga, (int, float)) or harga < 0:
+        raise ValueError(f"Kain '{jenis_kain}': harga_per_meter tidak valid")
+    if not isinstance(data_kain.get("rekomendasi_penggunaan", []), list):
+        raise ValueError(f"Kain '{jenis_kain}': rekomendasi_penggunaan harus berupa list")
+    return data_kain
+
+
+def _angka(teks):
+    nilai = float(teks)
+    return int(nilai) if nilai.is_integer() else nilai
+
+
+def _scan_json(path):
+    """
+    Memindai objek JSON tingkat atas secara streaming (per blok) dan mencatat
+    posisi byte setiap nilai, tanpa mem-parse isinya.
+
+    Returns:
+        Dict: {jenis_kain: (offset_awal, offset_akhir)} sesuai urutan file
+    """
+    posisi = {}
+    kedalaman = 0
+    dalam_string = False
+    escape = False
+    kunci_bytes = None  # Buffer nama kunci saat sedang membaca kunci tingkat atas
+    kunci = None
+    awal_nilai = None
+    offset = 0
+    with open(path, "rb") as f:
+        while True:
+            blok = f.read(UKURAN_BLOK)
+            if not blok:
+                break
+            i = 0
+            while i < len(blok):
+                if dalam_string:
+                    if escape:
+                        escape = False
+                        if kunci_bytes is not None:
+                            kunci_bytes += blok[i:i + 1]
+                        i += 1
+                        continue
+                    m = _TOKEN_STRING.search(blok, i)
+                    if m is None:
+                        if kunci_bytes is not None:
+                            kunci_bytes += blok[i:]
+                        break
+                    if kunci_bytes is not None:
+                        kunci_bytes += blok[i:m.start()]
+                    i = m.end()
+                    if m.group() == b"\\":
+                        escape = True
+                        if kunci_bytes is not None:
+                            kunci_bytes += b"\\"
+                        continue
+                    dalam_string = False
+                    if kunci_bytes is not None:
+                        kunci = json.loads(b'"' + kunci_bytes + b'"')
+                        kunci_bytes = None
+                    continue
+
+                m = _TOKEN_JSON.search(blok, i)
+                if m is None:
+                    break
+                token = m.group()
+                i = m.end()
+                if token == b'"':
+                    dalam_string = True
+                    if kedalaman == 1 and kunci is None:
+                        kunci_bytes = b""
+                    elif kedalaman == 1 and awal_nilai is None:
+                        awal_nilai = offset + m.start()
+                elif token in (b"{", b"["):
+                    if kedalaman == 1 and awal_nilai is None:
+                        awal_nilai = offset + m.start()
+                    kedalaman += 1
+                elif token in (b"}", b"]"):
+                    kedalaman -= 1
+                    if kedalaman == 0 and kunci is not None:
+                        posisi[kunci] = (awal_nilai, offset + m.start())
+                        kunci = None
+                        awal_nilai = None
+                elif token == b"," and kedalaman == 1 and kunci is not None:
+                    posisi[kunci] = (awal_nilai, offset + m.start())
+                    kunci = None
+                    awal_nilai = None
+            offset += len(blok)
+    return posisi
+
+
+class KatalogKain(Mapping):
+    """
+    Katalog kain dari file JSON, CSV, atau SQLite yang dapat dipakai sebagai `dataset`.
+
+    Saat dibuka hanya nama kain (dan posisinya di file) yang dipindai; isi
+    sebuah kain baru di-parse dan divalidasi saat pertama kali diakses.
+    Perubahan file dideteksi lewat mtime, diperiksa paling sering setiap
+    `interval_cek` detik (None: hanya lewat periksa_perubahan()), lalu kain
+    yang berubah dilaporkan ke listener.
+
+    Format CSV: satu baris per (kain, ukuran) dengan kolom
+    jenis_kain, ukuran, meter, keuntungan, harga_per_meter, elastisitas,
+    rekomendasi_penggunaan (dipisah ';').
+
+    Format SQLite: tabel kain(jenis_kain, harga_per_meter, elastisitas),
+    ukuran_kain(jenis_kain, ukuran, meter, keuntungan, urutan) dan
+    rekomendasi(jenis_kain, produk).
+    """
+
+    def __init__(self, path, interval_cek=1.0):
+        self.path = path
+        self.interval_cek = interval_cek
+        ekstensi = os.path.splitext(path)[1].lower()
+        if ekstensi == ".json":
+            self.format = "json"
+        elif ekstensi == ".csv":
+            self.format = "csv"
+        elif ekstensi in (".sqlite", ".sqlite3", ".db"):
+            self.format = "sqlite"
+        else:
+            raise ValueError(f"Format katalog tidak dikenal: {path}")
+        self._listener = []
+        self._termuat = {}  # jenis_kain -> (data_kain, hash isi mentah)
+        self._posisi = {}
+        self._produk_csv = {}  # jenis_kain -> [produk], dikumpulkan saat pemindaian CSV
+        self._produk = None  # Peta produk terakhir dari produk_per_kain(), dibandingkan saat file berubah
+        self._stat = None
+        self._cek_terakhir = 0.0
+        self._pindai()
+
+    # --- Mapping -------------------------------------------------------
+    def __getitem__(self, jenis_kain):
+        self._cek_otomatis()
+        entri = self._termuat.get(jenis_kain)
+        if entri is None:
+            if jenis_kain not in self._posisi:
+                raise KeyError(jenis_kain)
+            mentah = self._baca_mentah(jenis_kain)
+            data_kain = validasi_kain(jenis_kain, self._parse(jenis_kain, mentah))
+            entri = (data_kain, hashlib.sha1(mentah).hexdigest())
+            self._termuat[jenis_kain] = entri
+        return entri[0]
+
+    def __iter__(self):
+        self._cek_otomatis()
+        return iter(list(self._posisi))
+
+    def __len__(self):
+        return len(self._posisi)
+
+    def __contains__(self, jenis_kain):
+        self._cek_otomatis()
+        return jenis_kain in self._posisi
+
+    def produk_per_kain(self):
+        """
+        {jenis_kain: [produk, ...]} untuk peta rekomendasi tanpa memuat dan memvalidasi setiap kain.
+
+        CSV memakai kolom yang sudah dibaca saat pemindaian, SQLite satu query ke tabel
+        rekomendasi, dan JSON hanya mencari array rekomendasi_penggunaan di potongan byte
+        tiap kain (kain yang sudah termuat memakai isinya).
+        """
+        self._cek_otomatis()
+        self._produk = self._baca_produk()
+        return {nama: list(daftar) for nama, daftar in self._produk.items()}
+
+    def _baca_produk(self):
+        if self.format == "csv":
+            return {nama: list(self._produk_csv.get(nama, ())) for nama in self._posisi}
+        if self.format == "sqlite":
+            peta = {nama: [] for nama in self._posisi}
+            with sqlite3.connect(self.path) as db:
+                for nama, produk in db.execute("SELECT jenis_kain, produk FROM rekomendasi ORDER BY rowid"):
+                    if nama in peta:
+                        peta[nama].append(produk)
+            return peta
+        peta = {}
+        with open(self.path, "rb") as f:
+            for nama, (awal, akhir) in self._posisi.items():
+                if nama in self._termuat:
+                    peta[nama] = list(self._termuat[nama][0].get("rekomendasi_penggunaan", ()))
+                    continue
+                # Hanya potongan byte kain ini yang dibaca, bukan seluruh file
+                f.seek(awal)
+                mentah = f.read(akhir - awal)
+                m = _PRODUK_JSON.search(mentah)
+                try:
+                    peta[nama] = json.loads(m.group(1)) if m else []
+                except ValueError:
+                    # Nama produk berisi "]": parse objek kain ini saja
+                    peta[nama] = list(json.loads(mentah).get("rekomendasi_penggunaan", ()))
+        return peta
+
+    # --- Hot reload ----------------------------------------------------
+    def saat_berubah(self, callback):
+        """Mendaftarkan callback(berubah: set) yang dipanggil setelah file katalog berubah"""
+        self._listener.append(callback)
+
+    def periksa_perubahan(self):
+        """
+        Memeriksa mtime file; jika berubah, pindai ulang dan buang kain yang isinya berubah.
+
+        Returns:
+            Set nama kain yang ditambah, dihapus, atau berubah (kosong jika tidak ada)
+        """
+        self._cek_terakhir = time.monotonic()
+        if self._stat_file() == self._stat:
+            return set()
+
+        nama_lama = set(self._posisi)
+        self._pindai()
+        berubah = nama_lama ^ set(self._posisi)
+        for jenis_kain, (_, hash_lama) in list(self._termuat.items()):
+            if jenis_kain not in self._posisi:
+                del self._termuat[jenis_kain]
+            elif hashlib.sha1(self._baca_mentah(jenis_kain)).hexdigest() != hash_lama:
+                del self._termuat[jenis_kain]
+                berubah.add(jenis_kain)
+        if self._produk is not None:
+            # Kain yang belum dimuat tidak punya hash; produknya dibandingkan dengan peta yang terakhir
+            # diberikan agar peta produk -> kain di indeks ikut diperbarui
+            lama = self._produk
+            self._produk = self._baca_produk()
+            berubah.update(nama for nama, daftar in self._produk.items() if nama in lama and lama[nama] != daftar)
+        if berubah:
+            for callback in self._listener:
+                callback(berubah)
+        return berubah
+
+    def _cek_otomatis(self):
+        if self.interval_cek is not None and time.monotonic() - self._cek_terakhir >= self.interval_cek:
+            self.periksa_perubahan()
+
+    def _stat_file(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    # --- Pemindaian & parsing per format -------------------------------
+    def _pindai(self):
+        self._stat = self._stat_file()
+        self._cek_terakhir = time.monotonic()
+        if self.format == "json":
+            self._posisi = _scan_json(self.path)
+        elif self.format == "csv":
+            self._posisi = self._scan_csv()
+        else:
+            with sqlite3.connect(self.path) as db:
+                self._posisi = {nama: None for (nama,) in db.execute("SELECT jenis_kain FROM kain ORDER BY rowid")}
+
+    def _scan_csv(self):
+        # Catat offset byte setiap baris per kain; baris dibaca ulang saat kain diakses
+        posisi = {}
+        produk_csv = {}
+        with open(self.path, "rb") as f:
+            header = f.readline()
+            kolom = next(csv.reader([header.decode("utf-8-sig")]))
+            if [k.strip() for k in kolom[:len(KOLOM_CSV)]] != list(KOLOM_CSV):
+                raise ValueError(f"Header CSV katalog harus: {', '.join(KOLOM_CSV)}")
+            while True:
+                offset = f.tell()
+                baris = f.readline()
+                if not baris:
+                    break
+                if not baris.strip():
+                    continue
+                kolom_baris = next(csv.reader([baris.decode("utf-8")]))
+                nama = kolom_baris[0].strip()
+                posisi.setdefault(nama, []).append(offset)
+                daftar = produk_csv.setdefault(nama, [])
+                for produk in (kolom_baris[6] if len(kolom_baris) > 6 else "").split(";"):
+                    if produk.strip() and produk.strip() not in daftar:
+                        daftar.append(produk.strip())
+        self._produk_csv = produk_csv
+        return posisi
+
+    def _baca_mentah(self, jenis_kain):
+        if self.format == "json":
+            awal, akhir = self._posisi[jenis_kain]
+            with open(self.path, "rb") as f:
+                f.seek(awal)
+                return f.read(akhir - awal)
+        if self.format == "csv":
+            potongan = []
+            with open(self.path, "rb") as f:
+                for offset in self._posisi[jenis_kain]:
+                    f.seek(offset)
+                    potongan.append(f.readline())
+            return b"".join(potongan)
+        with sqlite3.connect(self.path) as db:
+            kain = db.execute("SELECT harga_per_meter, elastisitas FROM kain WHERE jenis_kain = ?",
+                              (jenis_kain,)).fetchone()
+            ukuran = db.execute("SELECT ukuran, meter, keuntungan FROM ukuran_kain WHERE jenis_kain = ? "
+                                "ORDER BY urutan, rowid", (jenis_kain,)).fetchall()
+            produk = db.execute("SELECT produk FROM rekomendasi WHERE jenis_kain = ? ORDER BY rowid",
+                                (jenis_kain,)).fetchall()
+        return json.dumps([kain, ukuran, [p for (p,) in produk]]).encode("utf-8")
+
+    def _parse(self, jenis_kain, mentah):
+        if self.format == "json":
+            return json.loads(mentah)
+
+        if self.format == "csv":
+            data_kain = {"meter_per_ukuran": {}, "keuntungan_per_pakaian": {}, "rekomendasi_penggunaan": []}
+            for baris in csv.reader(mentah.decode("utf-8").splitlines()):
+                _, ukuran, meter, keuntungan, harga, elastisitas, rekomendasi = [b.strip() for b in baris[:7]]
+                data_kain["meter_per_ukuran"][ukuran] = _angka(meter)
+                data_kain["keuntungan_per_pakaian"][ukuran] = _angka(keuntungan)
+                if harga:
+                    data_kain["harga_per_meter"] = _angka(harga)
+                if elastisitas:
+                    data_kain["elastisitas"] = elastisitas
+                for produk in rekomendasi.split(";"):
+                    if produk.strip() and produk.strip() not in data_kain["rekomendasi_penggunaan"]:
+                        data_kain["rekomendasi_penggunaan"].append(produk.strip())
+            return data_kain
+
+        kain, ukuran, produk = json.loads(mentah)
+        if kain is None:
+            raise ValueError(f"Kain '{jenis_kain}' tidak ditemukan di katalog")
+        return {
+            "meter_per_ukuran": {uk: meter for uk, meter, _ in ukuran},
+            "harga_per_meter": kain[0],
+            "keuntungan_per_pakaian": {uk: keuntungan for uk, _, keuntungan in ukuran},
+            "elastisitas": kain[1],
+            "rekomendasi_penggunaan": produk,
+        }
+
+
+def muat_daftar_produk(path):
+    """
+    Membaca daftar jenis produk dari JSON (list), CSV/teks (satu per baris),
+    atau SQLite (tabel produk(nama)).
+    """
+    ekstensi = os.path.splitext(path)[1].lower()
+    if ekstensi == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    if ekstensi in (".sqlite", ".sqlite3", ".db"):
+        with sqlite3.connect(path) as db:
+            return [nama for (nama,) in db.execute("SELECT nama FROM produk ORDER BY rowid")]
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return [baris[0].strip() for baris in csv.reader(f) if baris and baris[0].strip()]
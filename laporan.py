@@ -0,0 +1,195 @@
+# laporan.py
+# Laporan per pesanan (grafik batang + pie dari gambar_grafik dan tabel hasil)
+# ke PNG/PDF. Hanya memakai API Figure berorientasi objek dengan kanvas Agg/PDF,
+# tanpa state global pyplot, sehingga aman dan cepat dijalankan di process pool.
+# Render dengan input identik diambil dari cache berkas (nama = hash input).
+import hashlib
+import json
+import os
+import re
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from logic import gambar_grafik
+
+# Naikkan jika tata letak laporan berubah agar render lama di cache tidak dipakai
+VERSI_LAPORAN = 1
+FORMAT_LAPORAN = ("png", "pdf")
+DPI_PNG = 100
+KOLOM_TABEL = ("Ukuran", "Jumlah", "Meter/Pakaian", "Total Meter", "Keuntungan/Pakaian", "Total Keuntungan")
+
+
+def _rupiah(nilai):
+    return f"Rp{int(nilai):,}".replace(",", ".")
+
+
+def baris_tabel(hasil, keuntungan_per_pakaian=None):
+    """Baris tabel hasil (format sama dengan tabel di tab hasil aplikasi)"""
+    baris = []
+    for ukuran, jumlah in hasil.hasil_produksi.items():
+        meter = hasil.meter_per_ukuran[ukuran]
+        keuntungan = (keuntungan_per_pakaian or {}).get(ukuran)
+        baris.append((
+            ukuran.upper(),
+            str(jumlah),
+            f"{meter:.2f} m",
+            f"{meter * jumlah:.2f} m",
+            _rupiah(keuntungan) if keuntungan is not None else "-",
+            _rupiah(keuntungan * jumlah) if keuntungan is not None else "-",
+        ))
+    return baris
+
+
+def kunci_laporan(hasil, format_laporan="png", judul=None, keuntungan_per_pakaian=None):
+    """Hash semua input yang mempengaruhi isi laporan (kunci cache render)"""
+    data = {
+        "versi": VERSI_LAPORAN,
+        "format": format_laporan,
+        "judul": judul,
+        "jenis_kain": hasil.jenis_kain,
+        "total_kain": hasil.total_kain,
+        "sisa_kain": round(hasil.sisa_kain, 4),
+        "total_keuntungan": hasil.total_keuntungan,
+        # Urutan ukuran ikut menentukan urutan batang dan baris tabel
+        "hasil_produksi": list(hasil.hasil_produksi.items()),
+        "meter": [hasil.meter_per_ukuran[uk] for uk in hasil.hasil_produksi],
+        "keuntungan": [(keuntungan_per_pakaian or {}).get(uk) for uk in hasil.hasil_produksi],
+    }
+    teks = json.dumps(data, ensure_ascii=False, default=str)
+    return hashlib.sha1(teks.encode("utf-8")).hexdigest()
+
+
+def buat_figure_laporan(hasil, judul=None, keuntungan_per_pakaian=None):
+    """Figure laporan (tanpa pyplot): grafik batang + pie di atas, tabel hasil dan ringkasan di bawah"""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 8))
+    # Tata letak tetap: tight_layout mengukur semua teks dan memakan separuh waktu render
+    grid = fig.add_gridspec(2, 2, height_ratios=(5, 3), left=0.06, right=0.97, top=0.87, bottom=0.03,
+                            wspace=0.2, hspace=0.25)
+    ax1 = fig.add_subplot(grid[0, 0])
+    ax2 = fig.add_subplot(grid[0, 1])
+    ax_tabel = fig.add_subplot(grid[1, :])
+    ax_tabel.axis("off")
+
+    fig.suptitle(judul or f"Laporan Produksi {hasil.jenis_kain} ({hasil.total_kain} m)", fontsize=14)
+    if gambar_grafik(ax1, ax2, hasil.hasil_produksi, hasil.meter_per_ukuran, hasil.total_kain,
+                     hasil.sisa_kain) is None:
+        for ax in (ax1, ax2):
+            ax.axis("off")
+        ax1.text(0.5, 0.5, "Tidak ada produksi", ha="center", va="center", transform=ax1.transAxes)
+
+    baris = baris_tabel(hasil, keuntungan_per_pakaian)
+    if baris:
+        tabel = ax_tabel.table(cellText=baris, colLabels=KOLOM_TABEL, loc="upper center", cellLoc="center")
+        tabel.auto_set_font_size(False)
+        tabel.set_fontsize(10)
+        tabel.scale(1, 1.4)
+    ax_tabel.text(0.5, 0.0, f"Total Keuntungan: {_rupiah(hasil.total_keuntungan)}    "
+                            f"Sisa Kain: {hasil.sisa_kain:.2f} m    Total Kain: {hasil.total_kain} m",
+                  ha="center", va="bottom", transform=ax_tabel.transAxes, fontsize=11)
+    return fig
+
+
+def render_laporan(hasil, path, format_laporan=None, judul=None, keuntungan_per_pakaian=None):
+    """Menulis laporan ke path (PNG lewat kanvas Agg, PDF lewat backend PDF) secara atomik"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    format_laporan = format_laporan or os.path.splitext(path)[1].lstrip(".").lower() or "png"
+    if format_laporan not in FORMAT_LAPORAN:
+        raise ValueError(f"Format laporan harus salah satu dari {', '.join(FORMAT_LAPORAN)}")
+    fig = buat_figure_laporan(hasil, judul, keuntungan_per_pakaian)
+    FigureCanvasAgg(fig)
+    sementara = f"{path}.{os.getpid()}.tmp"
+    fig.savefig(sementara, format=format_laporan, dpi=DPI_PNG)
+    os.replace(sementara, path)
+    return path
+
+
+def _nama_berkas(nama):
+    return re.sub(r"[^\w.-]+", "_", str(nama)).strip(".") or "laporan"
+
+
+def simpan_laporan(hasil, folder, nama, format_laporan="png", folder_cache=None, judul=None,
+                   keuntungan_per_pakaian=None):
+    """
+    Menulis laporan satu pesanan ke folder/<nama>.<format>.
+
+    Jika folder_cache diberikan, render disimpan di sana dengan nama hash input
+    dan hanya disalin bila input identik sudah pernah dirender.
+
+    Returns:
+        Tuple: (path, dari_cache)
+    """
+    path = os.path.join(folder, f"{_nama_berkas(nama)}.{format_laporan}")
+    if folder_cache is None:
+        return render_laporan(hasil, path, format_laporan, judul, keuntungan_per_pakaian), False
+
+    kunci = kunci_laporan(hasil, format_laporan, judul, keuntungan_per_pakaian)
+    path_cache = os.path.join(folder_cache, f"{kunci}.{format_laporan}")
+    dari_cache = os.path.exists(path_cache)
+    if not dari_cache:
+        render_laporan(hasil, path_cache, format_laporan, judul, keuntungan_per_pakaian)
+    shutil.copyfile(path_cache, path)
+    return path, dari_cache
+
+
+def _kerjakan(tugas):
+    """Dijalankan di worker: satu laporan, (nama, path, dari_cache) atau (nama, None, pesan_error)"""
+    nama, hasil, folder, format_laporan, folder_cache, judul, keuntungan_per_pakaian = tugas
+    try:
+        path, dari_cache = simpan_laporan(hasil, folder, nama, format_laporan, folder_cache, judul,
+                                          keuntungan_per_pakaian)
+        return nama, path, dari_cache
+    except (KeyError, ValueError, OSError) as e:
+        return nama, None, str(e)
+
+
+def ekspor_laporan(daftar, folder, format_laporan="png", folder_cache=None, workers=None, dataset=None):
+    """
+    Merender banyak laporan secara paralel dan mengalirkan hasilnya begitu selesai.
+
+    Hanya sejumlah kecil laporan yang menunggu sekaligus sehingga `daftar` boleh
+    berupa generator sebesar apa pun. Keluaran mengikuti urutan input dan dialirkan
+    begitu laporan terdepan selesai.
+
+    Args:
+        daftar: Iterable (nama, HasilProduksi) atau (nama, HasilProduksi, judul)
+        folder: Folder tujuan
+        format_laporan: "png" atau "pdf"
+        folder_cache: Folder cache render (None = selalu render)
+        workers: Jumlah proses (default: jumlah CPU; 1 = di proses ini)
+        dataset: Dataset opsional untuk kolom keuntungan/pakaian di tabel
+
+    Yields:
+        Tuple: (nama, path, dari_cache); path None dan dari_cache berisi pesan jika gagal
+    """
+    if format_laporan not in FORMAT_LAPORAN:
+        raise ValueError(f"Format laporan harus salah satu dari {', '.join(FORMAT_LAPORAN)}")
+    os.makedirs(folder, exist_ok=True)
+    if folder_cache:
+        os.makedirs(folder_cache, exist_ok=True)
+
+    def tugas():
+        for entri in daftar:
+            nama, hasil = entri[0], entri[1]
+            judul = entri[2] if len(entri) > 2 else None
+            keuntungan = dataset[hasil.jenis_kain]["keuntungan_per_pakaian"] if dataset is not None else None
+            yield nama, hasil, folder, format_laporan, folder_cache, judul, keuntungan
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for t in tugas():
+            yield _kerjakan(t)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        antrian = deque()
+        for t in tugas():
+            antrian.append(executor.submit(_kerjakan, t))
+            # Alirkan yang sudah selesai di depan antrian tanpa menunggu sisanya
+            while antrian and (antrian[0].done() or len(antrian) >= workers * 4):
+                yield antrian.popleft().result()
+        while antrian:
+            yield antrian.popleft().result()
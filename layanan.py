@@ -0,0 +1,461 @@
+# layanan.py
+# Layanan HTTP/JSON lokal (asyncio, hanya pustaka standar) agar optimizer bisa
+# dipanggil dari ERP tanpa jendela Tkinter. Pesanan hitung yang datang bersamaan
+# digabung menjadi batch mikro, dan semua pekerjaan CPU berjalan di pool worker
+# sehingga event loop tidak pernah terblokir.
+#
+#   python main.py layanan --port 8080 --workers 4
+#   curl -X POST localhost:8080/hitung -d '{"jenis_kain": "Katun", "total_kain": 100}'
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+from cli import _parse_bool, _parse_fokus, _parse_persentase, _siapkan_worker, proses_potongan
+from logic import kurva_keuntungan, rekomendasi_kain
+from pembelian import CacheKurvaBeli, rencanakan_pembelian
+
+UKURAN_BATCH_MAKS = 64
+JENDELA_BATCH = 0.002  # detik menunggu pesanan lain sebelum batch dikirim ke worker
+UKURAN_BODY_MAKS = 1 << 20
+MAKS_SKENARIO_SWEEP = 1_000_000
+SAMPEL_LATENSI = 2048
+
+_cache_kurva = None  # CacheKurvaBeli per proses worker
+RUTE = {
+    "/hitung": "POST",
+    "/rekomendasi": "POST",
+    "/sweep": "POST",
+    "/pembelian": "POST",
+    "/metrik": "GET",
+    "/kesehatan": "GET",
+}
+
+
+class ErrorHttp(Exception):
+    def __init__(self, status, pesan):
+        super().__init__(pesan)
+        self.status = status
+
+
+def _json_bytes(data):
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _kerjakan_rekomendasi(produk_target, path_katalog):
+    """Dijalankan di worker; hasil sudah di-encode agar event loop tidak ikut serialisasi"""
+    dataset, indeks, _ = _siapkan_worker(None, path_katalog)
+    return _json_bytes({"produk_target": produk_target,
+                        "jenis_kain": rekomendasi_kain(dataset, produk_target, indeks)})
+
+
+def _kerjakan_sweep(permintaan, path_katalog):
+    """
+    Dijalankan di worker. Dua bentuk permintaan:
+    - {"jenis_kain", "panjang_maks", "resolusi"}: kurva_keuntungan (solver eksak, satu tabel DP)
+    - {"daftar_total_kain", "daftar_persentase", "jenis_kain"?}: matriks skenario hitung_batch (greedy)
+    """
+    dataset, indeks, _ = _siapkan_worker(None, path_katalog)
+    ukuran_fokus = _parse_fokus(permintaan.get("ukuran_fokus"))
+    if "panjang_maks" in permintaan:
+        panjang_maks = float(permintaan["panjang_maks"])
+        resolusi = float(permintaan.get("resolusi", 1.0))
+        if resolusi > 0 and panjang_maks / resolusi + 1 > MAKS_SKENARIO_SWEEP:
+            raise ValueError(f"Sweep melebihi {MAKS_SKENARIO_SWEEP} titik, perbesar resolusi")
+        kurva = kurva_keuntungan(permintaan["jenis_kain"], dataset, panjang_maks, resolusi, ukuran_fokus)
+        return _json_bytes(kurva.ke_dict(_parse_bool(permintaan.get("dengan_komposisi"))))
+
+    from skenario import hitung_batch
+
+    daftar_total_kain = [float(t) for t in permintaan["daftar_total_kain"]]
+    daftar_persentase = [_parse_persentase(p) for p in permintaan.get("daftar_persentase") or [None]]
+    jenis_kain = permintaan.get("jenis_kain")
+    if isinstance(jenis_kain, str):
+        jenis_kain = [jenis_kain]
+    for kain in jenis_kain or ():
+        if kain not in dataset:
+            raise ValueError(f"Jenis kain '{kain}' tidak ditemukan")
+    n_kain = len(jenis_kain) if jenis_kain else len(dataset)
+    if n_kain * len(daftar_total_kain) * len(daftar_persentase) > MAKS_SKENARIO_SWEEP:
+        raise ValueError(f"Sweep melebihi {MAKS_SKENARIO_SWEEP} skenario")
+    hasil = hitung_batch(dataset, daftar_total_kain, daftar_persentase, jenis_kain, ukuran_fokus,
+                         _parse_bool(permintaan.get("optimasi_sisa")), indeks)
+    return _json_bytes(hasil.ke_dict())
+
+
+def _kerjakan_pembelian(permintaan, path_katalog):
+    """Dijalankan di worker; kurva per kain di-cache per proses (pool layanan sudah paralel)"""
+    global _cache_kurva
+    dataset, indeks, _ = _siapkan_worker(None, path_katalog)
+    if _cache_kurva is None:
+        _cache_kurva = CacheKurvaBeli()
+    jenis_kain = permintaan.get("jenis_kain")
+    if isinstance(jenis_kain, str):
+        jenis_kain = _parse_fokus(jenis_kain)
+    rencana = rencanakan_pembelian(float(permintaan["anggaran"]), dataset, permintaan.get("produk_target"),
+                                   jenis_kain, _parse_fokus(permintaan.get("ukuran_fokus")),
+                                   _parse_persentase(permintaan.get("meter_maks")), cache_kurva=_cache_kurva,
+                                   workers=1, indeks=indeks)
+    return _json_bytes(rencana.ke_dict())
+
+
+class MetrikLayanan:
+    """Counter latensi dan throughput per endpoint, plus statistik batch mikro"""
+
+    def __init__(self, sampel=SAMPEL_LATENSI):
+        self._mulai = time.monotonic()
+        self._sampel = sampel
+        self._endpoint = {}
+        self._batch = {"jumlah": 0, "pesanan": 0, "maks_ukuran": 0, "total_ms": 0.0}
+
+    def catat(self, endpoint, detik, status):
+        data = self._endpoint.get(endpoint)
+        if data is None:
+            data = self._endpoint[endpoint] = {"permintaan": 0, "error": 0, "total_ms": 0.0, "maks_ms": 0.0,
+                                               "sampel": deque(maxlen=self._sampel)}
+        ms = detik * 1000
+        data["permintaan"] += 1
+        data["error"] += status >= 400
+        data["total_ms"] += ms
+        data["maks_ms"] = max(data["maks_ms"], ms)
+        data["sampel"].append(ms)
+
+    def catat_batch(self, ukuran, detik):
+        self._batch["jumlah"] += 1
+        self._batch["pesanan"] += ukuran
+        self._batch["maks_ukuran"] = max(self._batch["maks_ukuran"], ukuran)
+        self._batch["total_ms"] += detik * 1000
+
+    def ringkasan(self, **status):
+        """Dict siap-JSON: {uptime_detik, endpoint: {...}, batch: {...}, **status}"""
+        uptime = time.monotonic() - self._mulai
+        endpoint = {}
+        for nama, data in self._endpoint.items():
+            sampel = sorted(data["sampel"])
+            endpoint[nama] = {
+                "permintaan": data["permintaan"],
+                "error": data["error"],
+                "per_detik": data["permintaan"] / uptime,
+                "rata_ms": data["total_ms"] / data["permintaan"],
+                "p50_ms": _persentil(sampel, 0.50),
+                "p95_ms": _persentil(sampel, 0.95),
+                "p99_ms": _persentil(sampel, 0.99),
+                "maks_ms": data["maks_ms"],
+            }
+        batch = self._batch
+        return dict({
+            "uptime_detik": uptime,
+            "endpoint": endpoint,
+            "batch": {
+                "jumlah": batch["jumlah"],
+                "pesanan": batch["pesanan"],
+                "pesanan_per_detik": batch["pesanan"] / uptime,
+                "rata_ukuran": batch["pesanan"] / batch["jumlah"] if batch["jumlah"] else 0.0,
+                "maks_ukuran": batch["maks_ukuran"],
+                "rata_ms": batch["total_ms"] / batch["jumlah"] if batch["jumlah"] else 0.0,
+            },
+        }, **status)
+
+
+def _persentil(terurut, q):
+    if not terurut:
+        return 0.0
+    return terurut[min(len(terurut) - 1, int(q * len(terurut)))]
+
+
+class PengumpulBatch:
+    """
+    Menggabungkan pesanan yang datang bersamaan menjadi satu tugas worker.
+
+    Pesanan pertama menunggu paling lama `jendela` detik agar pesanan lain ikut;
+    selama semua slot worker sibuk, antrian terus bertambah sehingga batch
+    membesar dengan sendirinya saat beban tinggi (sampai `ukuran_maks`).
+    """
+
+    def __init__(self, kirim, ukuran_maks=UKURAN_BATCH_MAKS, jendela=JENDELA_BATCH, maks_berjalan=2):
+        self._kirim = kirim  # coroutine(daftar_baris) -> daftar keluaran, urutan sama
+        self.ukuran_maks = ukuran_maks
+        self.jendela = jendela
+        self._antrian = asyncio.Queue()
+        self._slot = asyncio.Semaphore(maks_berjalan)
+        self._berjalan = set()
+        self._tugas = None
+
+    def __len__(self):
+        return self._antrian.qsize()
+
+    @property
+    def berjalan(self):
+        return len(self._berjalan)
+
+    def mulai(self):
+        self._tugas = asyncio.create_task(self._kumpulkan())
+
+    async def berhenti(self):
+        if self._tugas is not None:
+            self._tugas.cancel()
+            await asyncio.gather(self._tugas, *self._berjalan, return_exceptions=True)
+            self._tugas = None
+
+    def ajukan(self, baris):
+        """Future yang selesai dengan keluaran pesanan ini"""
+        future = asyncio.get_running_loop().create_future()
+        self._antrian.put_nowait((baris, future))
+        return future
+
+    async def _kumpulkan(self):
+        while True:
+            batch = [await self._antrian.get()]
+            if self._antrian.empty() and self.jendela > 0:
+                await asyncio.sleep(self.jendela)
+            await self._slot.acquire()
+            while len(batch) < self.ukuran_maks and not self._antrian.empty():
+                batch.append(self._antrian.get_nowait())
+            batch = [(baris, future) for baris, future in batch if not future.done()]
+            if not batch:
+                self._slot.release()
+                continue
+            tugas = asyncio.create_task(self._jalankan(batch))
+            self._berjalan.add(tugas)
+            tugas.add_done_callback(self._berjalan.discard)
+
+    async def _jalankan(self, batch):
+        try:
+            hasil = await self._kirim([baris for baris, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), keluaran in zip(batch, hasil):
+                if not future.done():
+                    future.set_result(keluaran)
+        finally:
+            self._slot.release()
+
+
+class LayananOptimasi:
+    """
+    Server HTTP/1.1 (keep-alive) dengan endpoint JSON:
+
+    - POST /hitung       satu pesanan (kolom sama dengan mode batch) atau daftar pesanan
+    - POST /rekomendasi  {"produk_target": "Kemeja"}
+    - POST /sweep        kurva keuntungan atau matriks skenario (lihat _kerjakan_sweep)
+    - POST /pembelian    {"anggaran", "produk_target"?, "jenis_kain"?, "meter_maks"?}: rencana pembelian kain
+    - GET  /metrik       latensi/throughput per endpoint dan statistik batch
+    - GET  /kesehatan    {"status": "ok"}
+
+    workers=1 memakai satu thread (ringan untuk uji lokal); selain itu process pool.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080, workers=None, path_cache=None, path_katalog=None,
+                 ukuran_batch=UKURAN_BATCH_MAKS, jendela_batch=JENDELA_BATCH):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.path_cache = path_cache
+        self.path_katalog = path_katalog
+        self.metrik = MetrikLayanan()
+        self._ukuran_batch = ukuran_batch
+        self._jendela_batch = jendela_batch
+        self._executor = None
+        self._server = None
+        self._batch = None
+        self._nomor = 0
+
+    async def mulai(self):
+        """Menjalankan server; port=0 memilih port bebas (lihat self.port)"""
+        if self.workers == 1:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._batch = PengumpulBatch(self._hitung_batch, self._ukuran_batch, self._jendela_batch,
+                                     maks_berjalan=self.workers * 2)
+        self._batch.mulai()
+        self._server = await asyncio.start_server(self._tangani_koneksi, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def berhenti(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batch is not None:
+            await self._batch.berhenti()
+            self._batch = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        return await self.mulai()
+
+    async def __aexit__(self, *exc):
+        await self.berhenti()
+
+    async def layani_selamanya(self):
+        await self._server.serve_forever()
+
+    async def _di_worker(self, fungsi, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fungsi, *args)
+
+    async def _hitung_batch(self, daftar_baris):
+        potongan = list(enumerate(daftar_baris, start=self._nomor + 1))
+        self._nomor += len(daftar_baris)
+        mulai = time.perf_counter()
+        hasil = await self._di_worker(proses_potongan, potongan, None, self.path_cache, self.path_katalog)
+        self.metrik.catat_batch(len(potongan), time.perf_counter() - mulai)
+        return hasil
+
+    async def _tangani_koneksi(self, reader, writer):
+        try:
+            while True:
+                try:
+                    permintaan = await _baca_permintaan(reader)
+                except ErrorHttp as e:
+                    writer.write(_respons(e.status, _json_bytes({"error": str(e)}), False))
+                    await writer.drain()
+                    return
+                if permintaan is None:
+                    return
+                metode, path, tetap_hidup, body = permintaan
+                mulai = time.perf_counter()
+                status, data = await self._rute(metode, path, body)
+                writer.write(_respons(status, data, tetap_hidup))
+                await writer.drain()
+                self.metrik.catat(path if path in RUTE else "lainnya", time.perf_counter() - mulai, status)
+                if not tetap_hidup:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _rute(self, metode, path, body):
+        if path not in RUTE:
+            return 404, _json_bytes({"error": f"Endpoint {path} tidak ada"})
+        if metode != RUTE[path]:
+            return 405, _json_bytes({"error": f"{path} hanya menerima {RUTE[path]}"})
+        try:
+            if path == "/kesehatan":
+                return 200, _json_bytes({"status": "ok"})
+            if path == "/metrik":
+                ringkasan = self.metrik.ringkasan(antrian=len(self._batch), batch_berjalan=self._batch.berjalan,
+                                                  workers=self.workers)
+                return 200, _json_bytes(ringkasan)
+            data = _muat_json(body)
+            if path == "/hitung":
+                return await self._hitung(data)
+            if path == "/rekomendasi":
+                if not isinstance(data, dict) or "produk_target" not in data:
+                    raise ValueError("Body harus berisi produk_target")
+                return 200, await self._di_worker(_kerjakan_rekomendasi, str(data["produk_target"]),
+                                                  self.path_katalog)
+            if not isinstance(data, dict):
+                raise ValueError(f"Body {path} harus objek JSON")
+            if path == "/pembelian":
+                return 200, await self._di_worker(_kerjakan_pembelian, data, self.path_katalog)
+            return 200, await self._di_worker(_kerjakan_sweep, data, self.path_katalog)
+        except (KeyError, ValueError, TypeError) as e:
+            return 400, _json_bytes({"error": str(e)})
+        except Exception as e:
+            return 500, _json_bytes({"error": f"{type(e).__name__}: {e}"})
+
+    async def _hitung(self, data):
+        if isinstance(data, list):
+            if not all(isinstance(baris, dict) for baris in data):
+                raise ValueError("Setiap pesanan harus objek JSON")
+            hasil = await asyncio.gather(*(self._batch.ajukan(baris) for baris in data))
+            return 200, _json_bytes(hasil)
+        if not isinstance(data, dict):
+            raise ValueError("Body harus objek pesanan atau daftar pesanan")
+        keluaran = await self._batch.ajukan(data)
+        return (400 if "error" in keluaran else 200), _json_bytes(keluaran)
+
+
+def _muat_json(body):
+    try:
+        return json.loads(body or b"null")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"JSON tidak valid: {e}") from None
+
+
+async def _baca_permintaan(reader):
+    """(metode, path, tetap_hidup, body) atau None jika koneksi ditutup klien"""
+    baris = await reader.readline()
+    if not baris:
+        return None
+    try:
+        metode, target, versi = baris.decode("latin-1").split()
+    except ValueError:
+        raise ErrorHttp(400, "Baris permintaan tidak valid") from None
+    header = {}
+    while True:
+        baris = await reader.readline()
+        if baris in (b"\r\n", b"\n", b""):
+            break
+        nama, _, nilai = baris.decode("latin-1").partition(":")
+        header[nama.strip().lower()] = nilai.strip()
+    try:
+        panjang = int(header.get("content-length", 0))
+    except ValueError:
+        raise ErrorHttp(400, "Content-Length tidak valid") from None
+    if panjang > UKURAN_BODY_MAKS:
+        raise ErrorHttp(413, f"Body melebihi {UKURAN_BODY_MAKS} byte")
+    body = await reader.readexactly(panjang) if panjang > 0 else b""
+    koneksi = header.get("connection", "").lower()
+    tetap_hidup = koneksi != "close" if versi == "HTTP/1.1" else koneksi == "keep-alive"
+    return metode.upper(), target.split("?", 1)[0], tetap_hidup, body
+
+
+def _respons(status, body, tetap_hidup):
+    kepala = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+              f"Content-Type: application/json; charset=utf-8\r\n"
+              f"Content-Length: {len(body)}\r\n"
+              f"Connection: {'keep-alive' if tetap_hidup else 'close'}\r\n\r\n")
+    return kepala.encode("latin-1") + body
+
+
+async def minta(host, port, metode, path, data=None):
+    """Klien minimal (satu koneksi per panggilan) untuk uji lokal: (status, data_json)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        body = _json_bytes(data) if data is not None else b""
+        writer.write(f"{metode} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        panjang = 0
+        while True:
+            baris = await reader.readline()
+            if baris in (b"\r\n", b"\n", b""):
+                break
+            nama, _, nilai = baris.decode("latin-1").partition(":")
+            if nama.strip().lower() == "content-length":
+                panjang = int(nilai)
+        return status, json.loads(await reader.readexactly(panjang))
+    finally:
+        writer.close()
+
+
+def jalankan_layanan(host="127.0.0.1", port=8080, **opsi):
+    """Menjalankan layanan sampai dihentikan (Ctrl+C)"""
+    async def utama():
+        layanan = await LayananOptimasi(host, port, **opsi).mulai()
+        print(f"Layanan optimasi berjalan di http://{host}:{layanan.port} ({layanan.workers} worker)",
+              file=sys.stderr)
+        try:
+            await layanan.layani_selamanya()
+        finally:
+            await layanan.berhenti()
+
+    try:
+        asyncio.run(utama())
+    except KeyboardInterrupt:
+        pass
+    return 0
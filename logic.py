@@ -1,8 +1,101 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import math
+from array import array
+from contextlib import nullcontext
 
+SOLVER_TERSEDIA = ("greedy", "exact")
+WARNA_GRAFIK = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6']
 
-def hitung_produksi(total_kain, jenis_kain, dataset, ukuran_fokus=None, optimasi_sisa=False, persentase=None):
+# Inti solver bekerja dalam bilangan bulat: panjang dalam milimeter, uang dalam
+# rupiah, persentase dalam basis poin (0.01%). Konversi hanya di batas API/UI.
+MM_PER_METER = 1000
+BASIS_POIN_PENUH = 10000
+
+
+def ke_mm(meter):
+    """Panjang (meter) -> milimeter bulat, dibulatkan ke mm terdekat"""
+    return int(round(float(meter) * MM_PER_METER))
+
+
+def ke_meter(mm):
+    """Milimeter bulat -> meter (float) untuk ditampilkan/dikembalikan ke pemanggil"""
+    return mm / MM_PER_METER
+
+
+def ke_rupiah(nilai):
+    """Nilai uang -> rupiah bulat"""
+    return int(round(nilai))
+
+
+def ke_basis_poin(persen):
+    """Persentase -> basis poin bulat (100% = 10000)"""
+    return int(round(float(persen) * 100))
+
+
+def satuan_kain(data_kain):
+    """
+    Returns:
+        Tuple: ({ukuran: berat_mm}, {ukuran: keuntungan_rupiah}) dari definisi kain
+    """
+    # round() pada float langsung menghasilkan int; keuntungan int dipakai apa adanya
+    berat_mm = {uk: round(m * MM_PER_METER) for uk, m in data_kain["meter_per_ukuran"].items()}
+    untung = {uk: v if type(v) is int else round(v) for uk, v in data_kain["keuntungan_per_pakaian"].items()}
+    return berat_mm, untung
+
+
+class HasilProduksi:
+    """Hasil perhitungan produksi tanpa grafik (ringan, aman untuk batch/server)."""
+
+    __slots__ = ("hasil_produksi", "total_keuntungan", "sisa_kain", "total_kain", "jenis_kain", "meter_per_ukuran",
+                 "kendala")
+
+    def __init__(self, hasil_produksi, total_keuntungan, sisa_kain, total_kain, jenis_kain, meter_per_ukuran,
+                 kendala=None):
+        self.hasil_produksi = hasil_produksi
+        self.total_keuntungan = total_keuntungan
+        self.sisa_kain = sisa_kain
+        self.total_kain = total_kain
+        self.jenis_kain = jenis_kain
+        self.meter_per_ukuran = meter_per_ukuran
+        # {ukuran: {"min", "max", "jumlah", "status"}} jika batas min/maks dipakai, selain itu None
+        self.kendala = kendala
+
+    @property
+    def sisa_mm(self):
+        return ke_mm(self.sisa_kain)
+
+    def __iter__(self):
+        # Memungkinkan unpacking: hasil, keuntungan, sisa = hitung(...)
+        return iter((self.hasil_produksi, self.total_keuntungan, self.sisa_kain))
+
+    def __repr__(self):
+        return (f"HasilProduksi(jenis_kain={self.jenis_kain!r}, hasil_produksi={self.hasil_produksi!r}, "
+                f"total_keuntungan={self.total_keuntungan!r}, sisa_kain={self.sisa_kain!r})")
+
+    def buat_grafik(self):
+        """Membuat grafik hanya saat dibutuhkan (matplotlib diimpor di sini)"""
+        return buat_grafik(self.hasil_produksi, self.meter_per_ukuran, self.total_kain, self.sisa_kain)
+
+
+def hitung_produksi(total_kain, jenis_kain, dataset, ukuran_fokus=None, optimasi_sisa=False, persentase=None,
+                    solver="greedy", indeks=None, instrumen=None, batas_min=None, batas_max=None, lebar_kain=None):
+    """
+    Wrapper kompatibilitas: menghitung produksi lalu membuat grafiknya.
+
+    Args:
+        Sama dengan hitung()
+
+    Returns:
+        Tuple: (hasil_produksi, total_keuntungan, sisa_kain, fig)
+    """
+    hasil = hitung(total_kain, jenis_kain, dataset, ukuran_fokus, optimasi_sisa, persentase, solver, indeks,
+                   instrumen, batas_min, batas_max, lebar_kain)
+    with fase_instrumen(instrumen, "buat_grafik"):
+        fig = hasil.buat_grafik()
+    return hasil.hasil_produksi, hasil.total_keuntungan, hasil.sisa_kain, fig
+
+
+def hitung(total_kain, jenis_kain, dataset, ukuran_fokus=None, optimasi_sisa=False, persentase=None,
+           solver="greedy", indeks=None, instrumen=None, batas_min=None, batas_max=None, lebar_kain=None):
     """
     Fungsi untuk menghitung produksi dengan Greedy Algorithm + variasi minimal.
 
@@ -13,16 +106,32 @@ def hitung_produksi(total_kain, jenis_kain, dataset, ukuran_fokus=None, optimasi
         ukuran_fokus: List ukuran yang difokuskan (None untuk semua ukuran)
         optimasi_sisa: True untuk optimasi sisa kain
         persentase: Dict {ukuran: nilai_persen} dari input pengguna
+        solver: "greedy" (urut rasio) atau "exact" (knapsack tak terbatas)
+        indeks: IndeksKain opsional berisi urutan greedy yang sudah dikompilasi
+        instrumen: Instrumentasi opsional (waktu dan counter per fase)
+        batas_min: Dict {ukuran: jumlah_minimum} opsional, dipenuhi sebelum persentase
+        batas_max: Dict {ukuran: jumlah_maksimum} opsional, berlaku untuk semua tahap
+        lebar_kain: Lebar gulungan (meter) opsional; meter_per_ukuran diganti meter efektif
+            hasil nesting marker (lihat marker.py)
 
     Returns:
-        Tuple: (hasil_produksi, total_keuntungan, sisa_kain, fig)
+        HasilProduksi: hasil_produksi, total_keuntungan, sisa_kain (tanpa grafik),
+        plus kendala (status tiap batas) jika batas_min/batas_max dipakai
     """
     try:
-        # Ambil parameter dari dataset
+        if solver not in SOLVER_TERSEDIA:
+            raise ValueError(f"Solver tidak dikenal: {solver}")
+
+        # Ambil parameter dari dataset (panjang dalam mm, keuntungan dalam rupiah)
         data_kain = dataset[jenis_kain]
+        if lebar_kain:
+            from marker import kain_efektif
+            with fase_instrumen(instrumen, "nesting_marker"):
+                data_kain = kain_efektif(data_kain, lebar_kain)
+            indeks = None  # Satuan terkompilasi memakai meter datar
         meter_per_ukuran = data_kain["meter_per_ukuran"]
-        keuntungan_per_pakaian = data_kain["keuntungan_per_pakaian"]
-        harga_per_meter = data_kain["harga_per_meter"]
+        berat_mm, untung = _satuan(jenis_kain, data_kain, indeks)
+        total_mm = ke_mm(total_kain)
 
         # Filter ukuran jika ada fokus tertentu
         ukuran_tersedia = list(meter_per_ukuran.keys())
@@ -33,76 +142,657 @@ def hitung_produksi(total_kain, jenis_kain, dataset, ukuran_fokus=None, optimasi
 
         hasil_produksi = {}
         total_keuntungan = 0
-        sisa_kain = total_kain
+        sisa_mm = total_mm
+        bmin, bmax = _normalisasi_batas(batas_min, batas_max)
 
         # Jika ada persentase, gunakan itu terlebih dahulu
-        if persentase and any(v > 0 for v in persentase.values()):
-            total_persen = sum(float(persentase.get(u, 0)) for u in ukuran_tersedia)
-            if total_persen > 100:
+        dengan_persentase = bool(persentase and any(v > 0 for v in persentase.values()))
+        if dengan_persentase:
+            basis_poin = {u: ke_basis_poin(persentase.get(u, 0)) for u in ukuran_tersedia}
+            if sum(basis_poin.values()) > BASIS_POIN_PENUH:
                 raise ValueError("Total persentase tidak boleh melebihi 100%")
 
-            for ukuran in ukuran_tersedia:
-                persen = float(persentase.get(ukuran, 0))
-                if persen <= 0:
-                    continue
-                alokasi_meter = total_kain * (persen / 100)
-                jumlah_pakaian = int(alokasi_meter // meter_per_ukuran[ukuran])
-                if jumlah_pakaian > 0:
-                    hasil_produksi[ukuran] = jumlah_pakaian
-                    total_keuntungan += jumlah_pakaian * keuntungan_per_pakaian[ukuran]
-                    sisa_kain -= jumlah_pakaian * meter_per_ukuran[ukuran]
-
-            # Jika masih ada sisa kain, lanjutkan dengan greedy
-            if sisa_kain > 0:
-                rasio = {}
-                for ukuran in ukuran_tersedia:
-                    biaya = meter_per_ukuran[ukuran] * harga_per_meter
-                    keuntungan_bersih = keuntungan_per_pakaian[ukuran] - biaya
-                    rasio[ukuran] = keuntungan_bersih / meter_per_ukuran[ukuran]
-
-                urutan = sorted(rasio.items(), key=lambda x: x[1], reverse=True)
-
-                for ukuran, _ in urutan:
-                    jumlah_pakaian = int(sisa_kain // meter_per_ukuran[ukuran])
-                    if jumlah_pakaian > 0:
-                        hasil_produksi[ukuran] = hasil_produksi.get(ukuran, 0) + jumlah_pakaian
-                        total_keuntungan += jumlah_pakaian * keuntungan_per_pakaian[ukuran]
-                        sisa_kain -= jumlah_pakaian * meter_per_ukuran[ukuran]
+        if dengan_persentase or bmin:
+            with fase_instrumen(instrumen, "alokasi_persentase") as catat:
+                jumlah_awal = {}
+                if dengan_persentase:
+                    jumlah_awal = {
+                        ukuran: _jumlah_persentase(total_mm, basis_poin[ukuran], berat_mm[ukuran])
+                        for ukuran in ukuran_tersedia
+                    }
+                if bmin or bmax:
+                    jumlah_awal = _alokasi_terbatas(jumlah_awal, total_mm, ukuran_tersedia, berat_mm, bmin, bmax)
+                hasil_produksi, total_keuntungan, sisa_mm = _terapkan_alokasi(
+                    jumlah_awal, total_mm, ukuran_tersedia, berat_mm, untung)
+                if catat is not None:
+                    catat(iterasi=len(ukuran_tersedia), pakaian_ditambah=sum(hasil_produksi.values()),
+                          meter_terpakai=ke_meter(total_mm - sisa_mm))
+
+        # Minimum diperlakukan seperti alokasi tahap 1: tahap berikutnya menambah, bukan menimpa
+        hasil_produksi, total_keuntungan, sisa_mm = _isi_produksi(
+            hasil_produksi, total_keuntungan, sisa_mm, dengan_persentase or bool(bmin), jenis_kain, data_kain,
+            ukuran_tersedia, berat_mm, untung, optimasi_sisa, solver, indeks, instrumen, bmax or None)
+
+        kendala = _status_kendala(hasil_produksi, bmin, bmax) if bmin or bmax else None
+        return HasilProduksi(hasil_produksi, total_keuntungan, ke_meter(sisa_mm), total_kain, jenis_kain,
+                             meter_per_ukuran, kendala)
+
+    except Exception as e:
+        raise ValueError(f"Terjadi kesalahan dalam perhitungan: {str(e)}")
+
+
+def _satuan(jenis_kain, data_kain, indeks=None):
+    """satuan_kain() dari indeks terkompilasi jika tersedia"""
+    if indeks is not None and jenis_kain in indeks:
+        return indeks[jenis_kain].satuan
+    return satuan_kain(data_kain)
+
+
+def fase_instrumen(instrumen, nama):
+    """Context fase dari Instrumentasi; tanpa instrumen menghasilkan catat=None"""
+    return instrumen.fase(nama) if instrumen is not None else nullcontext()
 
+
+def _jumlah_persentase(total_mm, basis_poin, berat_mm):
+    """Jumlah pakaian dari alokasi persentase satu ukuran (tahap 1), pembagian bulat eksak"""
+    if basis_poin <= 0:
+        return 0
+    return total_mm * basis_poin // (BASIS_POIN_PENUH * berat_mm)
+
+
+def _terapkan_alokasi(jumlah_awal, total_mm, ukuran_tersedia, berat_mm, untung):
+    """Menjumlahkan hasil tahap 1 sesuai urutan ukuran"""
+    hasil_produksi = {}
+    total_keuntungan = 0
+    sisa_mm = total_mm
+    for ukuran in ukuran_tersedia:
+        jumlah_pakaian = jumlah_awal.get(ukuran, 0)
+        if jumlah_pakaian > 0:
+            hasil_produksi[ukuran] = jumlah_pakaian
+            total_keuntungan += jumlah_pakaian * untung[ukuran]
+            sisa_mm -= jumlah_pakaian * berat_mm[ukuran]
+    return hasil_produksi, total_keuntungan, sisa_mm
+
+
+def _normalisasi_batas(batas_min, batas_max):
+    """
+    Returns:
+        Tuple: (dict batas minimum > 0, dict batas maksimum) dalam jumlah pakaian (int)
+    """
+    bmin = {}
+    for ukuran, nilai in (batas_min or {}).items():
+        if nilai not in (None, "") and int(nilai) > 0:
+            bmin[ukuran] = int(nilai)
+    bmax = {}
+    for ukuran, nilai in (batas_max or {}).items():
+        if nilai in (None, ""):
+            continue
+        if int(nilai) < 0:
+            raise ValueError(f"Batas maksimum ukuran {ukuran} tidak boleh negatif")
+        bmax[ukuran] = int(nilai)
+    for ukuran, nilai in bmin.items():
+        if ukuran in bmax and nilai > bmax[ukuran]:
+            raise ValueError(f"Batas minimum ukuran {ukuran} melebihi batas maksimum")
+    return bmin, bmax
+
+
+def _alokasi_terbatas(jumlah_awal, total_mm, ukuran_tersedia, berat_mm, bmin, bmax):
+    """
+    Tahap 0 + 1 dengan batas: minimum tiap ukuran dipesan lebih dulu (urutan ukuran,
+    sebanyak yang muat), lalu alokasi persentase di atas minimum dipotong batas maksimum
+    dan sisa kain.
+    """
+    jumlah = {}
+    sisa_mm = total_mm
+    for ukuran in ukuran_tersedia:
+        minimum = bmin.get(ukuran, 0)
+        if minimum:
+            n = min(minimum, sisa_mm // berat_mm[ukuran])
+            jumlah[ukuran] = n
+            sisa_mm -= n * berat_mm[ukuran]
+    for ukuran in ukuran_tersedia:
+        sekarang = jumlah.get(ukuran, 0)
+        tambahan = jumlah_awal.get(ukuran, 0) - sekarang
+        if ukuran in bmax:
+            tambahan = min(tambahan, bmax[ukuran] - sekarang)
+        tambahan = min(tambahan, sisa_mm // berat_mm[ukuran])
+        if tambahan > 0:
+            jumlah[ukuran] = sekarang + tambahan
+            sisa_mm -= tambahan * berat_mm[ukuran]
+    return jumlah
+
+
+def _status_kendala(hasil_produksi, bmin, bmax):
+    """Status tiap batas: tidak_layak, mengikat_min, mengikat_max, atau longgar"""
+    kendala = {}
+    for ukuran in dict.fromkeys(list(bmin) + list(bmax)):
+        jumlah = hasil_produksi.get(ukuran, 0)
+        minimum = bmin.get(ukuran, 0)
+        maksimum = bmax.get(ukuran)
+        if jumlah < minimum:
+            status = "tidak_layak"
+        elif minimum and jumlah == minimum:
+            status = "mengikat_min"
+        elif maksimum is not None and jumlah >= maksimum:
+            status = "mengikat_max"
         else:
-            # Jika tidak ada persentase, gunakan algoritma Greedy biasa
-            rasio = {}
-            for ukuran in ukuran_tersedia:
-                biaya = meter_per_ukuran[ukuran] * harga_per_meter
-                keuntungan_bersih = keuntungan_per_pakaian[ukuran] - biaya
-                rasio[ukuran] = keuntungan_bersih / meter_per_ukuran[ukuran]
+            status = "longgar"
+        kendala[ukuran] = {"min": minimum, "max": maksimum, "jumlah": jumlah, "status": status}
+    return kendala
+
+
+def _isi_produksi(hasil_produksi, total_keuntungan, sisa_mm, dengan_persentase, jenis_kain, data_kain,
+                  ukuran_tersedia, berat_mm, untung, optimasi_sisa, solver, indeks=None, instrumen=None,
+                  batas_max=None):
+    """Tahap 2 (greedy/knapsack untuk sisa kain) dan tahap 3 (optimasi sisa) dalam mm, menghormati batas_max"""
+
+    def kuota(ukuran):
+        # Sisa jumlah yang masih boleh ditambahkan (None = tidak dibatasi)
+        if batas_max is None or ukuran not in batas_max:
+            return None
+        return max(batas_max[ukuran] - hasil_produksi.get(ukuran, 0), 0)
 
-            urutan = sorted(rasio.items(), key=lambda x: x[1], reverse=True)
+    with fase_instrumen(instrumen, "isi_knapsack" if solver == "exact" else "isi_greedy") as catat:
+        if catat is not None:
+            pakaian_awal, sisa_awal = sum(hasil_produksi.values()), sisa_mm
 
-            for ukuran, _ in urutan:
-                jumlah_pakaian = int(sisa_kain // meter_per_ukuran[ukuran])
+        if solver == "exact" and sisa_mm > 0:
+            # Knapsack eksak; dengan batas maksimum dipakai mesin bounded knapsack
+            kuota_ukuran = {uk: kuota(uk) for uk in ukuran_tersedia if kuota(uk) is not None}
+            if kuota_ukuran:
+                tambahan = _isi_knapsack_terbatas(sisa_mm, ukuran_tersedia, berat_mm, untung, kuota_ukuran, catat)
+            else:
+                tambahan = _isi_knapsack(sisa_mm, ukuran_tersedia, berat_mm, untung, catat)
+            for ukuran, jumlah_pakaian in tambahan.items():
+                hasil_produksi[ukuran] = hasil_produksi.get(ukuran, 0) + jumlah_pakaian
+                total_keuntungan += jumlah_pakaian * untung[ukuran]
+                sisa_mm -= jumlah_pakaian * berat_mm[ukuran]
+
+        elif solver != "exact" and (sisa_mm > 0 or not dengan_persentase):
+            # Greedy berdasarkan rasio keuntungan bersih per meter
+            urutan = _urutan_greedy(jenis_kain, ukuran_tersedia, data_kain, indeks)
+            if catat is not None:
+                catat(iterasi=len(urutan))
+
+            for ukuran in urutan:
+                jumlah_pakaian = sisa_mm // berat_mm[ukuran]
+                batas = kuota(ukuran)
+                if batas is not None:
+                    jumlah_pakaian = min(jumlah_pakaian, batas)
                 if jumlah_pakaian > 0:
-                    hasil_produksi[ukuran] = jumlah_pakaian
-                    total_keuntungan += jumlah_pakaian * keuntungan_per_pakaian[ukuran]
-                    sisa_kain -= jumlah_pakaian * meter_per_ukuran[ukuran]
+                    hasil_produksi[ukuran] = hasil_produksi.get(ukuran, 0) + jumlah_pakaian
+                    total_keuntungan += jumlah_pakaian * untung[ukuran]
+                    sisa_mm -= jumlah_pakaian * berat_mm[ukuran]
+
+        if catat is not None:
+            catat(pakaian_ditambah=sum(hasil_produksi.values()) - pakaian_awal,
+                  meter_terpakai=ke_meter(sisa_awal - sisa_mm))
+
+    # Jika optimasi_sisa aktif, tambahkan pakaian dari ukuran termurah
+    if optimasi_sisa and sisa_mm > 0:
+        with fase_instrumen(instrumen, "optimasi_sisa") as catat:
+            # Cari ukuran yang menggunakan kain paling sedikit (yang kuotanya belum habis)
+            kandidat = [uk for uk in ukuran_tersedia if kuota(uk) != 0]
+            max_tambahan = 0
+            if kandidat:
+                if indeks is not None and jenis_kain in indeks:
+                    ukuran_termurah = indeks[jenis_kain].ukuran_terkecil(kandidat)
                 else:
-                    if sisa_kain >= meter_per_ukuran[ukuran]:
-                        hasil_produksi[ukuran] = 1
-                        total_keuntungan += keuntungan_per_pakaian[ukuran]
-                        sisa_kain -= meter_per_ukuran[ukuran]
-
-        # Jika optimasi_sisa aktif, tambahkan pakaian dari ukuran termurah
-        if optimasi_sisa and sisa_kain > 0:
-            # Cari ukuran yang menggunakan kain paling sedikit
-            ukuran_termurah = min(ukuran_tersedia, key=lambda u: meter_per_ukuran[u])
-            max_tambahan = int(sisa_kain // meter_per_ukuran[ukuran_termurah])
-            if max_tambahan > 0:
-                hasil_produksi[ukuran_termurah] = hasil_produksi.get(ukuran_termurah, 0) + max_tambahan
-                total_keuntungan += max_tambahan * keuntungan_per_pakaian[ukuran_termurah]
-                sisa_kain -= max_tambahan * meter_per_ukuran[ukuran_termurah]
-
-        fig = buat_grafik(hasil_produksi, meter_per_ukuran, total_kain, sisa_kain)
-        return hasil_produksi, total_keuntungan, sisa_kain, fig
+                    ukuran_termurah = min(kandidat, key=lambda u: berat_mm[u])
+                max_tambahan = sisa_mm // berat_mm[ukuran_termurah]
+                if kuota(ukuran_termurah) is not None:
+                    max_tambahan = min(max_tambahan, kuota(ukuran_termurah))
+                if max_tambahan > 0:
+                    hasil_produksi[ukuran_termurah] = hasil_produksi.get(ukuran_termurah, 0) + max_tambahan
+                    total_keuntungan += max_tambahan * untung[ukuran_termurah]
+                    sisa_mm -= max_tambahan * berat_mm[ukuran_termurah]
+            if catat is not None:
+                catat(iterasi=len(ukuran_tersedia), pakaian_ditambah=max_tambahan,
+                      meter_terpakai=ke_meter(max_tambahan * berat_mm[ukuran_termurah]) if max_tambahan else 0)
+
+    return hasil_produksi, total_keuntungan, sisa_mm
+
+
+class SolverInkremental:
+    """
+    Solver untuk pratinjau langsung saat persentase diedit.
+
+    Alokasi tahap 1 per ukuran disimpan; pada panggilan berikutnya hanya ukuran
+    yang persentasenya berubah yang dihitung ulang, lalu tahap greedy/optimasi
+    sisa dilanjutkan dari alokasi tersebut (warm start). Hasilnya identik
+    dengan hitung() untuk input yang sama.
+    """
+
+    def __init__(self):
+        self._konteks = None
+        self._satuan = None  # (berat_mm, untung) untuk konteks saat ini
+        self._alokasi = {}  # ukuran -> (basis_poin, jumlah_pakaian)
+        self.hasil_terakhir = None
+
+    def reset(self):
+        self._konteks = None
+        self._satuan = None
+        self._alokasi = {}
+        self.hasil_terakhir = None
+
+    def hitung(self, total_kain, jenis_kain, dataset, ukuran_fokus=None, optimasi_sisa=False, persentase=None,
+               solver="greedy", indeks=None, instrumen=None, batas_min=None, batas_max=None):
+        """
+        Returns:
+            Tuple: (HasilProduksi, set ukuran yang jumlahnya berubah dibanding hasil sebelumnya)
+        """
+        try:
+            if solver not in SOLVER_TERSEDIA:
+                raise ValueError(f"Solver tidak dikenal: {solver}")
+            data_kain = dataset[jenis_kain]
+            meter_per_ukuran = data_kain["meter_per_ukuran"]
+            total_mm = ke_mm(total_kain)
+            ukuran_tersedia = list(meter_per_ukuran.keys())
+            if ukuran_fokus:
+                ukuran_tersedia = [uk for uk in ukuran_tersedia if uk in ukuran_fokus]
+                if not ukuran_tersedia:
+                    raise ValueError("Tidak ada ukuran yang valid untuk difokuskan")
+
+            # Kain atau total berubah: alokasi lama tidak bisa dipakai ulang
+            konteks = (jenis_kain, total_mm, tuple(meter_per_ukuran.items()),
+                       tuple(data_kain["keuntungan_per_pakaian"].items()))
+            if konteks != self._konteks:
+                self._konteks = konteks
+                self._satuan = _satuan(jenis_kain, data_kain, indeks)
+                self._alokasi = {}
+                self.hasil_terakhir = None
+            berat_mm, untung = self._satuan
+
+            hasil_produksi = {}
+            total_keuntungan = 0
+            sisa_mm = total_mm
+            bmin, bmax = _normalisasi_batas(batas_min, batas_max)
+            dengan_persentase = bool(persentase and any(v > 0 for v in persentase.values()))
+            if dengan_persentase:
+                basis_poin = {u: ke_basis_poin(persentase.get(u, 0)) for u in ukuran_tersedia}
+                if sum(basis_poin.values()) > BASIS_POIN_PENUH:
+                    raise ValueError("Total persentase tidak boleh melebihi 100%")
+
+            if dengan_persentase or bmin:
+                with fase_instrumen(instrumen, "alokasi_persentase") as catat:
+                    jumlah_awal = {}
+                    dihitung = 0
+                    for ukuran in ukuran_tersedia if dengan_persentase else ():
+                        lama = self._alokasi.get(ukuran)
+                        if lama is None or lama[0] != basis_poin[ukuran]:
+                            lama = (basis_poin[ukuran],
+                                    _jumlah_persentase(total_mm, basis_poin[ukuran], berat_mm[ukuran]))
+                            self._alokasi[ukuran] = lama
+                            dihitung += 1
+                        jumlah_awal[ukuran] = lama[1]
+                    if bmin or bmax:
+                        jumlah_awal = _alokasi_terbatas(jumlah_awal, total_mm, ukuran_tersedia, berat_mm, bmin, bmax)
+                    hasil_produksi, total_keuntungan, sisa_mm = _terapkan_alokasi(
+                        jumlah_awal, total_mm, ukuran_tersedia, berat_mm, untung)
+                    if catat is not None:
+                        catat(iterasi=dihitung, pakaian_ditambah=sum(hasil_produksi.values()),
+                              meter_terpakai=ke_meter(total_mm - sisa_mm))
+
+            hasil_produksi, total_keuntungan, sisa_mm = _isi_produksi(
+                hasil_produksi, total_keuntungan, sisa_mm, dengan_persentase or bool(bmin), jenis_kain, data_kain,
+                ukuran_tersedia, berat_mm, untung, optimasi_sisa, solver, indeks, instrumen, bmax or None)
+            kendala = _status_kendala(hasil_produksi, bmin, bmax) if bmin or bmax else None
+        except Exception as e:
+            raise ValueError(f"Terjadi kesalahan dalam perhitungan: {str(e)}")
+
+        hasil = HasilProduksi(hasil_produksi, total_keuntungan, ke_meter(sisa_mm), total_kain, jenis_kain,
+                              meter_per_ukuran, kendala)
+        if self.hasil_terakhir is None:
+            berubah = set(meter_per_ukuran)
+        else:
+            lama = self.hasil_terakhir.hasil_produksi
+            berubah = {uk for uk in set(lama) | set(hasil_produksi) if lama.get(uk) != hasil_produksi.get(uk)}
+        self.hasil_terakhir = hasil
+        return hasil, berubah
+
+
+def _urutan_greedy(jenis_kain, ukuran_tersedia, data_kain, indeks=None):
+    """Urutan ukuran berdasarkan rasio keuntungan bersih per meter (menurun)"""
+    if indeks is not None and jenis_kain in indeks:
+        return indeks[jenis_kain].urutan(ukuran_tersedia)
+
+    meter_per_ukuran = data_kain["meter_per_ukuran"]
+    keuntungan_per_pakaian = data_kain["keuntungan_per_pakaian"]
+    harga_per_meter = data_kain["harga_per_meter"]
+    rasio = {}
+    for ukuran in ukuran_tersedia:
+        biaya = meter_per_ukuran[ukuran] * harga_per_meter
+        keuntungan_bersih = keuntungan_per_pakaian[ukuran] - biaya
+        rasio[ukuran] = keuntungan_bersih / meter_per_ukuran[ukuran]
+
+    return [ukuran for ukuran, _ in sorted(rasio.items(), key=lambda x: x[1], reverse=True)]
+
+
+def _isi_knapsack(sisa_mm, ukuran_tersedia, berat_mm, untung, catat=None):
+    """
+    Mengisi sisa kain secara optimal dengan unbounded knapsack (dynamic programming).
+
+    Panjang kain (mm) diperkecil dengan FPB semua ukuran sebelum dipakai sebagai
+    indeks tabel. Karena kain sudah tersedia, yang dimaksimalkan adalah
+    total_keuntungan yang dilaporkan (keuntungan_per_pakaian).
+
+    Returns:
+        Dict: {ukuran: jumlah_pakaian} tambahan
+    """
+    barang, fpb = _barang_knapsack(ukuran_tersedia, berat_mm, untung, sisa_mm)
+    if not barang:
+        return {}
+    kapasitas = sisa_mm // fpb
+
+    # Ada solusi optimal dengan kurang dari w_terbaik pakaian non-terbaik, sehingga
+    # kapasitas di atas batas ini cukup diisi langsung dengan ukuran rasio terbaik.
+    terbaik, batas = _batas_periodik(barang)
+    w_terbaik = barang[terbaik][1]
+    jumlah_terbaik = 0
+    if kapasitas > batas:
+        jumlah_terbaik = (kapasitas - batas) // w_terbaik
+        kapasitas -= jumlah_terbaik * w_terbaik
+
+    if catat is not None:
+        catat(iterasi=kapasitas * len(barang))
+
+    nilai_dp, pilihan = _tabel_knapsack(barang, kapasitas)
+
+    hasil = {}
+    if jumlah_terbaik:
+        hasil[barang[terbaik][0]] = jumlah_terbaik
+    _rekonstruksi(hasil, barang, pilihan, kapasitas)
+    return {ukuran: hasil[ukuran] for ukuran in ukuran_tersedia if ukuran in hasil}
+
+
+def _barang_knapsack(ukuran_tersedia, berat_mm, untung, kapasitas_mm=None):
+    """
+    Returns:
+        Tuple: ([(ukuran, berat, nilai)] dengan berat dalam satuan FPB, FPB dalam mm)
+    """
+    barang = []
+    for ukuran in ukuran_tersedia:
+        berat, nilai = berat_mm[ukuran], untung[ukuran]
+        # Ukuran tanpa keuntungan tidak pernah memperbaiki solusi
+        if berat > 0 and nilai > 0 and (kapasitas_mm is None or berat <= kapasitas_mm):
+            barang.append((ukuran, berat, nilai))
+    if not barang:
+        return [], 1
+
+    fpb = 0
+    for _, berat, _ in barang:
+        fpb = math.gcd(fpb, berat)
+    return [(ukuran, berat // fpb, nilai) for ukuran, berat, nilai in barang], fpb
+
+
+def _batas_periodik(barang):
+    """Indeks ukuran rasio terbaik dan kapasitas di atas mana solusi berulang per w_terbaik"""
+    terbaik = max(range(len(barang)), key=lambda i: barang[i][2] / barang[i][1])
+    return terbaik, barang[terbaik][1] * (max(b[1] for b in barang) + 1)
+
+
+def _tabel_knapsack(barang, kapasitas):
+    """Tabel DP berbasis array: nilai terbaik dan pilihan terakhir untuk setiap kapasitas 0..kapasitas"""
+    nilai_dp = array("q", [0]) * (kapasitas + 1)
+    pilihan = array("b", [-1]) * (kapasitas + 1)
+    for c in range(1, kapasitas + 1):
+        terbaik_c = nilai_dp[c - 1]
+        pilih_c = -1
+        for i, (_, w, v) in enumerate(barang):
+            if w <= c:
+                kandidat = nilai_dp[c - w] + v
+                if kandidat > terbaik_c:
+                    terbaik_c = kandidat
+                    pilih_c = i
+        nilai_dp[c] = terbaik_c
+        pilihan[c] = pilih_c
+    return nilai_dp, pilihan
+
+
+def _tabel_pakai(barang, pilihan, kapasitas):
+    """Kapasitas terpakai oleh solusi optimal untuk setiap kapasitas 0..kapasitas (jalur pilihan yang sama)"""
+    pakai = array("q", [0]) * (kapasitas + 1)
+    for c in range(1, kapasitas + 1):
+        i = pilihan[c]
+        pakai[c] = pakai[c - 1] if i < 0 else pakai[c - barang[i][1]] + barang[i][1]
+    return pakai
+
+
+def _rekonstruksi(hasil, barang, pilihan, c):
+    """Menambahkan komposisi optimal untuk kapasitas c (dari tabel pilihan) ke dict hasil"""
+    while c > 0:
+        i = pilihan[c]
+        if i < 0:
+            c -= 1
+            continue
+        ukuran = barang[i][0]
+        hasil[ukuran] = hasil.get(ukuran, 0) + 1
+        c -= barang[i][1]
+    return hasil
+
+
+def _isi_knapsack_terbatas(sisa_mm, ukuran_tersedia, berat_mm, untung, kuota, catat=None):
+    """
+    Bounded knapsack: seperti _isi_knapsack, tetapi jumlah tambahan ukuran di `kuota`
+    ({ukuran: maksimum}) dibatasi.
+
+    Solusi LP (greedy pecahan per rasio) dipakai sebagai jangkar: ada solusi bulat
+    optimal yang selisih L1-nya dari solusi LP paling banyak 2*w_maks + 1
+    (proximity Eisenbrand-Weismantel, satu kendala). Bagian yang pasti terpakai
+    langsung diambil, dan hanya sisanya diselesaikan dengan DP 0/1 hasil pecah biner
+    (1, 2, 4, ..., sisa), sehingga biaya tidak tumbuh dengan panjang kain maupun kuota.
+
+    Returns:
+        Dict: {ukuran: jumlah_pakaian} tambahan
+    """
+    barang, fpb = _barang_knapsack(ukuran_tersedia, berat_mm, untung, sisa_mm)
+    barang = [b for b in barang if kuota.get(b[0]) != 0]
+    if not barang:
+        return {}
+    kapasitas = sisa_mm // fpb
+
+    # Solusi LP: isi per rasio menurun, ukuran terakhir boleh pecahan
+    lp = {}
+    sisa = kapasitas
+    for ukuran, w, v in sorted(barang, key=lambda b: b[2] / b[1], reverse=True):
+        jumlah = sisa / w
+        if ukuran in kuota:
+            jumlah = min(jumlah, kuota[ukuran])
+        lp[ukuran] = jumlah
+        sisa -= jumlah * w
+
+    # Jangkauan solusi bulat di sekitar LP (+1 sebagai toleransi pembulatan float)
+    jarak = 2 * max(b[1] for b in barang) + 2
+    hasil = {}
+    potongan = []  # (ukuran, berat, nilai, jumlah) hasil pecah biner
+    for ukuran, w, v in barang:
+        bawah = max(0, math.ceil(lp[ukuran] - jarak))
+        atas = math.floor(lp[ukuran] + jarak)
+        if ukuran in kuota:
+            atas = min(atas, kuota[ukuran])
+        atas = min(atas, kapasitas // w)
+        if bawah:
+            hasil[ukuran] = bawah
+            kapasitas -= bawah * w
+        sisa, k = atas - bawah, 1
+        while sisa > 0:
+            k = min(k, sisa)
+            potongan.append((ukuran, w * k, v * k, k))
+            sisa -= k
+            k *= 2
+    kapasitas = min(kapasitas, sum(p[1] for p in potongan))
+
+    if catat is not None:
+        catat(iterasi=kapasitas * len(potongan))
+
+    # DP 0/1 dengan satu bitmap keputusan per potongan untuk rekonstruksi
+    nilai_dp = array("q", [0]) * (kapasitas + 1)
+    keputusan = []
+    for _, w, v, _ in potongan:
+        ambil = bytearray(kapasitas + 1)
+        for c in range(kapasitas, w - 1, -1):
+            kandidat = nilai_dp[c - w] + v
+            if kandidat > nilai_dp[c]:
+                nilai_dp[c] = kandidat
+                ambil[c] = 1
+        keputusan.append(ambil)
+
+    c = kapasitas
+    for (ukuran, w, _, k), ambil in zip(reversed(potongan), reversed(keputusan)):
+        if c >= w and ambil[c]:
+            hasil[ukuran] = hasil.get(ukuran, 0) + k
+            c -= w
+    return {ukuran: hasil[ukuran] for ukuran in ukuran_tersedia if hasil.get(ukuran)}
+
+
+class KurvaKeuntungan:
+    """
+    Keuntungan optimal untuk setiap panjang kain 0..panjang_maks pada resolusi tertentu.
+
+    Atribut list sejajar: panjang (m), keuntungan, sisa_kain (m), dan nilai_marjinal
+    (tambahan keuntungan dari satu meter kain berikutnya). Komposisi ukuran
+    direkonstruksi saat diminta lewat komposisi(i) / hasil(i).
+    """
+
+    __slots__ = ("jenis_kain", "meter_per_ukuran", "resolusi", "panjang", "keuntungan", "sisa_kain",
+                 "nilai_marjinal", "_barang", "_pilihan", "_kapasitas", "_terbaik", "_batas")
+
+    def __init__(self, jenis_kain, meter_per_ukuran, resolusi, panjang, keuntungan, sisa_kain, nilai_marjinal,
+                 barang, pilihan, kapasitas, terbaik, batas):
+        self.jenis_kain = jenis_kain
+        self.meter_per_ukuran = meter_per_ukuran
+        self.resolusi = resolusi
+        self.panjang = panjang
+        self.keuntungan = keuntungan
+        self.sisa_kain = sisa_kain
+        self.nilai_marjinal = nilai_marjinal
+        self._barang = barang
+        self._pilihan = pilihan
+        self._kapasitas = kapasitas
+        self._terbaik = terbaik
+        self._batas = batas
+
+    def __len__(self):
+        return len(self.panjang)
+
+    def __repr__(self):
+        return (f"KurvaKeuntungan(jenis_kain={self.jenis_kain!r}, titik={len(self)}, "
+                f"panjang_maks={self.panjang[-1] if self.panjang else 0!r}, resolusi={self.resolusi!r})")
+
+    def indeks_terdekat(self, panjang):
+        """Indeks titik kurva dengan panjang terdekat"""
+        i = int(round(panjang / self.resolusi))
+        return min(max(i, 0), len(self.panjang) - 1)
+
+    def komposisi(self, i):
+        """Dict {ukuran: jumlah_pakaian} optimal untuk titik ke-i"""
+        hasil = {}
+        if not self._barang:
+            return hasil
+        c = self._kapasitas[i]
+        if c > self._batas:
+            ukuran, w, _ = self._barang[self._terbaik]
+            jumlah = (c - self._batas) // w
+            hasil[ukuran] = jumlah
+            c -= jumlah * w
+        _rekonstruksi(hasil, self._barang, self._pilihan, c)
+        return {ukuran: hasil[ukuran] for ukuran in self.meter_per_ukuran if ukuran in hasil}
+
+    def hasil(self, i):
+        """HasilProduksi untuk titik ke-i (sama dengan hitung(..., solver="exact") tanpa persentase)"""
+        return HasilProduksi(self.komposisi(i), self.keuntungan[i], self.sisa_kain[i], self.panjang[i],
+                             self.jenis_kain, self.meter_per_ukuran)
+
+    def ke_dict(self, dengan_komposisi=False):
+        data = {
+            "jenis_kain": self.jenis_kain,
+            "resolusi": self.resolusi,
+            "panjang": self.panjang,
+            "keuntungan": self.keuntungan,
+            "sisa_kain": self.sisa_kain,
+            "nilai_marjinal": self.nilai_marjinal,
+        }
+        if dengan_komposisi:
+            data["komposisi"] = [self.komposisi(i) for i in range(len(self))]
+        return data
+
+
+def kurva_keuntungan(jenis_kain, dataset, panjang_maks, resolusi=1.0, ukuran_fokus=None, instrumen=None):
+    """
+    Menyapu semua panjang kain 0..panjang_maks (langkah `resolusi` meter) dalam satu tabel DP.
+
+    Satu tabel knapsack menjawab semua kapasitas sekaligus; di atas batas periodik
+    nilai diturunkan dari ukuran rasio terbaik, sehingga biayanya kira-kira sama
+    dengan satu kali hitung(..., solver="exact").
+
+    Args:
+        jenis_kain: Jenis kain yang dipilih
+        dataset: Dataset parameter kain
+        panjang_maks: Panjang kain terbesar (meter)
+        resolusi: Jarak antar titik kurva (meter, minimal 0.01)
+        ukuran_fokus: List ukuran yang difokuskan (None untuk semua ukuran)
+        instrumen: Instrumentasi opsional (fase "kurva")
+
+    Returns:
+        KurvaKeuntungan
+    """
+    try:
+        if panjang_maks < 0:
+            raise ValueError("Panjang maksimum tidak boleh negatif")
+        resolusi_mm = ke_mm(resolusi)
+        if resolusi_mm < 10:
+            raise ValueError("Resolusi minimal 0.01 meter")
+
+        data_kain = dataset[jenis_kain]
+        meter_per_ukuran = data_kain["meter_per_ukuran"]
+        berat_mm, untung = satuan_kain(data_kain)
+        ukuran_tersedia = list(meter_per_ukuran.keys())
+        if ukuran_fokus:
+            ukuran_tersedia = [uk for uk in ukuran_tersedia if uk in ukuran_fokus]
+            if not ukuran_tersedia:
+                raise ValueError("Tidak ada ukuran yang valid untuk difokuskan")
+
+        with fase_instrumen(instrumen, "kurva") as catat:
+            jumlah_titik = ke_mm(panjang_maks) // resolusi_mm + 1
+            panjang_mm = [k * resolusi_mm for k in range(jumlah_titik)]
+            panjang = [ke_meter(p) for p in panjang_mm]
+            barang, fpb = _barang_knapsack(ukuran_tersedia, berat_mm, untung)
+            # Kapasitas (satuan FPB) untuk tiap titik dan titik + 1 meter (nilai marjinal)
+            kapasitas = [p // fpb for p in panjang_mm]
+            kapasitas_plus = [(p + MM_PER_METER) // fpb for p in panjang_mm]
+
+            if not barang:
+                nol = [0] * jumlah_titik
+                return KurvaKeuntungan(jenis_kain, meter_per_ukuran, resolusi, panjang, nol, list(panjang),
+                                       list(nol), barang, None, kapasitas, 0, 0)
+
+            terbaik, batas = _batas_periodik(barang)
+            _, w_terbaik, v_terbaik = barang[terbaik]
+            ukuran_tabel = min(max(kapasitas_plus), batas + w_terbaik - 1)
+            nilai_dp, pilihan = _tabel_knapsack(barang, ukuran_tabel)
+
+            pakai = _tabel_pakai(barang, pilihan, ukuran_tabel)
+
+            def nilai(c):
+                if c > batas:
+                    q = (c - batas) // w_terbaik
+                    sisa_c = c - q * w_terbaik
+                    return nilai_dp[sisa_c] + q * v_terbaik, pakai[sisa_c] + q * w_terbaik
+                return nilai_dp[c], pakai[c]
+
+            keuntungan = []
+            sisa_kain = []
+            nilai_marjinal = []
+            for p, c, c_plus in zip(panjang_mm, kapasitas, kapasitas_plus):
+                v, terpakai = nilai(c)
+                keuntungan.append(v)
+                sisa_kain.append(ke_meter(p - terpakai * fpb))
+                nilai_marjinal.append(nilai(c_plus)[0] - v)
+            if catat is not None:
+                catat(iterasi=ukuran_tabel * len(barang) + jumlah_titik)
+
+        return KurvaKeuntungan(jenis_kain, meter_per_ukuran, resolusi, panjang, keuntungan, sisa_kain,
+                               nilai_marjinal, barang, pilihan, kapasitas, terbaik, batas)
 
     except Exception as e:
         raise ValueError(f"Terjadi kesalahan dalam perhitungan: {str(e)}")
@@ -110,39 +800,57 @@ def hitung_produksi(total_kain, jenis_kain, dataset, ukuran_fokus=None, optimasi
 
 def buat_grafik(hasil_produksi, meter_per_ukuran, total_kain, sisa_kain):
     """Membuat grafik visualisasi pemakaian kain"""
+    import matplotlib.pyplot as plt
+
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    gambar_grafik(ax1, ax2, hasil_produksi, meter_per_ukuran, total_kain, sisa_kain)
+    plt.tight_layout()
+    return fig
+
+
+def gambar_grafik(ax1, ax2, hasil_produksi, meter_per_ukuran, total_kain, sisa_kain):
+    """
+    Menggambar grafik batang dan pie pada axes yang sudah ada (tanpa impor matplotlib).
 
-    if hasil_produksi:
-        ukuran = list(hasil_produksi.keys())
-        jumlah = list(hasil_produksi.values())
-        meter_pakai = [meter_per_ukuran[u] * jumlah[i] for i, u in enumerate(ukuran)]
+    Returns:
+        Tuple: (bars, wedges, label_pie, teks_persen) atau None jika hasil kosong
+    """
+    if not hasil_produksi:
+        return None
 
-        ax1.bar(ukuran, jumlah, color='#3498db')
-        ax1.set_title('Jumlah Produksi per Ukuran')
-        ax1.set_xlabel('Ukuran')
-        ax1.set_ylabel('Jumlah Pakaian')
+    ukuran = list(hasil_produksi.keys())
+    jumlah = list(hasil_produksi.values())
+    meter_pakai = [meter_per_ukuran[u] * jumlah[i] for i, u in enumerate(ukuran)]
 
-        labels = list(hasil_produksi.keys()) + ['Sisa Kain']
-        sizes = meter_pakai + [sisa_kain]
-        colors = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6'][:len(labels)]
-        ax2.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-        ax2.set_title(f'Pemakaian Kain (Total: {total_kain}m)')
+    bars = ax1.bar(ukuran, jumlah, color='#3498db')
+    ax1.set_title('Jumlah Produksi per Ukuran')
+    ax1.set_xlabel('Ukuran')
+    ax1.set_ylabel('Jumlah Pakaian')
 
-    plt.tight_layout()
-    return fig
+    labels = list(hasil_produksi.keys()) + ['Sisa Kain']
+    sizes = meter_pakai + [sisa_kain]
+    colors = WARNA_GRAFIK[:len(labels)]
+    wedges, label_pie, teks_persen = ax2.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+    ax2.set_title(f'Pemakaian Kain (Total: {total_kain}m)')
+    return bars, wedges, label_pie, teks_persen
 
 
-def rekomendasi_kain(dataset, produk_target):
+def rekomendasi_kain(dataset, produk_target, indeks=None):
     """
     Memberikan rekomendasi jenis kain berdasarkan produk yang akan dibuat
 
     Args:
         dataset: Dataset parameter kain
         produk_target: Jenis produk yang akan dibuat (e.g. "Kemeja")
+        indeks: IndeksKain opsional (lookup peta produk -> kain, tanpa scan linear)
 
     Returns:
         List: Jenis kain yang direkomendasikan
     """
+    if indeks is not None:
+        rekomendasi = indeks.rekomendasi(produk_target)
+        return rekomendasi if rekomendasi else list(dataset.keys())
+
     rekomendasi = []
     for jenis_kain, data in dataset.items():
         if produk_target in data["rekomendasi_penggunaan"]:
@@ -1,6 +1,13 @@
 # main.py
-from ui import OptimasiApp
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Mode headless (mis. `python main.py batch pesanan.csv`), tanpa Tkinter
+        from cli import main
+        sys.exit(main(sys.argv[1:]))
+
+    from ui import OptimasiApp
+
     app = OptimasiApp()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
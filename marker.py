@@ -0,0 +1,295 @@
+# marker.py
+# Nesting marker 2D: setiap ukuran dimodelkan sebagai sekumpulan potongan pola
+# (persegi pembatas, mm) yang disusun pada lebar gulungan dengan heuristik skyline
+# (bottom-left, boleh diputar 90 derajat). Panjang marker dibagi jumlah pakaian
+# menjadi meter efektif per pakaian, yang menggantikan meter_per_ukuran datar
+# saat hitung(..., lebar_kain=...) dipakai. Layout di-cache per kombinasi ukuran.
+import math
+from collections import OrderedDict
+
+from logic import MM_PER_METER, ke_meter, ke_mm
+
+# Lebar gulungan yang diasumsikan meter_per_ukuran datar di dataset
+LEBAR_STANDAR = 1.5
+# Bagian luas kain yang benar-benar menjadi potongan pada marker datar (sisanya sela antar potongan)
+EFISIENSI_DATAR = 0.8
+MAKS_PER_MARKER = 6
+# Meter efektif dibulatkan ke atas per cm: FPB berat tetap besar sehingga tabel solver exact tetap kecil
+RESOLUSI_MM = 10
+# Potongan bawaan per pakaian: (nama, jumlah, bagian luas per potongan, rasio panjang/lebar)
+TEMPLAT_POLA = (
+    ("depan", 1, 0.28, 1.4),
+    ("belakang", 1, 0.28, 1.4),
+    ("lengan", 2, 0.17, 1.6),
+    ("kerah", 1, 0.10, 0.25),
+)
+# Urutan potongan yang dicoba; marker terpendek yang dipakai
+_URUTAN = (
+    lambda p: (-p[2] * p[3], -max(p[2], p[3])),  # luas menurun
+    lambda p: (-max(p[2], p[3]), -p[2] * p[3]),  # sisi terpanjang menurun
+    lambda p: (-min(p[2], p[3]), -p[2] * p[3]),  # sisi terpendek menurun
+)
+
+
+def pola_bawaan(meter):
+    """
+    Potongan pola bawaan satu pakaian dari meter_per_ukuran datar.
+
+    Luas total = meter * LEBAR_STANDAR * EFISIENSI_DATAR dibagi menurut TEMPLAT_POLA.
+
+    Returns:
+        Tuple: ((nama, lebar_mm, panjang_mm), ...) satu entri per potongan
+    """
+    luas = meter * LEBAR_STANDAR * EFISIENSI_DATAR * MM_PER_METER * MM_PER_METER
+    potongan = []
+    for nama, jumlah, bagian, rasio in TEMPLAT_POLA:
+        lebar = math.sqrt(luas * bagian / rasio)
+        for _ in range(jumlah):
+            potongan.append((nama, int(round(lebar)), int(round(lebar * rasio))))
+    return tuple(potongan)
+
+
+def pola_kain(data_kain, ukuran):
+    """Pola satu ukuran: dari data_kain["pola_per_ukuran"] (meter) jika ada, selain itu pola_bawaan"""
+    pola = (data_kain.get("pola_per_ukuran") or {}).get(ukuran)
+    if not pola:
+        return pola_bawaan(data_kain["meter_per_ukuran"][ukuran])
+    potongan = []
+    for p in pola:
+        lebar, panjang = ke_mm(p["lebar"]), ke_mm(p["panjang"])
+        if lebar <= 0 or panjang <= 0:
+            raise ValueError(f"Potongan pola {ukuran} harus berukuran lebih besar dari 0")
+        potongan.extend([(p.get("nama", "potongan"), lebar, panjang)] * int(p.get("jumlah", 1)))
+    return tuple(potongan)
+
+
+class Marker:
+    """
+    Satu layout marker: penempatan (ukuran, potongan, x, y, lebar, panjang, diputar) dalam mm,
+    x melintang lebar gulungan dan y sepanjang gulungan.
+    """
+
+    __slots__ = ("lebar_mm", "panjang_mm", "kombinasi", "penempatan", "luas_potongan")
+
+    def __init__(self, lebar_mm, panjang_mm, kombinasi, penempatan, luas_potongan):
+        self.lebar_mm = lebar_mm
+        self.panjang_mm = panjang_mm
+        self.kombinasi = kombinasi
+        self.penempatan = penempatan
+        self.luas_potongan = luas_potongan
+
+    @property
+    def panjang(self):
+        return ke_meter(self.panjang_mm)
+
+    @property
+    def efisiensi(self):
+        return self.luas_potongan / (self.lebar_mm * self.panjang_mm) if self.panjang_mm else 0.0
+
+    @property
+    def jumlah_pakaian(self):
+        return sum(self.kombinasi.values())
+
+    def __repr__(self):
+        return (f"Marker(kombinasi={self.kombinasi!r}, lebar={ke_meter(self.lebar_mm)!r}, "
+                f"panjang={self.panjang!r}, efisiensi={self.efisiensi:.3f})")
+
+    def ke_dict(self):
+        return {
+            "kombinasi": self.kombinasi,
+            "lebar": ke_meter(self.lebar_mm),
+            "panjang": self.panjang,
+            "efisiensi": round(self.efisiensi, 4),
+            "penempatan": [
+                {"ukuran": uk, "potongan": nama, "x": x, "y": y, "lebar": w, "panjang": h, "diputar": diputar}
+                for uk, nama, x, y, w, h, diputar in self.penempatan
+            ],
+        }
+
+
+def _tempatkan(skyline, lebar, w, h):
+    """
+    Posisi bottom-left terbaik untuk persegi w x h pada skyline [(x, y, lebar_segmen), ...].
+
+    Returns:
+        Tuple: (puncak, y, x, indeks_segmen) atau None jika tidak muat
+    """
+    terbaik = None
+    for i, (x, _, _) in enumerate(skyline):
+        if x + w > lebar:
+            break
+        # Tinggi dasar = segmen tertinggi yang tertutup persegi
+        y, sisa, j = 0, w, i
+        while sisa > 0:
+            y = max(y, skyline[j][1])
+            sisa -= skyline[j][2]
+            j += 1
+        kandidat = (y + h, y, x, i)
+        if terbaik is None or kandidat < terbaik:
+            terbaik = kandidat
+    return terbaik
+
+
+def _tambah_segmen(skyline, i, w, puncak):
+    """Memasang segmen baru mulai segmen i selebar w setinggi puncak, lalu menggabungkan tetangga setinggi"""
+    x = skyline[i][0]
+    akhir = x + w
+    baru = [(x, puncak, w)]
+    j = i
+    while j < len(skyline) and skyline[j][0] < akhir:
+        sx, sy, sw = skyline[j]
+        if sx + sw > akhir:
+            baru.append((akhir, sy, sx + sw - akhir))
+        j += 1
+    skyline[i:j] = baru
+    k = max(i - 1, 0)
+    while k < len(skyline) - 1:
+        if skyline[k][1] == skyline[k + 1][1]:
+            skyline[k] = (skyline[k][0], skyline[k][1], skyline[k][2] + skyline[k + 1][2])
+            del skyline[k + 1]
+        elif k > i:
+            break
+        else:
+            k += 1
+
+
+def _susun(potongan, lebar, rotasi):
+    """Skyline bottom-left untuk satu urutan potongan; (panjang, penempatan)"""
+    skyline = [(0, 0, lebar)]
+    penempatan = []
+    panjang = 0
+    for ukuran, nama, w, h in potongan:
+        terbaik = None
+        for pw, ph, diputar in ((w, h, False), (h, w, True)) if rotasi and w != h else ((w, h, False),):
+            posisi = _tempatkan(skyline, lebar, pw, ph)
+            if posisi is not None and (terbaik is None or posisi < terbaik[0]):
+                terbaik = (posisi, pw, ph, diputar)
+        if terbaik is None:
+            raise ValueError(f"Potongan {nama} ukuran {ukuran} lebih lebar dari kain ({ke_meter(lebar)} m)")
+        (puncak, y, x, i), pw, ph, diputar = terbaik
+        _tambah_segmen(skyline, i, pw, puncak)
+        penempatan.append((ukuran, nama, x, y, pw, ph, diputar))
+        panjang = max(panjang, puncak)
+    return panjang, penempatan
+
+
+def buat_marker(pola, kombinasi, lebar, rotasi=True):
+    """
+    Menyusun semua potongan satu kombinasi ukuran pada satu marker.
+
+    Args:
+        pola: Dict {ukuran: ((nama, lebar_mm, panjang_mm), ...)}
+        kombinasi: Dict {ukuran: jumlah_pakaian} di marker ini
+        lebar: Lebar gulungan (meter)
+        rotasi: True jika potongan boleh diputar 90 derajat
+
+    Returns:
+        Marker
+    """
+    lebar_mm = ke_mm(lebar)
+    if lebar_mm <= 0:
+        raise ValueError("Lebar kain harus lebih besar dari 0")
+    potongan = [(uk, nama, w, h) for uk, n in kombinasi.items() for _ in range(n) for nama, w, h in pola[uk]]
+    terbaik = None
+    # Tanpa rotasi ikut dicoba agar rotasi=True tidak pernah lebih panjang (heuristik rakus)
+    for putar in (False, True) if rotasi else (False,):
+        for kunci in _URUTAN:
+            try:
+                panjang, penempatan = _susun(sorted(potongan, key=kunci), lebar_mm, putar)
+            except ValueError:
+                if putar == rotasi:
+                    raise
+                continue
+            if terbaik is None or panjang < terbaik[0]:
+                terbaik = (panjang, penempatan)
+    luas = sum(w * h for _, _, w, h in potongan)
+    return Marker(lebar_mm, terbaik[0], dict(kombinasi), terbaik[1], luas)
+
+
+class CacheMarker:
+    """
+    LRU Marker per (lebar, rotasi, isi kombinasi).
+
+    Seperti CachePola, kunci dibentuk dari isi pola tiap ukuran di kombinasi,
+    bukan nama kain, sehingga kain dengan pola sama memakai layout yang sama.
+    """
+
+    def __init__(self, kapasitas=256):
+        self.kapasitas = kapasitas
+        self.hit = 0
+        self.miss = 0
+        self._lru = OrderedDict()
+
+    def __len__(self):
+        return len(self._lru)
+
+    def marker(self, pola, kombinasi, lebar, rotasi=True):
+        kunci = (ke_mm(lebar), rotasi, tuple((uk, n, pola[uk]) for uk, n in kombinasi.items() if n > 0))
+        marker = self._lru.get(kunci)
+        if marker is not None:
+            self.hit += 1
+            self._lru.move_to_end(kunci)
+            return marker
+        self.miss += 1
+        marker = buat_marker(pola, {uk: n for uk, n in kombinasi.items() if n > 0}, lebar, rotasi)
+        self._lru[kunci] = marker
+        while len(self._lru) > self.kapasitas:
+            self._lru.popitem(last=False)
+        return marker
+
+    def statistik(self):
+        return {"ukuran": len(self._lru), "hit": self.hit, "miss": self.miss}
+
+
+_cache_marker = CacheMarker()  # Dipakai bersama oleh hitung(..., lebar_kain=...) di proses ini
+
+
+def _bulatkan(mm):
+    """Panjang per pakaian (mm) dibulatkan ke atas ke RESOLUSI_MM, dalam meter"""
+    return ke_meter(int(math.ceil(mm / RESOLUSI_MM)) * RESOLUSI_MM)
+
+
+def meter_efektif(data_kain, lebar, kombinasi=None, rotasi=True, maks_per_marker=MAKS_PER_MARKER, cache=None):
+    """
+    Meter efektif per pakaian dari marker bersarang.
+
+    Tanpa kombinasi, setiap ukuran memakai marker satu ukuran berisi 1..maks_per_marker
+    pakaian dengan panjang per pakaian terkecil. Dengan kombinasi (mis. {"S": 2, "M": 1})
+    ukuran di dalamnya berbagi satu marker campuran; panjangnya dibagi menurut luas potongan.
+
+    Returns:
+        Tuple: ({ukuran: meter_per_pakaian}, {ukuran atau "kombinasi": Marker yang dipakai})
+    """
+    cache = cache if cache is not None else _cache_marker
+    meter_per_ukuran = data_kain["meter_per_ukuran"]
+    pola = {uk: pola_kain(data_kain, uk) for uk in meter_per_ukuran}
+    meter = {}
+    marker = {}
+    for uk in meter_per_ukuran:
+        terbaik = None
+        for n in range(1, maks_per_marker + 1):
+            m = cache.marker(pola, {uk: n}, lebar, rotasi)
+            if terbaik is None or m.panjang_mm * terbaik.jumlah_pakaian < terbaik.panjang_mm * n:
+                terbaik = m
+        meter[uk] = _bulatkan(terbaik.panjang_mm / terbaik.jumlah_pakaian)
+        marker[uk] = terbaik
+    if kombinasi:
+        for uk in kombinasi:
+            if uk not in meter_per_ukuran:
+                raise ValueError(f"Ukuran '{uk}' tidak ada di kain")
+        m = cache.marker(pola, kombinasi, lebar, rotasi)
+        luas = {uk: sum(w * h for _, w, h in pola[uk]) for uk in kombinasi}
+        total_luas = sum(luas[uk] * n for uk, n in kombinasi.items())
+        for uk, n in kombinasi.items():
+            if n > 0:
+                meter[uk] = _bulatkan(m.panjang_mm * luas[uk] / total_luas)
+        marker["kombinasi"] = m
+    return meter, marker
+
+
+def kain_efektif(data_kain, lebar, kombinasi=None, rotasi=True, cache=None):
+    """Salinan data_kain dengan meter_per_ukuran diganti meter efektif hasil nesting pada lebar ini"""
+    meter, _ = meter_efektif(data_kain, lebar, kombinasi, rotasi, cache=cache)
+    kain = dict(data_kain)
+    kain["meter_per_ukuran"] = meter
+    return kain
@@ -0,0 +1,246 @@
+# pareto.py
+# Frontier Pareto campuran ukuran untuk satu kain dan panjang kain: keuntungan
+# (maks), sisa kain (min), dan deviasi dari campuran persentase (min).
+#
+# Deviasi = kain alokasi persentase yang tidak terpenuhi: sum max(0, t - n) * berat
+# per ukuran, dengan t jumlah tahap 1 hitung() (floor(L * persen / berat)). Rencana
+# hitung() selalu berdeviasi 0. Setiap rencana dipecah menjadi bagian "penutup"
+# (min(n, t) per ukuran) dan tambahan bebas. Untuk pemakaian penutup a deviasinya
+# tepat A - a, sehingga cukup dua tabel DP alih-alih enumerasi semua campuran:
+#   B(a): keuntungan maks penutup dengan pemakaian tepat a (knapsack terbatas)
+#   F(x): keuntungan maks tambahan dengan pemakaian tepat x (knapsack tak terbatas)
+# Titik kandidat (a, x) hanya x yang memecahkan rekor F dari atas (sisanya
+# terdominasi pada deviasi yang sama), lalu disaring 3D dengan tangga bisect.
+import math
+from array import array
+from bisect import bisect_left
+
+from logic import (BASIS_POIN_PENUH, HasilProduksi, _barang_knapsack, _jumlah_persentase, _satuan, fase_instrumen,
+                   ke_basis_poin, ke_meter, ke_mm)
+
+# Penanda pemakaian yang tidak bisa dicapai tepat (keuntungan nyata jauh di atasnya)
+TAK_TERCAPAI = -(1 << 62)
+
+
+class FrontierPareto:
+    """
+    Titik-titik tak terdominasi (keuntungan, sisa kain, deviasi campuran) untuk satu kain.
+
+    Atribut list sejajar, urut keuntungan menurun: keuntungan, sisa_kain (m), dan
+    deviasi (% panjang kain). Komposisi ukuran direkonstruksi saat diminta lewat
+    komposisi(i) / hasil(i).
+    """
+
+    __slots__ = ("jenis_kain", "total_kain", "meter_per_ukuran", "persentase", "keuntungan", "sisa_kain", "deviasi",
+                 "statistik", "_titik", "_potongan", "_ambil", "_barang", "_pilihan")
+
+    def __init__(self, jenis_kain, total_kain, meter_per_ukuran, persentase, keuntungan, sisa_kain, deviasi,
+                 statistik, titik, potongan, ambil, barang, pilihan):
+        self.jenis_kain = jenis_kain
+        self.total_kain = total_kain
+        self.meter_per_ukuran = meter_per_ukuran
+        self.persentase = persentase
+        self.keuntungan = keuntungan
+        self.sisa_kain = sisa_kain
+        self.deviasi = deviasi
+        self.statistik = statistik
+        self._titik = titik
+        self._potongan = potongan
+        self._ambil = ambil
+        self._barang = barang
+        self._pilihan = pilihan
+
+    def __len__(self):
+        return len(self.keuntungan)
+
+    def __repr__(self):
+        return (f"FrontierPareto(jenis_kain={self.jenis_kain!r}, total_kain={self.total_kain!r}, "
+                f"titik={len(self)})")
+
+    def komposisi(self, i):
+        """Dict {ukuran: jumlah_pakaian} untuk titik ke-i"""
+        a, x = self._titik[i]
+        hasil = {}
+        # Bagian penutup: telusuri potongan knapsack terbatas dari belakang
+        for j in range(len(self._potongan) - 1, -1, -1):
+            if a > 0 and self._ambil[j][a]:
+                ukuran, w, jumlah, _ = self._potongan[j]
+                hasil[ukuran] = hasil.get(ukuran, 0) + jumlah
+                a -= w * jumlah
+        while x > 0:
+            ukuran, w, _ = self._barang[self._pilihan[x]]
+            hasil[ukuran] = hasil.get(ukuran, 0) + 1
+            x -= w
+        return {ukuran: hasil[ukuran] for ukuran in self.meter_per_ukuran if ukuran in hasil}
+
+    def hasil(self, i):
+        """HasilProduksi untuk titik ke-i (bisa langsung ditampilkan seperti hasil hitung())"""
+        return HasilProduksi(self.komposisi(i), self.keuntungan[i], self.sisa_kain[i], self.total_kain,
+                             self.jenis_kain, self.meter_per_ukuran)
+
+    def ke_dict(self, dengan_komposisi=False):
+        data = {
+            "jenis_kain": self.jenis_kain,
+            "total_kain": self.total_kain,
+            "persentase": self.persentase,
+            "keuntungan": self.keuntungan,
+            "sisa_kain": self.sisa_kain,
+            "deviasi": self.deviasi,
+            "statistik": self.statistik,
+        }
+        if dengan_komposisi:
+            data["komposisi"] = [self.komposisi(i) for i in range(len(self))]
+        return data
+
+
+def _tabel_penutup(potongan, kapasitas):
+    """
+    Knapsack 0/1 atas potongan biner (ukuran, berat, jumlah, untung) dengan pemakaian tepat.
+
+    Returns:
+        Tuple: (nilai per pemakaian 0..kapasitas, bytearray "diambil" per potongan)
+    """
+    nilai = array("q", [TAK_TERCAPAI]) * (kapasitas + 1)
+    nilai[0] = 0
+    ambil = []
+    for _, w, jumlah, v in potongan:
+        berat, untung = w * jumlah, v * jumlah
+        diambil = bytearray(kapasitas + 1)
+        for c in range(kapasitas, berat - 1, -1):
+            dasar = nilai[c - berat]
+            if dasar != TAK_TERCAPAI and dasar + untung > nilai[c]:
+                nilai[c] = dasar + untung
+                diambil[c] = 1
+        ambil.append(diambil)
+    return nilai, ambil
+
+
+def _tabel_tepat(barang, kapasitas):
+    """Knapsack tak terbatas dengan pemakaian tepat: nilai dan pilihan terakhir untuk 0..kapasitas"""
+    nilai = array("q", [TAK_TERCAPAI]) * (kapasitas + 1)
+    pilihan = array("b", [-1]) * (kapasitas + 1)
+    nilai[0] = 0
+    for c in range(1, kapasitas + 1):
+        terbaik_c = TAK_TERCAPAI
+        for i, (_, w, v) in enumerate(barang):
+            if w <= c and nilai[c - w] != TAK_TERCAPAI and nilai[c - w] + v > terbaik_c:
+                terbaik_c = nilai[c - w] + v
+                pilihan[c] = i
+        nilai[c] = terbaik_c
+    return nilai, pilihan
+
+
+def frontier_pareto(total_kain, jenis_kain, dataset, persentase=None, ukuran_fokus=None, indeks=None,
+                    instrumen=None):
+    """
+    Menghitung frontier Pareto (keuntungan maks, sisa kain min, deviasi campuran min).
+
+    Rencana yang terdominasi dipangkas per tingkat deviasi tanpa mencoba semua
+    campuran; biayanya kira-kira dua solve eksak ditambah satu sapuan linear.
+    Tanpa persentase frontiernya dua dimensi (keuntungan vs sisa kain).
+
+    Args:
+        total_kain: Total kain dalam meter
+        jenis_kain: Jenis kain yang dipilih
+        dataset: Dataset parameter kain
+        persentase: Dict {ukuran: nilai_persen} target campuran (opsional)
+        ukuran_fokus: List ukuran yang difokuskan (None untuk semua ukuran)
+        indeks: IndeksKain opsional (satuan bilangan bulat yang sudah dikompilasi)
+        instrumen: Instrumentasi opsional (fase "pareto")
+
+    Returns:
+        FrontierPareto
+    """
+    try:
+        data_kain = dataset[jenis_kain]
+        meter_per_ukuran = data_kain["meter_per_ukuran"]
+        berat_mm, untung = _satuan(jenis_kain, data_kain, indeks)
+        total_mm = ke_mm(total_kain)
+        if total_mm <= 0:
+            raise ValueError("Total kain harus lebih besar dari 0")
+
+        ukuran_tersedia = list(meter_per_ukuran.keys())
+        if ukuran_fokus:
+            ukuran_tersedia = [uk for uk in ukuran_tersedia if uk in ukuran_fokus]
+            if not ukuran_tersedia:
+                raise ValueError("Tidak ada ukuran yang valid untuk difokuskan")
+
+        basis_poin = {uk: ke_basis_poin((persentase or {}).get(uk, 0)) for uk in ukuran_tersedia}
+        if sum(basis_poin.values()) > BASIS_POIN_PENUH:
+            raise ValueError("Total persentase tidak boleh melebihi 100%")
+        # Jumlah target tahap 1 (sama persis dengan hitung())
+        target = {uk: _jumlah_persentase(total_mm, basis_poin[uk], berat_mm[uk]) for uk in ukuran_tersedia
+                  if berat_mm[uk] > 0}
+        target = {uk: t for uk, t in target.items() if t > 0}
+
+        with fase_instrumen(instrumen, "pareto") as catat:
+            barang, _ = _barang_knapsack(ukuran_tersedia, berat_mm, untung, total_mm)
+            # Satu FPB untuk tambahan dan penutup agar kedua tabel memakai satuan yang sama
+            fpb = 0
+            for uk in [b[0] for b in barang] + list(target):
+                fpb = math.gcd(fpb, berat_mm[uk])
+            fpb = fpb or 1
+            barang = [(uk, berat_mm[uk] // fpb, v) for uk, _, v in barang]
+            kapasitas = total_mm // fpb
+
+            # Potongan biner 1, 2, 4, ... untuk jumlah penutup tiap ukuran (knapsack terbatas)
+            potongan = []
+            for uk, t in target.items():
+                k = 1
+                while t > 0:
+                    jumlah = min(k, t)
+                    potongan.append((uk, berat_mm[uk] // fpb, jumlah, untung[uk]))
+                    t -= jumlah
+                    k *= 2
+            total_penutup = sum(t * berat_mm[uk] // fpb for uk, t in target.items())
+            nilai_penutup, ambil = _tabel_penutup(potongan, total_penutup)
+            nilai_tambah, pilihan = _tabel_tepat(barang, kapasitas)
+
+            # Batas atas F(x) <= rasio_terbaik * x menghentikan pencarian rekor ke bawah
+            if barang:
+                _, w_terbaik, v_terbaik = max(barang, key=lambda b: b[2] / b[1])
+            tangga_pakai, tangga_untung = [], []
+            titik = []
+            kandidat = 0
+            for a in range(total_penutup, -1, -1):
+                nilai_a = nilai_penutup[a]
+                if nilai_a == TAK_TERCAPAI:
+                    continue
+                rekor = TAK_TERCAPAI
+                for x in range(kapasitas - a if barang else 0, -1, -1):
+                    if barang and v_terbaik * x <= rekor * w_terbaik:
+                        break
+                    f = nilai_tambah[x]
+                    if f <= rekor:
+                        continue
+                    rekor = f
+                    kandidat += 1
+                    pakai, nilai = a + x, nilai_a + f
+                    # Terdominasi oleh titik berdeviasi lebih kecil dengan pakai >= dan keuntungan >=
+                    j = bisect_left(tangga_pakai, pakai)
+                    if j < len(tangga_pakai) and tangga_untung[j] >= nilai:
+                        continue
+                    titik.append((a, x, pakai, nilai))
+                    # Tangga: pakai naik, keuntungan turun; buang anak tangga yang kini terdominasi
+                    hapus = j + 1 if j < len(tangga_pakai) and tangga_pakai[j] == pakai else j
+                    awal = j
+                    while awal > 0 and tangga_untung[awal - 1] <= nilai:
+                        awal -= 1
+                    tangga_pakai[awal:hapus] = [pakai]
+                    tangga_untung[awal:hapus] = [nilai]
+            if catat is not None:
+                catat(iterasi=len(potongan) * total_penutup + kapasitas * len(barang) + kandidat)
+
+        titik.sort(key=lambda t: (-t[3], t[2]))
+        statistik = {"kandidat": kandidat, "titik": len(titik), "kapasitas": kapasitas, "fpb_mm": fpb,
+                     "potongan_penutup": len(potongan)}
+        return FrontierPareto(
+            jenis_kain, total_kain, meter_per_ukuran,
+            {uk: bp / 100 for uk, bp in basis_poin.items() if bp > 0},
+            [nilai for _, _, _, nilai in titik],
+            [ke_meter(total_mm - pakai * fpb) for _, _, pakai, _ in titik],
+            [round((total_penutup - a) * fpb * 100 / total_mm, 4) for a, _, _, _ in titik],
+            statistik, [(a, x) for a, x, _, _ in titik], potongan, ambil, barang, pilihan)
+
+    except Exception as e:
+        raise ValueError(f"Terjadi kesalahan dalam perhitungan: {str(e)}")
@@ -0,0 +1,358 @@
+# pembelian.py
+# Optimasi pembelian kain dengan anggaran: "dengan anggaran Rp X untuk produk Y,
+# kain apa dan berapa meter yang harus dibeli agar keuntungan maksimal?"
+# Kurva keuntungan bersih per kain (knapsack eksak dengan biaya kain dikurangkan)
+# dihitung paralel dan di-cache, lalu anggaran dibagi ke campuran kain.
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from logic import (MM_PER_METER, _barang_knapsack, _batas_periodik, _rekonstruksi, _tabel_knapsack, _tabel_pakai,
+                   fase_instrumen, ke_meter, ke_mm, ke_rupiah, rekomendasi_kain, satuan_kain)
+
+MAKS_PUTARAN_PERBAIKAN = 5
+
+
+class KurvaBeli:
+    """
+    Keuntungan bersih optimal satu kain untuk setiap panjang pembelian.
+
+    Nilai dalam mili-rupiah (keuntungan * 1000 - harga_per_meter * berat_mm) agar
+    tetap bulat; kapasitas dalam satuan FPB berat (mm). Tabel hanya sampai batas
+    periodik, di atasnya nilai diturunkan dari ukuran rasio terbaik, sehingga satu
+    kurva berlaku untuk anggaran berapa pun.
+    """
+
+    __slots__ = ("harga_per_meter", "fpb", "satuan_beli", "rasio", "_barang", "_nilai_dp", "_pilihan", "_pakai",
+                 "_terbaik", "_batas")
+
+    def __init__(self, isi, harga_per_meter):
+        berat_mm = {uk: w for uk, w, _ in isi}
+        bersih = {uk: v * MM_PER_METER - harga_per_meter * w for uk, w, v in isi}
+        barang, fpb = _barang_knapsack([uk for uk, _, _ in isi], berat_mm, bersih)
+        self.harga_per_meter = harga_per_meter
+        self.fpb = fpb
+        # Biaya satu satuan kapasitas (mili-rupiah)
+        self.satuan_beli = harga_per_meter * fpb
+        self._barang = barang
+        if not barang:
+            self.rasio = 0.0
+            self._nilai_dp = self._pilihan = self._pakai = None
+            self._terbaik = self._batas = 0
+            return
+        self._terbaik, self._batas = _batas_periodik(barang)
+        _, w_terbaik, v_terbaik = barang[self._terbaik]
+        ukuran_tabel = self._batas + w_terbaik - 1
+        self._nilai_dp, self._pilihan = _tabel_knapsack(barang, ukuran_tabel)
+        self._pakai = _tabel_pakai(barang, self._pilihan, ukuran_tabel)
+        # Keuntungan bersih per rupiah untuk anggaran besar (ukuran rasio terbaik)
+        self.rasio = v_terbaik / (w_terbaik * self.satuan_beli)
+
+    def nilai(self, c):
+        """(keuntungan bersih mili-rupiah, kapasitas terpakai) untuk kapasitas paling banyak c"""
+        if not self._barang or c <= 0:
+            return 0, 0
+        if c > self._batas:
+            _, w, v = self._barang[self._terbaik]
+            q = (c - self._batas) // w
+            c -= q * w
+            return self._nilai_dp[c] + q * v, self._pakai[c] + q * w
+        return self._nilai_dp[c], self._pakai[c]
+
+    def komposisi(self, c):
+        """Dict {ukuran: jumlah_pakaian} optimal untuk kapasitas c"""
+        hasil = {}
+        if not self._barang or c <= 0:
+            return hasil
+        if c > self._batas:
+            ukuran, w, _ = self._barang[self._terbaik]
+            jumlah = (c - self._batas) // w
+            hasil[ukuran] = jumlah
+            c -= jumlah * w
+        return _rekonstruksi(hasil, self._barang, self._pilihan, c)
+
+    def biaya_maks_barang(self):
+        """Biaya kain satu pakaian termahal (mili-rupiah), 0 jika tidak ada ukuran menguntungkan"""
+        return max((w for _, w, _ in self._barang), default=0) * self.satuan_beli
+
+
+class CacheKurvaBeli:
+    """
+    LRU KurvaBeli per (isi kain, harga_per_meter).
+
+    Seperti CachePola, kunci dibentuk dari isi kain sehingga aman dipakai ulang
+    antar rencana walaupun dataset/katalog berubah. Kurva yang belum ada dihitung
+    sekaligus, paralel jika executor diberikan.
+    """
+
+    def __init__(self, kapasitas=256):
+        self.kapasitas = kapasitas
+        self.hit = 0
+        self.miss = 0
+        self._lru = OrderedDict()
+
+    def __len__(self):
+        return len(self._lru)
+
+    def __contains__(self, kunci):
+        return kunci in self._lru
+
+    def kurva(self, daftar_kunci, executor=None):
+        """
+        Args:
+            daftar_kunci: List (isi, harga_per_meter); isi = ((ukuran, berat_mm, keuntungan), ...)
+            executor: Executor opsional untuk menghitung kurva yang belum di-cache
+
+        Returns:
+            List KurvaBeli sejajar daftar_kunci
+        """
+        hilang = []
+        for kunci in daftar_kunci:
+            if kunci in self._lru:
+                self.hit += 1
+                self._lru.move_to_end(kunci)
+            elif kunci not in hilang:
+                self.miss += 1
+                hilang.append(kunci)
+        if hilang:
+            if executor is not None and len(hilang) > 1:
+                baru = list(executor.map(_bangun_kurva, hilang))
+            else:
+                baru = [_bangun_kurva(kunci) for kunci in hilang]
+            for kunci, kurva in zip(hilang, baru):
+                self._lru[kunci] = kurva
+        hasil = [self._lru[kunci] for kunci in daftar_kunci]
+        while len(self._lru) > self.kapasitas:
+            self._lru.popitem(last=False)
+        return hasil
+
+
+def _bangun_kurva(kunci):
+    isi, harga_per_meter = kunci
+    return KurvaBeli(isi, harga_per_meter)
+
+
+class RencanaPembelian:
+    """
+    Rencana pembelian kain di bawah anggaran.
+
+    pembelian: satu dict per kain yang dibeli (urut peringkat): jenis_kain, meter,
+    biaya, hasil_produksi, keuntungan, keuntungan_bersih. peringkat: semua kain
+    kandidat, diurutkan berdasarkan keuntungan bersih per rupiah jika seluruh
+    anggaran dibelikan kain itu saja. Nilai uang dalam rupiah.
+    """
+
+    __slots__ = ("anggaran", "pembelian", "peringkat", "total_meter", "total_biaya", "sisa_anggaran",
+                 "total_keuntungan", "keuntungan_bersih", "batas_atas", "statistik")
+
+    def __init__(self, anggaran, pembelian, peringkat, total_meter, total_biaya, sisa_anggaran, total_keuntungan,
+                 keuntungan_bersih, batas_atas, statistik):
+        self.anggaran = anggaran
+        self.pembelian = pembelian
+        self.peringkat = peringkat
+        self.total_meter = total_meter
+        self.total_biaya = total_biaya
+        self.sisa_anggaran = sisa_anggaran
+        self.total_keuntungan = total_keuntungan
+        self.keuntungan_bersih = keuntungan_bersih
+        self.batas_atas = batas_atas
+        self.statistik = statistik
+
+    def __repr__(self):
+        return (f"RencanaPembelian(anggaran={self.anggaran!r}, kain={[p['jenis_kain'] for p in self.pembelian]}, "
+                f"keuntungan_bersih={self.keuntungan_bersih!r})")
+
+    def ke_dict(self):
+        return {
+            "anggaran": self.anggaran,
+            "pembelian": self.pembelian,
+            "peringkat": self.peringkat,
+            "total_meter": self.total_meter,
+            "total_biaya": self.total_biaya,
+            "sisa_anggaran": self.sisa_anggaran,
+            "total_keuntungan": self.total_keuntungan,
+            "keuntungan_bersih": self.keuntungan_bersih,
+            "batas_atas": self.batas_atas,
+            "statistik": self.statistik,
+        }
+
+
+def _rupiah(mili):
+    return mili / MM_PER_METER
+
+
+def _isi_anggaran(urutan, kurva, anggaran, kapasitas_maks, tetap):
+    """
+    Mengisi anggaran (mili-rupiah) kain demi kain sesuai urutan: setiap kain mengambil
+    kapasitas terbesar yang masih terjangkau, kecuali kain di `tetap` ({kain: kapasitas}).
+    Kain hanya membayar panjang yang benar-benar terpakai; sisanya turun ke kain berikutnya.
+    """
+    sisa = anggaran
+    total = 0
+    pakai = {}
+    for kain in urutan:
+        kv = kurva[kain]
+        c = tetap[kain] if kain in tetap else min(sisa // kv.satuan_beli, kapasitas_maks[kain])
+        v, terpakai = kv.nilai(c)
+        pakai[kain] = terpakai
+        sisa -= terpakai * kv.satuan_beli
+        total += v
+    return total, pakai
+
+
+def _perbaiki(urutan, kurva, anggaran, kapasitas_maks, total, pakai):
+    """
+    Coordinate ascent: kurangi satu kain sedikit demi sedikit (kain sebelumnya tetap)
+    agar sisa anggaran bisa dipakai kain berikutnya yang ukurannya lebih pas.
+    """
+    for _ in range(MAKS_PUTARAN_PERBAIKAN):
+        membaik = False
+        for posisi, kain in enumerate(urutan[:-1]):
+            kv = kurva[kain]
+            setelah = urutan[posisi + 1:]
+            biaya_setelah = max(kurva[k].biaya_maks_barang() for k in setelah)
+            if not pakai[kain] or not biaya_setelah:
+                continue
+            # Cukup membebaskan anggaran sebesar beberapa pakaian termahal kain berikutnya
+            jendela = min(pakai[kain], -(-2 * biaya_setelah // kv.satuan_beli))
+            tetap = {k: pakai[k] for k in urutan[:posisi]}
+            for c in range(pakai[kain] - 1, pakai[kain] - jendela - 1, -1):
+                tetap[kain] = c
+                kandidat, pakai_kandidat = _isi_anggaran(urutan, kurva, anggaran, kapasitas_maks, tetap)
+                if kandidat > total:
+                    total, pakai, membaik = kandidat, pakai_kandidat, True
+        if not membaik:
+            break
+    return total, pakai
+
+
+def rencanakan_pembelian(anggaran, dataset, produk_target=None, jenis_kain=None, ukuran_fokus=None, meter_maks=None,
+                         cache_kurva=None, executor=None, workers=None, indeks=None, instrumen=None):
+    """
+    Memilih kain dan jumlah meter yang dibeli dengan anggaran tertentu agar keuntungan
+    bersih (keuntungan_per_pakaian dikurangi biaya kain) maksimal.
+
+    Setiap kain kandidat dinilai dengan knapsack eksak per kain (kurva keuntungan
+    bersih, di-cache). Anggaran lalu diisi menurut peringkat keuntungan per rupiah
+    dan diperbaiki dengan coordinate ascent; batas_atas (relaksasi LP) ikut
+    dilaporkan sehingga selisih terhadap optimal terlihat.
+
+    Args:
+        anggaran: Anggaran pembelian kain (rupiah)
+        dataset: Dataset parameter kain
+        produk_target: Produk (mis. "Kemeja"); kandidat = rekomendasi_kain untuk produk ini
+        jenis_kain: Daftar kain kandidat eksplisit (mengabaikan produk_target)
+        ukuran_fokus: List ukuran yang boleh diproduksi (None untuk semua ukuran)
+        meter_maks: Dict {jenis_kain: meter} batas pembelian per kain (mis. stok pemasok)
+        cache_kurva: CacheKurvaBeli opsional untuk dipakai ulang antar rencana
+        executor: Executor opsional untuk menghitung kurva kain secara paralel
+        workers: Jumlah proses jika executor tidak diberikan (default: jumlah CPU)
+        indeks: IndeksKain opsional (lookup rekomendasi produk)
+        instrumen: Instrumentasi opsional (fase "rencana_pembelian")
+
+    Returns:
+        RencanaPembelian
+    """
+    if anggaran < 0:
+        raise ValueError("Anggaran tidak boleh negatif")
+    if jenis_kain:
+        kandidat = list(dict.fromkeys(jenis_kain))
+    elif produk_target:
+        kandidat = rekomendasi_kain(dataset, produk_target, indeks)
+    else:
+        kandidat = list(dataset.keys())
+    meter_maks = meter_maks or {}
+    for kain in list(kandidat) + list(meter_maks):
+        if kain not in dataset:
+            raise ValueError(f"Jenis kain '{kain}' tidak ditemukan")
+    cache_kurva = cache_kurva if cache_kurva is not None else CacheKurvaBeli()
+    hit_awal, miss_awal = cache_kurva.hit, cache_kurva.miss
+
+    with fase_instrumen(instrumen, "rencana_pembelian") as catat:
+        daftar_kunci = []
+        for kain in kandidat:
+            data_kain = dataset[kain]
+            if data_kain["harga_per_meter"] <= 0:
+                raise ValueError(f"Kain '{kain}': harga_per_meter harus lebih dari 0 untuk rencana pembelian")
+            berat_mm, untung = satuan_kain(data_kain)
+            isi = tuple((uk, berat_mm[uk], untung[uk]) for uk in data_kain["meter_per_ukuran"]
+                        if not ukuran_fokus or uk in ukuran_fokus)
+            daftar_kunci.append((isi, ke_rupiah(data_kain["harga_per_meter"])))
+
+        jumlah_hilang = len({k for k in daftar_kunci if k not in cache_kurva})
+        workers = workers or os.cpu_count() or 1
+        if executor is None and jumlah_hilang > 1 and workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, jumlah_hilang)) as pool:
+                daftar_kurva = cache_kurva.kurva(daftar_kunci, pool)
+        else:
+            daftar_kurva = cache_kurva.kurva(daftar_kunci, executor)
+        kurva = dict(zip(kandidat, daftar_kurva))
+
+        anggaran_mili = ke_rupiah(anggaran) * MM_PER_METER
+        tanpa_batas = anggaran_mili + 1
+        kapasitas_maks = {kain: ke_mm(meter_maks[kain]) // kurva[kain].fpb if kain in meter_maks else tanpa_batas
+                          for kain in kandidat}
+
+        # Peringkat: keuntungan bersih per rupiah jika seluruh anggaran untuk satu kain
+        peringkat = []
+        for kain in kandidat:
+            kv = kurva[kain]
+            nilai, pakai_sendiri = _isi_anggaran([kain], kurva, anggaran_mili, kapasitas_maks, {})
+            terpakai = pakai_sendiri[kain]
+            biaya = terpakai * kv.satuan_beli
+            peringkat.append({
+                "jenis_kain": kain,
+                "harga_per_meter": dataset[kain]["harga_per_meter"],
+                "meter": ke_meter(terpakai * kv.fpb),
+                "biaya": _rupiah(biaya),
+                "keuntungan_bersih": _rupiah(nilai),
+                "keuntungan_per_rupiah": nilai / biaya if biaya else 0.0,
+            })
+        peringkat.sort(key=lambda p: (p["keuntungan_per_rupiah"], p["keuntungan_bersih"]), reverse=True)
+        urutan = [p["jenis_kain"] for p in peringkat]
+
+        total, pakai = _isi_anggaran(urutan, kurva, anggaran_mili, kapasitas_maks, {})
+        if len(urutan) > 1:
+            total, pakai = _perbaiki(urutan, kurva, anggaran_mili, kapasitas_maks, total, pakai)
+
+        # Batas atas LP: anggaran dibelanjakan pecahan per rasio terbaik, dengan batas meter
+        batas_atas = 0.0
+        sisa = anggaran_mili
+        for kain in sorted(kandidat, key=lambda k: kurva[k].rasio, reverse=True):
+            kv = kurva[kain]
+            if kv.rasio <= 0 or sisa <= 0:
+                break
+            belanja = min(sisa, kapasitas_maks[kain] * kv.satuan_beli) if kain in meter_maks else sisa
+            batas_atas += belanja * kv.rasio
+            sisa -= belanja
+
+        pembelian = []
+        total_biaya = total_keuntungan = total_mm = 0
+        for kain in urutan:
+            if not pakai[kain]:
+                continue
+            kv = kurva[kain]
+            komposisi = kv.komposisi(pakai[kain])
+            untung = satuan_kain(dataset[kain])[1]
+            hasil_produksi = {uk: komposisi[uk] for uk in dataset[kain]["meter_per_ukuran"] if uk in komposisi}
+            keuntungan = sum(n * untung[uk] for uk, n in hasil_produksi.items())
+            biaya = pakai[kain] * kv.satuan_beli
+            pembelian.append({
+                "jenis_kain": kain,
+                "meter": ke_meter(pakai[kain] * kv.fpb),
+                "biaya": _rupiah(biaya),
+                "hasil_produksi": hasil_produksi,
+                "keuntungan": keuntungan,
+                "keuntungan_bersih": keuntungan - _rupiah(biaya),
+            })
+            total_biaya += biaya
+            total_keuntungan += keuntungan
+            total_mm += pakai[kain] * kv.fpb
+        if catat is not None:
+            catat(kain=len(kandidat), kurva_dihitung=cache_kurva.miss - miss_awal)
+
+    statistik = {"kandidat": len(kandidat), "kurva_dihitung": cache_kurva.miss - miss_awal,
+                 "cache_hit": cache_kurva.hit - hit_awal}
+    return RencanaPembelian(ke_rupiah(anggaran), pembelian, peringkat, ke_meter(total_mm), _rupiah(total_biaya),
+                            _rupiah(anggaran_mili - total_biaya), total_keuntungan, _rupiah(total),
+                            max(_rupiah(batas_atas), _rupiah(total)), statistik)
@@ -0,0 +1,227 @@
+# riwayat.py
+# Riwayat run perhitungan di SQLite lokal: input, hasil per ukuran, keuntungan,
+# sisa kain, dan waktu per fase. Kolom ringkasan terpisah dari blob JSON hasil
+# sehingga daftar/filter ribuan run hanya membaca kolom kecil berindeks, dan
+# run lama bisa dibuka ulang (HasilProduksi) tanpa menghitung ulang.
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from logic import HasilProduksi
+
+KOLOM_RINGKASAN = ("id", "waktu", "produk", "jenis_kain", "total_kain", "solver", "total_keuntungan", "sisa_kain",
+                   "durasi_ms")
+# Urutan yang boleh diminta dari halaman(); id sebagai pemecah seri agar urutan stabil
+URUTAN_RIWAYAT = {
+    "waktu": "waktu DESC, id DESC",
+    "keuntungan": "total_keuntungan DESC, id DESC",
+    "sisa_kain": "sisa_kain ASC, id DESC",
+}
+
+
+def _json(nilai):
+    return json.dumps(nilai, ensure_ascii=False, separators=(",", ":"))
+
+
+def _ke_epoch(nilai, akhir_hari=False):
+    """Epoch detik dari angka atau tanggal "YYYY-MM-DD" (akhir_hari: batas atas eksklusif hari berikutnya)"""
+    if nilai is None or nilai == "":
+        return None
+    if isinstance(nilai, (int, float)):
+        return float(nilai)
+    try:
+        tanggal = datetime.strptime(str(nilai).strip(), "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Tanggal harus berformat YYYY-MM-DD: {nilai}")
+    if akhir_hari:
+        tanggal += timedelta(days=1)
+    return tanggal.timestamp()
+
+
+class EntriRun:
+    """Satu run lengkap dari riwayat: ringkasan, input, hasil per ukuran, dan waktu per fase"""
+
+    __slots__ = ("id", "waktu", "produk", "jenis_kain", "total_kain", "solver", "total_keuntungan", "sisa_kain",
+                 "durasi_ms", "input", "hasil_produksi", "meter_per_ukuran", "keuntungan_per_pakaian", "kendala",
+                 "fase")
+
+    def __init__(self, id, waktu, produk, jenis_kain, total_kain, solver, total_keuntungan, sisa_kain, durasi_ms,
+                 input, hasil_produksi, meter_per_ukuran, keuntungan_per_pakaian, kendala, fase):
+        self.id = id
+        self.waktu = waktu
+        self.produk = produk
+        self.jenis_kain = jenis_kain
+        self.total_kain = total_kain
+        self.solver = solver
+        self.total_keuntungan = total_keuntungan
+        self.sisa_kain = sisa_kain
+        self.durasi_ms = durasi_ms
+        self.input = input
+        self.hasil_produksi = hasil_produksi
+        self.meter_per_ukuran = meter_per_ukuran
+        self.keuntungan_per_pakaian = keuntungan_per_pakaian  # None untuk run lama yang belum menyimpannya
+        self.kendala = kendala
+        self.fase = fase
+
+    def __repr__(self):
+        return f"EntriRun(id={self.id!r}, jenis_kain={self.jenis_kain!r}, total_kain={self.total_kain!r})"
+
+    def hasil(self):
+        """HasilProduksi tersimpan (memakai meter_per_ukuran saat run, bukan dataset sekarang)"""
+        return HasilProduksi(self.hasil_produksi, self.total_keuntungan, self.sisa_kain, self.total_kain,
+                             self.jenis_kain, self.meter_per_ukuran, self.kendala)
+
+    def ke_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class RiwayatRun:
+    """
+    Penyimpanan run di SQLite dengan indeks per kain, tanggal, dan produk.
+
+    Aman dipanggil dari thread worker (satu koneksi, dilindungi lock) seperti CacheHasil.
+    Daftar run dibaca per halaman (LIMIT/OFFSET di atas indeks) agar tampilan
+    virtual hanya memuat baris yang terlihat.
+    """
+
+    def __init__(self, path_db=":memory:"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path_db, check_same_thread=False)
+        # WAL + synchronous NORMAL: satu run per klik tanpa fsync penuh per commit
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS run ("
+            "id INTEGER PRIMARY KEY, waktu REAL NOT NULL, produk TEXT, jenis_kain TEXT NOT NULL, "
+            "total_kain REAL NOT NULL, solver TEXT, total_keuntungan INTEGER NOT NULL, sisa_kain REAL NOT NULL, "
+            "durasi_ms REAL, input TEXT NOT NULL, hasil TEXT NOT NULL, fase TEXT);"
+            "CREATE INDEX IF NOT EXISTS idx_run_waktu ON run (waktu);"
+            "CREATE INDEX IF NOT EXISTS idx_run_kain ON run (jenis_kain, waktu);"
+            "CREATE INDEX IF NOT EXISTS idx_run_produk ON run (produk, waktu);"
+        )
+        self._db.commit()
+
+    def simpan(self, hasil, argumen=None, produk=None, durasi_ms=None, fase=None, waktu=None):
+        """
+        Menyimpan satu run.
+
+        Args:
+            hasil: HasilProduksi
+            argumen: Dict argumen hitung() (indeks/instrumen diabaikan; dari dataset hanya keuntungan
+                per pakaian ukuran yang diproduksi yang disimpan)
+            produk: Jenis produk yang dipilih saat run
+            durasi_ms: Waktu hitung total (ms)
+            fase: Dict waktu per fase (mis. Instrumentasi.ringkasan()["fase"])
+            waktu: Epoch detik (default: sekarang)
+
+        Returns:
+            int: id run
+        """
+        argumen = argumen or {}
+        data_input = {k: argumen.get(k) for k in ("ukuran_fokus", "optimasi_sisa", "persentase", "batas_min",
+                                                  "batas_max", "lebar_kain") if argumen.get(k) not in (None, {}, [])}
+        # Keuntungan per pakaian saat run ikut disimpan agar run bisa dibuka walau kain diubah/dihapus
+        data_kain = (argumen.get("dataset") or {}).get(hasil.jenis_kain) or {}
+        keuntungan = data_kain.get("keuntungan_per_pakaian") or {}
+        data_hasil = {"hasil_produksi": hasil.hasil_produksi, "meter_per_ukuran": hasil.meter_per_ukuran,
+                      "keuntungan_per_pakaian": {uk: keuntungan[uk] for uk in hasil.hasil_produksi if uk in keuntungan},
+                      "kendala": hasil.kendala}
+        with self._lock:
+            kursor = self._db.execute(
+                "INSERT INTO run (waktu, produk, jenis_kain, total_kain, solver, total_keuntungan, sisa_kain, "
+                "durasi_ms, input, hasil, fase) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time() if waktu is None else waktu, produk, hasil.jenis_kain, hasil.total_kain,
+                 argumen.get("solver", "greedy"), int(hasil.total_keuntungan), hasil.sisa_kain, durasi_ms,
+                 _json(data_input), _json(data_hasil), _json(fase) if fase else None))
+            self._db.commit()
+            return kursor.lastrowid
+
+    def _where(self, jenis_kain=None, produk=None, sejak=None, sampai=None):
+        syarat, nilai = [], []
+        if jenis_kain:
+            syarat.append("jenis_kain = ?")
+            nilai.append(jenis_kain)
+        if produk:
+            syarat.append("produk = ?")
+            nilai.append(produk)
+        sejak, sampai = _ke_epoch(sejak), _ke_epoch(sampai, akhir_hari=True)
+        if sejak is not None:
+            syarat.append("waktu >= ?")
+            nilai.append(sejak)
+        if sampai is not None:
+            syarat.append("waktu < ?")
+            nilai.append(sampai)
+        return (" WHERE " + " AND ".join(syarat) if syarat else ""), nilai
+
+    def jumlah(self, **filter_run):
+        """Jumlah run yang cocok dengan filter (jenis_kain, produk, sejak, sampai)"""
+        where, nilai = self._where(**filter_run)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM run{where}", nilai).fetchone()[0]
+
+    def halaman(self, offset=0, batas=50, urut="waktu", **filter_run):
+        """List tuple ringkasan (urutan KOLOM_RINGKASAN) untuk baris offset..offset+batas; blob tidak dibaca"""
+        if urut not in URUTAN_RIWAYAT:
+            raise ValueError(f"Urutan riwayat harus salah satu dari {', '.join(URUTAN_RIWAYAT)}")
+        where, nilai = self._where(**filter_run)
+        with self._lock:
+            return self._db.execute(
+                f"SELECT {', '.join(KOLOM_RINGKASAN)} FROM run{where} ORDER BY {URUTAN_RIWAYAT[urut]} "
+                f"LIMIT ? OFFSET ?", nilai + [int(batas), int(offset)]).fetchall()
+
+    def nilai_kolom(self, kolom):
+        """Nilai berbeda untuk kolom filter ("jenis_kain" atau "produk"), diambil dari indeksnya"""
+        if kolom not in ("jenis_kain", "produk"):
+            raise ValueError(f"Kolom filter tidak dikenal: {kolom}")
+        with self._lock:
+            return [b[0] for b in self._db.execute(
+                f"SELECT DISTINCT {kolom} FROM run WHERE {kolom} IS NOT NULL ORDER BY {kolom}")]
+
+    def muat(self, id_run):
+        """EntriRun lengkap untuk id_run (KeyError jika tidak ada)"""
+        with self._lock:
+            baris = self._db.execute(f"SELECT {', '.join(KOLOM_RINGKASAN)}, input, hasil, fase FROM run WHERE id = ?",
+                                     (id_run,)).fetchone()
+        if baris is None:
+            raise KeyError(f"Run {id_run} tidak ada di riwayat")
+        data_hasil = json.loads(baris[-2])
+        return EntriRun(*baris[:-3], json.loads(baris[-3]), data_hasil["hasil_produksi"],
+                        data_hasil["meter_per_ukuran"], data_hasil.get("keuntungan_per_pakaian"),
+                        data_hasil.get("kendala"), json.loads(baris[-1]) if baris[-1] else None)
+
+    def hapus(self, id_run):
+        with self._lock:
+            self._db.execute("DELETE FROM run WHERE id = ?", (id_run,))
+            self._db.commit()
+
+    def tutup(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def bandingkan_run(a, b):
+    """
+    Selisih dua EntriRun (b - a).
+
+    Returns:
+        Dict: ukuran {uk: (jumlah_a, jumlah_b, selisih)}, total_keuntungan / sisa_kain /
+        total_kain (nilai_a, nilai_b, selisih), dan input {kunci: (nilai_a, nilai_b)} yang berbeda
+    """
+    ukuran = list(a.hasil_produksi) + [uk for uk in b.hasil_produksi if uk not in a.hasil_produksi]
+    data = {"ukuran": {}}
+    for uk in ukuran:
+        na, nb = a.hasil_produksi.get(uk, 0), b.hasil_produksi.get(uk, 0)
+        data["ukuran"][uk] = (na, nb, nb - na)
+    for kunci in ("total_keuntungan", "sisa_kain", "total_kain"):
+        na, nb = getattr(a, kunci), getattr(b, kunci)
+        data[kunci] = (na, nb, round(nb - na, 4))
+    masukan = {"jenis_kain": (a.jenis_kain, b.jenis_kain), "produk": (a.produk, b.produk),
+               "solver": (a.solver, b.solver)}
+    for kunci in set(a.input) | set(b.input):
+        masukan[kunci] = (a.input.get(kunci), b.input.get(kunci))
+    data["input"] = {k: v for k, v in masukan.items() if v[0] != v[1]}
+    return data
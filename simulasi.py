@@ -0,0 +1,255 @@
+# simulasi.py
+# Analisis ketahanan rencana produksi (Monte Carlo, NumPy): susut kain, susut
+# potong, dan cacat per pakaian diambil acak per undian sesuai profil elastisitas
+# kain, lalu rencana dievaluasi ulang (atau dihitung ulang) secara vektor.
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from logic import MM_PER_METER, ke_mm, satuan_kain
+from skenario import hitung_batch
+
+MODE_SIMULASI = ("evaluasi", "solusi_ulang")
+# Undian dibagi per potongan berukuran tetap dengan seed turunan sendiri, sehingga
+# hasil untuk seed yang sama identik berapa pun jumlah worker-nya
+UKURAN_POTONGAN = 50_000
+SAMPEL_MAKS = 10_000_000
+
+# Parameter kerugian per tingkat elastisitas (pecahan): susut kain sebelum potong
+# (normal, rata-rata/simpangan), tambahan kain per pakaian saat dipotong (normal),
+# dan peluang satu pakaian cacat (binomial). Kain elastis lebih sulit dipotong presisi.
+PROFIL_ELASTISITAS = {
+    "Rendah": {"susut": (0.015, 0.005), "susut_potong": (0.02, 0.01), "cacat": 0.02},
+    "Sedang": {"susut": (0.025, 0.008), "susut_potong": (0.03, 0.012), "cacat": 0.03},
+    "Tinggi": {"susut": (0.04, 0.012), "susut_potong": (0.045, 0.018), "cacat": 0.05},
+}
+ELASTISITAS_DEFAULT = "Sedang"
+BATAS_SUSUT = 0.5  # Undian normal dipotong ke [0, BATAS_SUSUT]
+
+
+def profil_kain(data_kain, profil=None):
+    """Profil kerugian untuk satu kain (dari elastisitas), ditimpa kunci di `profil` jika ada"""
+    dasar = PROFIL_ELASTISITAS.get(data_kain.get("elastisitas"), PROFIL_ELASTISITAS[ELASTISITAS_DEFAULT])
+    hasil = dict(dasar, **(profil or {}))
+    for kunci in ("susut", "susut_potong"):
+        rata_rata, simpangan = hasil[kunci]
+        if not 0 <= rata_rata < BATAS_SUSUT or simpangan < 0:
+            raise ValueError(f"Parameter {kunci} harus rata-rata 0-{BATAS_SUSUT} dan simpangan >= 0")
+    if not 0 <= hasil["cacat"] <= 1:
+        raise ValueError("Peluang cacat harus di antara 0 dan 1")
+    return hasil
+
+
+def _normal_terpotong(rng, parameter, n):
+    rata_rata, simpangan = parameter
+    return np.clip(rng.normal(rata_rata, simpangan, n), 0.0, BATAS_SUSUT)
+
+
+def _potong_rencana(jumlah, berat_mm, panjang_mm):
+    """
+    Memotong rencana (jumlah per kolom, urutan rencana) dari panjang efektif per undian.
+
+    Returns:
+        Tuple: (jumlah terpotong [undian x ukuran], sisa panjang per undian)
+    """
+    terpotong = np.zeros((len(panjang_mm), len(jumlah)), dtype=np.int64)
+    sisa = panjang_mm.copy()
+    for j, (n, w) in enumerate(zip(jumlah, berat_mm.T)):
+        muat = np.minimum(n, np.floor(sisa / w).astype(np.int64))
+        terpotong[:, j] = muat
+        sisa -= muat * w
+    return terpotong, sisa
+
+
+def _undian(tugas):
+    """Satu potongan undian (dijalankan di worker): array keuntungan, sisa kain, dan jumlah baik"""
+    (seed, n, mode, total_mm, rencana, berat_mm, untung, profil, dataset, jenis_kain, persentase, ukuran_fokus,
+     optimasi_sisa) = tugas
+    rng = np.random.default_rng(seed)
+    susut = _normal_terpotong(rng, profil["susut"], n)
+    susut_potong = _normal_terpotong(rng, profil["susut_potong"], n)
+    panjang_mm = total_mm * (1 - susut)
+    # Susut potong memperbesar kebutuhan setiap pakaian dengan faktor yang sama
+    berat_efektif = np.outer(1 + susut_potong, berat_mm)
+
+    if mode == "evaluasi":
+        terpotong, sisa = _potong_rencana(rencana, berat_efektif, panjang_mm)
+    else:
+        # Menghitung ulang untuk panjang efektif setara (panjang / faktor potong), solver greedy vektor
+        setara = np.floor(panjang_mm / (1 + susut_potong)) / MM_PER_METER
+        batch = hitung_batch(dataset, setara, [persentase], jenis_kain=[jenis_kain], ukuran_fokus=ukuran_fokus,
+                             optimasi_sisa=optimasi_sisa)
+        kolom = {uk: j for j, uk in enumerate(batch.ukuran)}
+        jumlah = batch.hasil_produksi[0, :, 0][:, [kolom[uk] for uk in _ukuran_rencana(dataset[jenis_kain])]]
+        terpotong = jumlah
+        sisa = panjang_mm - (jumlah * berat_efektif).sum(axis=1)
+
+    baik = terpotong - rng.binomial(terpotong, profil["cacat"])
+    return (baik @ np.asarray(untung, dtype=np.int64), sisa / MM_PER_METER, baik)
+
+
+def _ukuran_rencana(data_kain):
+    return list(data_kain["meter_per_ukuran"].keys())
+
+
+def _ringkas(sampel, tingkat_kepercayaan):
+    """Rata-rata, simpangan, interval persentil, dan interval kepercayaan rata-rata"""
+    alfa = 1 - tingkat_kepercayaan
+    z = NormalDist().inv_cdf(1 - alfa / 2)
+    n = len(sampel)
+    rata_rata = float(sampel.mean())
+    simpangan = float(sampel.std(ddof=1)) if n > 1 else 0.0
+    bawah, tengah, atas = np.quantile(sampel, (alfa / 2, 0.5, 1 - alfa / 2))
+    galat = z * simpangan / math.sqrt(n)
+    return {
+        "rata_rata": rata_rata,
+        "simpangan": simpangan,
+        "median": float(tengah),
+        "interval": [float(bawah), float(atas)],
+        "ci_rata_rata": [rata_rata - galat, rata_rata + galat],
+        "minimum": float(sampel.min()),
+        "maksimum": float(sampel.max()),
+    }
+
+
+def _wilson(berhasil, n, tingkat_kepercayaan):
+    """Interval Wilson untuk peluang binomial"""
+    z = NormalDist().inv_cdf(1 - (1 - tingkat_kepercayaan) / 2)
+    p = berhasil / n
+    penyebut = 1 + z * z / n
+    pusat = (p + z * z / (2 * n)) / penyebut
+    lebar = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / penyebut
+    return [max(pusat - lebar, 0.0), min(pusat + lebar, 1.0)]
+
+
+class HasilSimulasi:
+    """Ringkasan simulasi Monte Carlo satu rencana produksi"""
+
+    __slots__ = ("jenis_kain", "total_kain", "mode", "sampel", "seed", "tingkat_kepercayaan", "profil", "rencana",
+                 "keuntungan_rencana", "sisa_rencana", "keuntungan", "sisa_kain", "peluang_tercapai",
+                 "interval_peluang", "peluang_per_ukuran", "pakaian_baik")
+
+    def __init__(self, jenis_kain, total_kain, mode, sampel, seed, tingkat_kepercayaan, profil, rencana,
+                 keuntungan_rencana, sisa_rencana, keuntungan, sisa_kain, peluang_tercapai, interval_peluang,
+                 peluang_per_ukuran, pakaian_baik):
+        self.jenis_kain = jenis_kain
+        self.total_kain = total_kain
+        self.mode = mode
+        self.sampel = sampel
+        self.seed = seed
+        self.tingkat_kepercayaan = tingkat_kepercayaan
+        self.profil = profil
+        self.rencana = rencana
+        self.keuntungan_rencana = keuntungan_rencana
+        self.sisa_rencana = sisa_rencana
+        # Dict ringkasan (_ringkas) keuntungan dan sisa kain hasil simulasi
+        self.keuntungan = keuntungan
+        self.sisa_kain = sisa_kain
+        self.peluang_tercapai = peluang_tercapai
+        self.interval_peluang = interval_peluang
+        self.peluang_per_ukuran = peluang_per_ukuran
+        self.pakaian_baik = pakaian_baik  # {ukuran: rata-rata jumlah pakaian baik}
+
+    def __repr__(self):
+        return (f"HasilSimulasi(jenis_kain={self.jenis_kain!r}, sampel={self.sampel!r}, "
+                f"peluang_tercapai={self.peluang_tercapai:.4f}, "
+                f"keuntungan_rata_rata={self.keuntungan['rata_rata']:.0f})")
+
+    def ke_dict(self):
+        return {
+            "jenis_kain": self.jenis_kain,
+            "total_kain": self.total_kain,
+            "mode": self.mode,
+            "sampel": self.sampel,
+            "seed": self.seed,
+            "tingkat_kepercayaan": self.tingkat_kepercayaan,
+            "profil": {k: list(v) if isinstance(v, tuple) else v for k, v in self.profil.items()},
+            "rencana": self.rencana,
+            "keuntungan_rencana": self.keuntungan_rencana,
+            "sisa_rencana": self.sisa_rencana,
+            "keuntungan": self.keuntungan,
+            "sisa_kain": self.sisa_kain,
+            "peluang_tercapai": self.peluang_tercapai,
+            "interval_peluang": self.interval_peluang,
+            "peluang_per_ukuran": self.peluang_per_ukuran,
+            "pakaian_baik": self.pakaian_baik,
+        }
+
+
+def simulasikan(hasil, dataset, sampel=10_000, seed=None, mode="evaluasi", persentase=None, ukuran_fokus=None,
+                optimasi_sisa=False, profil=None, tingkat_kepercayaan=0.95, workers=None):
+    """
+    Simulasi Monte Carlo kerugian produksi untuk satu rencana (HasilProduksi).
+
+    Setiap undian mengambil susut kain, susut potong, dan cacat per pakaian dari
+    profil elastisitas kain. Mode "evaluasi" memotong rencana apa adanya (urutan
+    ukuran rencana) dari kain yang tersisa; mode "solusi_ulang" menghitung ulang
+    produksi untuk panjang efektif setiap undian (solver greedy vektor, argumen
+    persentase/ukuran_fokus/optimasi_sisa sama dengan rencana asal). Rencana
+    dianggap tercapai jika jumlah pakaian baik setiap ukuran >= rencana.
+
+    Args:
+        hasil: HasilProduksi rencana (dari hitung() atau titik frontier)
+        dataset: Dataset parameter kain
+        sampel: Jumlah undian
+        seed: Seed generator (None = acak; dicatat di hasil agar bisa diulang)
+        mode: "evaluasi" atau "solusi_ulang"
+        profil: Dict opsional menimpa PROFIL_ELASTISITAS ({"susut": (rata, sd), "susut_potong": ..., "cacat": p})
+        tingkat_kepercayaan: Tingkat interval (default 0.95)
+        workers: Jumlah proses (default: jumlah CPU; 1 = di proses ini)
+
+    Returns:
+        HasilSimulasi
+    """
+    if mode not in MODE_SIMULASI:
+        raise ValueError(f"Mode simulasi harus salah satu dari {', '.join(MODE_SIMULASI)}")
+    if not 1 <= sampel <= SAMPEL_MAKS:
+        raise ValueError(f"Jumlah sampel harus 1-{SAMPEL_MAKS:,}")
+    if not 0 < tingkat_kepercayaan < 1:
+        raise ValueError("Tingkat kepercayaan harus di antara 0 dan 1")
+
+    jenis_kain = hasil.jenis_kain
+    data_kain = dataset[jenis_kain]
+    profil = profil_kain(data_kain, profil)
+    berat_mm, untung = satuan_kain(data_kain)
+    ukuran = _ukuran_rencana(data_kain)
+    if mode == "evaluasi":
+        # Urutan kolom mengikuti urutan rencana: ukuran yang direncanakan lebih dulu dipotong lebih dulu
+        ukuran = list(hasil.hasil_produksi) + [uk for uk in ukuran if uk not in hasil.hasil_produksi]
+    rencana = [hasil.hasil_produksi.get(uk, 0) for uk in ukuran]
+    berat = np.array([berat_mm[uk] for uk in ukuran], dtype=np.float64)
+    nilai = [untung[uk] for uk in ukuran]
+
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % (1 << 63))
+    anak = np.random.SeedSequence(seed).spawn(math.ceil(sampel / UKURAN_POTONGAN))
+    # Solusi ulang hanya butuh satu kain; dataset penuh (mis. KatalogKain) tidak dikirim ke worker
+    dataset_kain = {jenis_kain: data_kain} if mode == "solusi_ulang" else None
+    daftar_tugas = [
+        (s, min(UKURAN_POTONGAN, sampel - i * UKURAN_POTONGAN), mode, ke_mm(hasil.total_kain), rencana, berat, nilai,
+         profil, dataset_kain, jenis_kain, persentase, ukuran_fokus, optimasi_sisa)
+        for i, s in enumerate(anak)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(daftar_tugas))
+    if workers == 1:
+        potongan = [_undian(t) for t in daftar_tugas]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            potongan = list(executor.map(_undian, daftar_tugas))
+
+    keuntungan = np.concatenate([p[0] for p in potongan])
+    sisa_kain = np.concatenate([p[1] for p in potongan])
+    baik = np.concatenate([p[2] for p in potongan])
+    cukup = baik >= np.asarray(rencana, dtype=np.int64)
+    tercapai = int(cukup.all(axis=1).sum())
+
+    return HasilSimulasi(
+        jenis_kain, hasil.total_kain, mode, sampel, seed, tingkat_kepercayaan, profil,
+        {uk: n for uk, n in zip(ukuran, rencana) if n > 0}, hasil.total_keuntungan, hasil.sisa_kain,
+        _ringkas(keuntungan, tingkat_kepercayaan), _ringkas(sisa_kain, tingkat_kepercayaan),
+        tercapai / sampel, _wilson(tercapai, sampel, tingkat_kepercayaan),
+        {uk: float(cukup[:, j].mean()) for j, (uk, n) in enumerate(zip(ukuran, rencana)) if n > 0},
+        {uk: float(baik[:, j].mean()) for j, uk in enumerate(ukuran) if baik[:, j].any()})
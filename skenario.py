@@ -0,0 +1,219 @@
+import numpy as np
+
+from logic import BASIS_POIN_PENUH, MM_PER_METER, HasilProduksi, _urutan_greedy, ke_basis_poin, satuan_kain
+
+
+class HasilBatch:
+    """Hasil evaluasi batch berbentuk array (kain x total_kain x campuran persentase)."""
+
+    __slots__ = ("jenis_kain", "ukuran", "total_kain", "hasil_produksi", "total_keuntungan", "sisa_kain",
+                 "valid", "meter_per_ukuran")
+
+    def __init__(self, jenis_kain, ukuran, total_kain, hasil_produksi, total_keuntungan, sisa_kain, valid,
+                 meter_per_ukuran):
+        self.jenis_kain = jenis_kain
+        self.ukuran = ukuran
+        self.total_kain = total_kain
+        self.hasil_produksi = hasil_produksi
+        self.total_keuntungan = total_keuntungan
+        self.sisa_kain = sisa_kain
+        self.valid = valid
+        self.meter_per_ukuran = meter_per_ukuran
+
+    def ambil(self, i_kain, i_total, i_campuran):
+        """Mengambil satu skenario sebagai HasilProduksi (None jika skenario tidak valid)"""
+        if not self.valid[i_kain, i_total, i_campuran]:
+            return None
+        jumlah = self.hasil_produksi[i_kain, i_total, i_campuran]
+        hasil_produksi = {uk: int(jumlah[j]) for j, uk in enumerate(self.ukuran) if jumlah[j] > 0}
+        return HasilProduksi(hasil_produksi, self.total_keuntungan[i_kain, i_total, i_campuran].item(),
+                             float(self.sisa_kain[i_kain, i_total, i_campuran]),
+                             float(self.total_kain[i_total]), self.jenis_kain[i_kain],
+                             self.meter_per_ukuran[i_kain])
+
+    def ke_dict(self):
+        """Dict siap-JSON; array bersarang [kain][total_kain][campuran], skenario tidak valid bernilai null"""
+        valid = self.valid.tolist()
+
+        def saring(nilai):
+            return [[[v if ok else None for v, ok in zip(baris_v, baris_ok)]
+                     for baris_v, baris_ok in zip(kain_v, kain_ok)]
+                    for kain_v, kain_ok in zip(nilai, valid)]
+
+        return {
+            "jenis_kain": list(self.jenis_kain),
+            "ukuran": list(self.ukuran),
+            "total_kain": self.total_kain.tolist(),
+            "hasil_produksi": saring(self.hasil_produksi.tolist()),
+            "total_keuntungan": saring(self.total_keuntungan.tolist()),
+            "sisa_kain": saring(self.sisa_kain.round(4).tolist()),
+        }
+
+
+def kemas_dataset(dataset, jenis_kain=None, ukuran_fokus=None, indeks=None):
+    """
+    Mengemas parameter kain ke dalam array agar bisa dihitung secara vektor.
+
+    Kolom ukuran adalah gabungan semua ukuran (urutan pertama kali muncul).
+    Urutan dataset dan urutan greedy disimpan per kain sebagai indeks kolom,
+    diisi -1 untuk posisi kosong, sehingga urutan operasi sama dengan hitung().
+
+    Args:
+        indeks: IndeksKain opsional; urutan greedy diambil dari indeks tanpa mengurutkan ulang
+
+    Returns:
+        Dict berisi array berat_mm, keuntungan (rupiah), urutan_dataset, urutan_greedy, dll.
+    """
+    daftar_kain = list(jenis_kain) if jenis_kain is not None else list(dataset.keys())
+    ukuran = []
+    for kain in daftar_kain:
+        for uk in dataset[kain]["meter_per_ukuran"]:
+            if uk not in ukuran:
+                ukuran.append(uk)
+    kolom = {uk: j for j, uk in enumerate(ukuran)}
+
+    n_kain, n_ukuran = len(daftar_kain), len(ukuran)
+    # Kolom ukuran yang tidak dimiliki kain diisi 1 mm agar pembagian aman (tidak pernah dipakai)
+    berat_mm = np.ones((n_kain, n_ukuran), dtype=np.int64)
+    keuntungan = np.zeros((n_kain, n_ukuran), dtype=np.int64)
+    urutan_dataset = np.full((n_kain, n_ukuran), -1, dtype=np.intp)
+    urutan_greedy = np.full((n_kain, n_ukuran), -1, dtype=np.intp)
+    termurah = np.full(n_kain, -1, dtype=np.intp)
+    meter_per_kain = []
+
+    for f, kain in enumerate(daftar_kain):
+        data_kain = dataset[kain]
+        meter_per_ukuran = data_kain["meter_per_ukuran"]
+        berat_kain, untung_kain = satuan_kain(data_kain)
+        meter_per_kain.append(meter_per_ukuran)
+
+        ukuran_tersedia = list(meter_per_ukuran.keys())
+        if ukuran_fokus:
+            ukuran_tersedia = [uk for uk in ukuran_tersedia if uk in ukuran_fokus]
+        for uk in meter_per_ukuran:
+            berat_mm[f, kolom[uk]] = berat_kain[uk]
+            keuntungan[f, kolom[uk]] = untung_kain[uk]
+        if not ukuran_tersedia:
+            continue
+
+        # Urutan greedy dihitung persis seperti hitung() agar hasil identik
+        for p, uk in enumerate(ukuran_tersedia):
+            urutan_dataset[f, p] = kolom[uk]
+        for p, uk in enumerate(_urutan_greedy(kain, ukuran_tersedia, data_kain, indeks)):
+            urutan_greedy[f, p] = kolom[uk]
+        if indeks is not None and kain in indeks:
+            termurah[f] = kolom[indeks[kain].ukuran_terkecil(ukuran_tersedia)]
+        else:
+            termurah[f] = kolom[min(ukuran_tersedia, key=lambda u: berat_kain[u])]
+
+    return {
+        "jenis_kain": daftar_kain,
+        "ukuran": ukuran,
+        "berat_mm": berat_mm,
+        "keuntungan": keuntungan,
+        "urutan_dataset": urutan_dataset,
+        "urutan_greedy": urutan_greedy,
+        "termurah": termurah,
+        "meter_per_ukuran": meter_per_kain,
+    }
+
+
+def hitung_batch(dataset, daftar_total_kain, daftar_persentase, jenis_kain=None, ukuran_fokus=None,
+                 optimasi_sisa=False, indeks=None):
+    """
+    Menghitung produksi untuk seluruh matriks skenario sekaligus (vektorisasi NumPy).
+
+    Setiap skenario (kain, total_kain, campuran persentase) menghasilkan angka
+    yang sama persis dengan hitung(..., solver="greedy"). Skenario yang akan
+    ditolak hitung() (total persentase > 100% atau tidak ada ukuran valid)
+    ditandai valid=False.
+
+    Args:
+        dataset: Dataset parameter kain
+        daftar_total_kain: Daftar total kain (meter)
+        daftar_persentase: Daftar dict {ukuran: nilai_persen}; None/{} berarti tanpa persentase
+        jenis_kain: Daftar jenis kain (None untuk semua kain di dataset)
+        ukuran_fokus: List ukuran yang difokuskan (None untuk semua ukuran)
+        optimasi_sisa: True untuk optimasi sisa kain
+        indeks: IndeksKain opsional
+
+    Returns:
+        HasilBatch
+    """
+    paket = kemas_dataset(dataset, jenis_kain, ukuran_fokus, indeks)
+    ukuran = paket["ukuran"]
+    kolom = {uk: j for j, uk in enumerate(ukuran)}
+    berat_mm = paket["berat_mm"]
+    keuntungan = paket["keuntungan"]
+    urutan_dataset = paket["urutan_dataset"]
+    urutan_greedy = paket["urutan_greedy"]
+    termurah = paket["termurah"]
+
+    # Semua besaran bulat seperti inti hitung(): mm, rupiah, basis poin
+    total_kain = np.asarray(daftar_total_kain, dtype=np.float64)
+    total_mm = np.rint(total_kain * MM_PER_METER).astype(np.int64)
+    n_kain, n_ukuran = berat_mm.shape
+    n_total, n_campuran = len(total_kain), len(daftar_persentase)
+
+    basis_poin = np.zeros((n_campuran, n_ukuran), dtype=np.int64)
+    pakai_persen = np.zeros(n_campuran, dtype=bool)
+    for c, campuran in enumerate(daftar_persentase):
+        if campuran and any(v > 0 for v in campuran.values()):
+            pakai_persen[c] = True
+            for uk, v in campuran.items():
+                if uk in kolom:
+                    basis_poin[c, kolom[uk]] = ke_basis_poin(v)
+
+    bentuk = (n_kain, n_total, n_campuran)
+    hasil = np.zeros(bentuk + (n_ukuran,), dtype=np.int64)
+    total_keuntungan = np.zeros(bentuk, dtype=np.int64)
+    sisa = np.broadcast_to(total_mm[None, :, None], bentuk).copy()
+    baris = np.arange(n_kain)
+    T = total_mm[None, :, None]
+    dengan_persen = pakai_persen[None, None, :]
+
+    def tambah(j, jumlah, aktif):
+        # Menambahkan jumlah pakaian pada kolom j (satu kolom per kain) di skenario aktif
+        nonlocal total_keuntungan, sisa
+        jumlah = np.where(aktif, jumlah, 0)
+        hasil[baris, :, :, j] += jumlah
+        total_keuntungan = total_keuntungan + jumlah * keuntungan[baris, j][:, None, None]
+        sisa = np.where(aktif, sisa - jumlah * berat_mm[baris, j][:, None, None], sisa)
+
+    # Validasi total persentase (basis poin, hanya ukuran yang tersedia di kain)
+    total_persen = np.zeros((n_kain, n_campuran), dtype=np.int64)
+    for p in range(n_ukuran):
+        j = urutan_dataset[:, p]
+        ada = j >= 0
+        total_persen = total_persen + np.where(ada[:, None], basis_poin[:, np.maximum(j, 0)].T, 0)
+    valid = (urutan_dataset[:, 0] >= 0)[:, None] & ~(pakai_persen[None, :] & (total_persen > BASIS_POIN_PENUH))
+    valid = np.broadcast_to(valid[:, None, :], bentuk)
+
+    # Tahap 1: alokasi berdasarkan persentase
+    for p in range(n_ukuran):
+        j = urutan_dataset[:, p]
+        ada = (j >= 0)[:, None, None]
+        jm = np.maximum(j, 0)
+        bp = basis_poin[:, jm].T[:, None, :]
+        jumlah = (T * bp) // (BASIS_POIN_PENUH * berat_mm[baris, jm][:, None, None])
+        tambah(jm, jumlah, ada & dengan_persen & (bp > 0) & (jumlah > 0))
+
+    # Tahap 2: greedy berdasarkan rasio
+    for p in range(n_ukuran):
+        j = urutan_greedy[:, p]
+        ada = (j >= 0)[:, None, None]
+        jm = np.maximum(j, 0)
+        jumlah = sisa // berat_mm[baris, jm][:, None, None]
+        # Cabang persentase hanya berjalan jika sisa > 0
+        aktif = ada & np.where(dengan_persen, sisa > 0, True)
+        tambah(jm, jumlah, aktif & (jumlah > 0))
+
+    # Tahap 3: optimasi sisa ke ukuran termurah
+    if optimasi_sisa:
+        jm = np.maximum(termurah, 0)
+        ada = (termurah >= 0)[:, None, None]
+        jumlah = sisa // berat_mm[baris, jm][:, None, None]
+        tambah(jm, jumlah, ada & (sisa > 0) & (jumlah > 0))
+
+    return HasilBatch(paket["jenis_kain"], ukuran, total_kain, hasil, total_keuntungan, sisa / MM_PER_METER, valid,
+                      paket["meter_per_ukuran"])
@@ -1,14 +1,121 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from logic import hitung_produksi, rekomendasi_kain
+from logic import SolverInkremental, fase_instrumen, kurva_keuntungan, rekomendasi_kain
+from grafik import GrafikKurva, GrafikPareto, GrafikProduksi, pramuat_matplotlib
+from pareto import frontier_pareto
+from riwayat import URUTAN_RIWAYAT, RiwayatRun, bandingkan_run
+from cache import CacheHasil
+from indeks import IndeksKain
+from katalog import KatalogKain, muat_daftar_produk
+from instrumentasi import Instrumentasi, aktifkan_log_file, profil
 from data import DATASET_KAIN
-import json
 import os
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import queue
+import threading
+import time
 from functools import partial
 
 
+class TabelVirtual:
+    """
+    Treeview virtual: hanya baris yang terlihat yang menjadi item Tk.
+
+    Baris diambil per blok lewat ambil_blok(offset, batas) dan di-cache; saat digulir,
+    item yang sama diisi ulang dengan nilai baris lain. Pilihan disimpan sebagai kunci
+    baris (kolom pertama) sehingga tetap ada walau barisnya sedang tidak terlihat.
+    """
+
+    BLOK = 100
+    MAKS_BLOK = 20
+
+    def __init__(self, master, kolom, ambil_blok, format_baris, tinggi=15, saat_pilih=None):
+        self.ambil_blok = ambil_blok
+        self.format_baris = format_baris
+        self.tinggi = tinggi
+        self.saat_pilih = saat_pilih
+        self.total = 0
+        self.awal = 0
+        self.terpilih = []  # Kunci baris terpilih, urut saat dipilih
+        self._blok = {}
+        self._kunci_item = {}
+
+        frame = ttk.Frame(master)
+        frame.pack(fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self._gulir)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree = ttk.Treeview(frame, columns=[ident for ident, _, _ in kolom], show="headings", height=tinggi,
+                                 selectmode="extended")
+        for ident, lebar, judul in kolom:
+            self.tree.heading(ident, text=judul, anchor="center")
+            self.tree.column(ident, width=lebar, anchor="center")
+        self.tree.pack(fill="both", expand=True)
+        self.tree.bind("<<TreeviewSelect>>", self._saat_select)
+        self.tree.bind("<MouseWheel>", lambda e: self._gulir("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self._gulir("scroll", -1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self._gulir("scroll", 1, "units"))
+
+    def muat_ulang(self, total):
+        """Sumber data berubah (filter/urutan/baris baru): cache dibuang, kembali ke baris pertama"""
+        self.total = total
+        self.awal = 0
+        self._blok.clear()
+        self.terpilih = []
+        self._render()
+
+    def _baris(self, i):
+        nomor = i // self.BLOK
+        blok = self._blok.get(nomor)
+        if blok is None:
+            blok = self.ambil_blok(nomor * self.BLOK, self.BLOK)
+            self._blok[nomor] = blok
+            if len(self._blok) > self.MAKS_BLOK:
+                del self._blok[next(iter(self._blok))]
+        j = i - nomor * self.BLOK
+        return blok[j] if j < len(blok) else None
+
+    def _render(self):
+        baris = [b for b in (self._baris(i) for i in range(self.awal, min(self.awal + self.tinggi, self.total)))
+                 if b is not None]
+        item = self.tree.get_children()
+        for iid in item[len(baris):]:
+            self.tree.delete(iid)
+            self._kunci_item.pop(iid, None)
+        pilih = []
+        for posisi, b in enumerate(baris):
+            iid = f"baris{posisi}"
+            if posisi < len(item):
+                self.tree.item(iid, values=self.format_baris(b))
+            else:
+                self.tree.insert("", "end", iid=iid, values=self.format_baris(b))
+            self._kunci_item[iid] = b[0]
+            if b[0] in self.terpilih:
+                pilih.append(iid)
+        # <<TreeviewSelect>> dari pemulihan ini idempoten: terpilih tidak berubah
+        self.tree.selection_set(pilih)
+        if self.total:
+            self.scrollbar.set(self.awal / self.total, min(self.awal + self.tinggi, self.total) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _gulir(self, aksi, jumlah, satuan=None):
+        if aksi == "moveto":
+            awal = int(float(jumlah) * self.total)
+        else:
+            awal = self.awal + int(jumlah) * (self.tinggi if satuan == "pages" else 1)
+        awal = max(0, min(awal, self.total - self.tinggi))
+        if awal != self.awal:
+            self.awal = awal
+            self._render()
+
+    def _saat_select(self, event=None):
+        terlihat = {self._kunci_item[iid] for iid in self.tree.get_children()}
+        dipilih = [self._kunci_item[iid] for iid in self.tree.selection()]
+        self.terpilih = [k for k in self.terpilih if k not in terlihat or k in dipilih]
+        self.terpilih += [k for k in dipilih if k not in self.terpilih]
+        if self.saat_pilih is not None:
+            self.saat_pilih(self.terpilih)
+
+
 class OptimasiApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -20,8 +127,7 @@ class OptimasiApp(tk.Tk):
         # Load daftar produk dari JSON
         jenispakaian_path = os.path.join(os.path.dirname(__file__), 'data', 'jenispakaian.json')
         try:
-            with open(jenispakaian_path, 'r', encoding='utf-8') as f:
-                self.daftar_produk = json.load(f)
+            self.daftar_produk = muat_daftar_produk(jenispakaian_path)
         except Exception:
             self.daftar_produk = ["Kemeja", "Celana panjang", "Seragam", "Dress", "Blus", "Jas", "Legging", "Gaun", "Jeans"]
             messagebox.showwarning("Peringatan", "Gagal memuat daftar produk, menggunakan default.")
@@ -31,16 +137,63 @@ class OptimasiApp(tk.Tk):
         self.style.theme_use("clam")
         self.configure_styles()
 
-        # Dataset
+        # Dataset: katalog eksternal di data/ jika ada (dimuat ulang otomatis), selain itu data.py
         self.dataset = DATASET_KAIN
+        for nama in ('katalog_kain.json', 'katalog_kain.csv', 'katalog_kain.sqlite'):
+            path_katalog = os.path.join(os.path.dirname(__file__), 'data', nama)
+            if os.path.exists(path_katalog):
+                try:
+                    # Pemeriksaan perubahan hanya dari thread utama (lihat periksa_katalog)
+                    self.dataset = KatalogKain(path_katalog, interval_cek=None)
+                except Exception as e:
+                    messagebox.showwarning("Peringatan", f"Gagal memuat katalog {nama}: {e}")
+                break
+        self.indeks = IndeksKain(self.dataset)
         self.jenis_kain = list(self.dataset.keys())[0]
         self.ukuran_fokus = None
         self.optimasi_sisa = False
         self.produk_target = "Kemeja"  # Default
         self.updating_percentages = False  # Flag to prevent recursive updates
 
-        # UI
+        # Worker latar belakang: hasil dikirim lewat antrian dan dibaca dengan after()
+        self.antrian_hasil = queue.Queue()
+        self.id_proses = 0  # Hanya hasil dengan id terbaru yang ditampilkan
+        self.sedang_menghitung = False
+        self.jadwal_periksa = None
+
+        # Pratinjau langsung: debounce ketikan lalu hitung ulang secara inkremental
+        self.solver_inkremental = SolverInkremental()
+        self.jadwal_pratinjau = None
+        self.grafik = None  # GrafikProduksi tab hasil, dibuat sekali lalu dipakai ulang
+        self.grafik_kurva = None  # GrafikKurva (dibuat saat kurva pertama dihitung)
+        self.grafik_pareto = None  # GrafikPareto (dibuat saat frontier pertama dihitung)
+        self.frontier = None  # FrontierPareto terakhir, sumber rencana saat titik diklik
+        self.nilai_tabel = {}  # ukuran -> nilai baris yang sedang tampil di tabel hasil
+
+        # Cache hasil: LRU di memori + SQLite agar tetap ada setelah aplikasi ditutup
+        try:
+            self.cache = CacheHasil(path_db=os.path.join(os.path.dirname(__file__), 'data', 'cache_hasil.sqlite'))
+        except Exception:
+            self.cache = CacheHasil()
+
+        # Riwayat run: setiap hasil perhitungan disimpan untuk dibandingkan dan dibuka ulang
+        try:
+            self.riwayat = RiwayatRun(os.path.join(os.path.dirname(__file__), 'data', 'riwayat_run.sqlite'))
+        except Exception:
+            self.riwayat = RiwayatRun()
+        self.riwayat_berubah = False  # Ditandai saat run disimpan; daftar dimuat ulang saat tab riwayat dibuka
+        self.filter_riwayat = {}  # Filter aktif tabel riwayat (jenis_kain, produk, sejak, sampai)
+        self.tab_riwayat_siap = False
+
+        # Instrumentasi per fase: status bar + log JSON di data/instrumentasi.log
+        self.path_log_instrumentasi = os.path.join(os.path.dirname(__file__), 'data', 'instrumentasi.log')
+
+        # UI: tab input langsung tampil; tab hasil + matplotlib dimuat setelah paint pertama
+        self.tab_hasil_siap = False
         self.buat_antarmuka()
+        self.after(200, self._muat_latar)
+        if isinstance(self.dataset, KatalogKain):
+            self.after(2000, self.periksa_katalog)
 
     def configure_styles(self):
         """Configure custom styles for widgets"""
@@ -71,6 +224,10 @@ class OptimasiApp(tk.Tk):
                      background=[('selected', '#f0f0f0')])
 
     def buat_antarmuka(self):
+        # Status bar: waktu per fase dari run terakhir yang diinstrumentasi
+        self.label_status = ttk.Label(self, text="", relief="sunken", anchor="w", padding=(8, 2))
+        self.label_status.pack(side="bottom", fill="x")
+
         # Canvas untuk scrolling
         canvas_frame = ttk.Frame(self)
         canvas_frame.pack(fill="both", expand=True)
@@ -147,6 +304,8 @@ class OptimasiApp(tk.Tk):
 
         self.ukuran_vars = {}
         self.persentase_vars = {}
+        self.batas_min_vars = {}
+        self.batas_max_vars = {}
 
         # Add a label for remaining percentage
         self.label_sisa_persen = ttk.Label(
@@ -154,7 +313,7 @@ class OptimasiApp(tk.Tk):
             text="Sisa Persentase: 100%",
             style="TLabel"
         )
-        self.label_sisa_persen.grid(row=0, column=2, padx=10, pady=5, sticky="e")
+        self.label_sisa_persen.grid(row=0, column=6, padx=10, pady=5, sticky="e")
 
         # Add an "Auto Fill" button
         self.btn_auto_fill = ttk.Button(
@@ -163,7 +322,7 @@ class OptimasiApp(tk.Tk):
             command=self.auto_fill_percentages,
             style="TButton"
         )
-        self.btn_auto_fill.grid(row=0, column=3, padx=10, pady=5, sticky="e")
+        self.btn_auto_fill.grid(row=0, column=7, padx=10, pady=5, sticky="e")
 
         self.update_ukuran_controls()
 
@@ -175,6 +334,33 @@ class OptimasiApp(tk.Tk):
             text="Optimasi untuk Minimasi Sisa Kain",
             variable=self.optimasi_sisa_var
         ).pack(anchor="w")
+        self.solver_eksak_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            opsi_frame,
+            text="Gunakan Solver Eksak (Knapsack)",
+            variable=self.solver_eksak_var
+        ).pack(anchor="w")
+        self.pratinjau_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            opsi_frame,
+            text="Pratinjau Langsung (hitung ulang saat persentase diedit)",
+            variable=self.pratinjau_var,
+            command=self.jadwalkan_pratinjau
+        ).pack(anchor="w")
+        self.label_pratinjau = ttk.Label(opsi_frame, text="", style="TLabel", foreground="#7f8c8d")
+        self.label_pratinjau.pack(anchor="w")
+        self.instrumentasi_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            opsi_frame,
+            text="Instrumentasi per Fase (status bar + log JSON)",
+            variable=self.instrumentasi_var
+        ).pack(anchor="w")
+        self.profil_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            opsi_frame,
+            text="Profil cProfile untuk Perhitungan Berikutnya",
+            variable=self.profil_var
+        ).pack(anchor="w")
 
         button_frame = ttk.Frame(self.tab_input)
         button_frame.pack(pady=20)
@@ -185,10 +371,45 @@ class OptimasiApp(tk.Tk):
             style="TButton"
         )
         self.tombol_hitung.pack(pady=10, ipadx=20, ipady=5)
+        self.progress = ttk.Progressbar(button_frame, mode="indeterminate", length=250)
+        self.progress.pack(pady=(0, 5))
+        self.tombol_batal = ttk.Button(
+            button_frame,
+            text="Batal",
+            command=self.batalkan_optimasi,
+            style="TButton",
+            state="disabled"
+        )
+        self.tombol_batal.pack()
 
-        # Tab Hasil
+        # Tab Hasil: isinya dibangun saat pertama dibutuhkan (lihat _pastikan_tab_hasil)
         self.tab_hasil = ttk.Frame(self.notebook)
         self.notebook.add(self.tab_hasil, text="Hasil Optimasi")
+        # Tab Riwayat: dibangun saat pertama dibuka (lihat _pastikan_tab_riwayat)
+        self.tab_riwayat = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_riwayat, text="Riwayat & Perbandingan")
+        self.notebook.bind("<<NotebookTabChanged>>", self._saat_tab_berubah)
+
+        self.update_rekomendasi_kain()
+
+    def _muat_latar(self):
+        """Setelah jendela tampil: impor matplotlib di thread latar, bangun tab hasil saat idle"""
+        threading.Thread(target=pramuat_matplotlib, daemon=True).start()
+        self.after_idle(self._pastikan_tab_hasil)
+
+    def _saat_tab_berubah(self, event=None):
+        if self.notebook.select() == str(self.tab_hasil):
+            self._pastikan_tab_hasil()
+        elif self.notebook.select() == str(self.tab_riwayat):
+            self._pastikan_tab_riwayat()
+            if self.riwayat_berubah:
+                self.muat_riwayat()
+
+    def _pastikan_tab_hasil(self):
+        """Membangun isi tab hasil (tabel, wadah grafik, ringkasan) sekali saja"""
+        if self.tab_hasil_siap:
+            return
+        self.tab_hasil_siap = True
         results_container = ttk.Frame(self.tab_hasil)
         results_container.pack(fill="both", expand=True, padx=20, pady=20)
         top_frame = ttk.Frame(results_container)
@@ -237,11 +458,62 @@ class OptimasiApp(tk.Tk):
         )
         self.label_total.pack()
 
-        self.update_rekomendasi_kain()
+        # Kurva keuntungan: semua panjang kain 0..N dalam satu tabel DP
+        kurva_frame = ttk.LabelFrame(results_container, text="Kurva Keuntungan vs Panjang Kain", padding=10)
+        kurva_frame.pack(fill="both", expand=True, pady=(10, 0))
+        kontrol_kurva = ttk.Frame(kurva_frame)
+        kontrol_kurva.pack(fill="x")
+        ttk.Label(kontrol_kurva, text="Panjang Maks (m):").pack(side="left", padx=(0, 5))
+        self.entri_kurva_maks = ttk.Entry(kontrol_kurva, width=10)
+        self.entri_kurva_maks.insert(0, "200")
+        self.entri_kurva_maks.pack(side="left", padx=(0, 10))
+        ttk.Label(kontrol_kurva, text="Resolusi (m):").pack(side="left", padx=(0, 5))
+        self.entri_kurva_resolusi = ttk.Entry(kontrol_kurva, width=8)
+        self.entri_kurva_resolusi.insert(0, "1")
+        self.entri_kurva_resolusi.pack(side="left", padx=(0, 10))
+        ttk.Button(kontrol_kurva, text="Hitung Kurva", command=self.hitung_kurva, style="TButton").pack(side="left")
+        self.label_kurva = ttk.Label(kontrol_kurva, text="", style="TLabel")
+        self.label_kurva.pack(side="left", padx=10)
+        self.kurva_container = ttk.Frame(kurva_frame)
+        self.kurva_container.pack(fill="both", expand=True)
+
+        # Frontier Pareto: keuntungan vs sisa kain vs deviasi campuran; klik titik memuat rencananya
+        pareto_frame = ttk.LabelFrame(results_container, text="Frontier Pareto (Keuntungan / Sisa / Deviasi Campuran)",
+                                      padding=10)
+        pareto_frame.pack(fill="both", expand=True, pady=(10, 0))
+        kontrol_pareto = ttk.Frame(pareto_frame)
+        kontrol_pareto.pack(fill="x")
+        ttk.Button(kontrol_pareto, text="Hitung Frontier", command=self.hitung_pareto,
+                   style="TButton").pack(side="left")
+        self.label_pareto = ttk.Label(kontrol_pareto, text="Klik titik untuk memuat rencananya ke tabel",
+                                      style="TLabel")
+        self.label_pareto.pack(side="left", padx=10)
+        self.pareto_container = ttk.Frame(pareto_frame)
+        self.pareto_container.pack(fill="both", expand=True)
+
+    def periksa_katalog(self):
+        """Memuat ulang kain yang berubah di file katalog tanpa restart aplikasi"""
+        try:
+            berubah = self.dataset.periksa_perubahan()
+        except Exception:
+            berubah = set()
+        if berubah:
+            for jenis_kain in berubah:
+                if jenis_kain in self.dataset:
+                    self.indeks.perbarui(jenis_kain)
+                else:
+                    self.indeks.hapus(jenis_kain)
+            self.combo_kain.config(values=list(self.dataset.keys()))
+            if self.combo_kain.get() in berubah:
+                if self.combo_kain.get() not in self.dataset:
+                    self.combo_kain.current(0)
+                self.update_ukuran_controls()
+            self.update_rekomendasi_kain()
+        self.after(2000, self.periksa_katalog)
 
     def update_rekomendasi_kain(self, event=None):
         self.produk_target = self.combo_produk.get()
-        rekomendasi = rekomendasi_kain(self.dataset, self.produk_target)
+        rekomendasi = rekomendasi_kain(self.dataset, self.produk_target, self.indeks)
         self.label_rekomendasi.config(text=f"Rekomendasi: {', '.join(rekomendasi)}")
         if self.combo_kain.get() not in rekomendasi:
             self.combo_kain.set(rekomendasi[0] if rekomendasi else "")
@@ -259,6 +531,8 @@ class OptimasiApp(tk.Tk):
         # Reset variabel kontrol
         self.ukuran_vars = {}
         self.persentase_vars = {}
+        self.batas_min_vars = {}
+        self.batas_max_vars = {}
 
         # Buat kontrol baru
         for i, ukuran in enumerate(ukuran_tersedia):
@@ -280,13 +554,21 @@ class OptimasiApp(tk.Tk):
             entry.bind("<FocusOut>", partial(self.on_percentage_change, ukuran))
             entry.bind("<KeyRelease>", partial(self.on_percentage_change, ukuran))
 
+            # Batas jumlah pakaian (kosong = tidak dibatasi)
+            for kolom, teks, variabel in ((2, "Min", self.batas_min_vars), (4, "Maks", self.batas_max_vars)):
+                ttk.Label(self.persentase_frame, text=teks).grid(row=i, column=kolom, padx=(10, 2), pady=2, sticky="e")
+                variabel[ukuran] = tk.StringVar(value="")
+                entry_batas = ttk.Entry(self.persentase_frame, textvariable=variabel[ukuran], width=7)
+                entry_batas.grid(row=i, column=kolom + 1, padx=2, pady=2, sticky="w")
+                entry_batas.bind("<KeyRelease>", lambda e: self.jadwalkan_pratinjau())
+
         # Buat ulang label sisa persentase
         self.label_sisa_persen = ttk.Label(
             self.persentase_frame,
             text="Sisa Persentase: 100%",
             style="TLabel"
         )
-        self.label_sisa_persen.grid(row=0, column=2, padx=10, pady=5, sticky="e")
+        self.label_sisa_persen.grid(row=0, column=6, padx=10, pady=5, sticky="e")
 
         # Tambahkan tombol "Isi Otomatis"
         self.btn_auto_fill = ttk.Button(
@@ -295,7 +577,7 @@ class OptimasiApp(tk.Tk):
             command=self.auto_fill_percentages,
             style="TButton"
         )
-        self.btn_auto_fill.grid(row=0, column=3, padx=10, pady=5, sticky="e")
+        self.btn_auto_fill.grid(row=0, column=7, padx=10, pady=5, sticky="e")
 
     def on_checkbox_change(self, ukuran):
         if self.updating_percentages:
@@ -303,6 +585,7 @@ class OptimasiApp(tk.Tk):
         if not self.ukuran_vars[ukuran].get():
             self.persentase_vars[ukuran].set("0")
         self.redistribute_percentages()
+        self.jadwalkan_pratinjau()
 
     def on_percentage_change(self, ukuran, *args):
         if self.updating_percentages:
@@ -317,6 +600,7 @@ class OptimasiApp(tk.Tk):
             if persen > 0 and not self.ukuran_vars[ukuran].get():
                 self.ukuran_vars[ukuran].set(True)
             self.redistribute_percentages()
+            self.jadwalkan_pratinjau()
         except ValueError:
             pass
 
@@ -362,67 +646,471 @@ class OptimasiApp(tk.Tk):
             if self.ukuran_vars[uk].get()
         }
 
+    def get_batas_dict(self, variabel):
+        batas = {}
+        for uk, var in variabel.items():
+            nilai = var.get().strip()
+            if not nilai or not self.ukuran_vars[uk].get():
+                continue
+            if not nilai.isdigit():
+                raise ValueError(f"Batas jumlah ukuran {uk.upper()} harus bilangan bulat >= 0")
+            batas[uk] = int(nilai)
+        return batas
+
+    def _baca_input(self):
+        """Membaca dan memvalidasi input; mengembalikan argumen (keyword) untuk hitung()"""
+        total_kain = float(self.entri_kain.get())
+        if total_kain <= 0:
+            raise ValueError("Total kain harus lebih besar dari 0")
+        jenis_kain = self.combo_kain.get()
+        self.ukuran_fokus = [uk for uk, var in self.ukuran_vars.items() if var.get()]
+        if not self.ukuran_fokus:
+            raise ValueError("Pilih minimal satu ukuran untuk difokuskan")
+        persentase = self.get_persentase_dict()
+        total_persen = sum(persentase.values())
+        if total_persen > 100:
+            raise ValueError("Total persentase tidak boleh melebihi 100%")
+        self.optimasi_sisa = self.optimasi_sisa_var.get()
+        solver = "exact" if self.solver_eksak_var.get() else "greedy"
+        batas_min = self.get_batas_dict(self.batas_min_vars)
+        batas_max = self.get_batas_dict(self.batas_max_vars)
+        for uk, minimum in batas_min.items():
+            if uk in batas_max and minimum > batas_max[uk]:
+                raise ValueError(f"Batas minimum ukuran {uk.upper()} melebihi batas maksimum")
+        return dict(total_kain=total_kain, jenis_kain=jenis_kain, dataset=self.dataset, ukuran_fokus=self.ukuran_fokus,
+                    optimasi_sisa=self.optimasi_sisa, persentase=persentase, solver=solver, indeks=self.indeks,
+                    batas_min=batas_min or None, batas_max=batas_max or None)
+
     def jalankan_optimasi(self):
         try:
-            total_kain = float(self.entri_kain.get())
-            if total_kain <= 0:
-                raise ValueError("Total kain harus lebih besar dari 0")
-            jenis_kain = self.combo_kain.get()
-            self.ukuran_fokus = [uk for uk, var in self.ukuran_vars.items() if var.get()]
-            if not self.ukuran_fokus:
-                raise ValueError("Pilih minimal satu ukuran untuk difokuskan")
-            persentase = self.get_persentase_dict()
-            total_persen = sum(persentase.values())
-            if total_persen > 100:
-                raise ValueError("Total persentase tidak boleh melebihi 100%")
-            self.optimasi_sisa = self.optimasi_sisa_var.get()
-            hasil, keuntungan_total, sisa_kain, fig = hitung_produksi(
-                total_kain,
-                jenis_kain,
-                self.dataset,
-                self.ukuran_fokus,
-                self.optimasi_sisa,
-                persentase
-            )
+            argumen = self._baca_input()
+        except ValueError as e:
+            messagebox.showerror("Input Tidak Valid", str(e))
+            self.entri_kain.focus_set()
+            return
 
-            for item in self.tabel_hasil.get_children():
-                self.tabel_hasil.delete(item)
+        instrumen = self._buat_instrumen()
+        path_profil = None
+        if self.profil_var.get():
+            # Profil hanya untuk satu run, lalu opsi dimatikan lagi
+            self.profil_var.set(False)
+            path_profil = os.path.join(os.path.dirname(__file__), 'data',
+                                       time.strftime("profil_%Y%m%d_%H%M%S.prof"))
 
-            for ukuran, jumlah in hasil.items():
-                meter = self.dataset[jenis_kain]["meter_per_ukuran"][ukuran]
-                keuntungan = self.dataset[jenis_kain]["keuntungan_per_pakaian"][ukuran]
-                total_meter_ukuran = meter * jumlah
-                total_keuntungan_ukuran = keuntungan * jumlah
-                self.tabel_hasil.insert(
-                    "", "end",
-                    values=(
-                        ukuran.upper(),
-                        jumlah,
-                        f"{meter:.2f} m",
-                        f"{total_meter_ukuran:.2f} m",
-                        f"Rp{int(keuntungan):,}".replace(",", "."),
-                        f"Rp{int(total_keuntungan_ukuran):,}".replace(",", ".")
-                    )
-                )
-
-            for widget in self.graph_container.winfo_children():
-                widget.destroy()
-
-            canvas = FigureCanvasTkAgg(fig, master=self.graph_container)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
-            plt.close(fig)
-
-            efisiensi = (total_kain - sisa_kain) / total_kain * 100
-            self.label_total.config(
-                text=f"Total Keuntungan: Rp{int(keuntungan_total):,} | "
-                     f"Sisa Kain: {sisa_kain:.2f} m | Efisiensi: {efisiensi:.1f}%",
-                foreground="#27ae60"
-            )
+        # Klik berulang: proses lama tetap selesai di latar belakang, tapi hasilnya dibuang
+        self.id_proses += 1
+        threading.Thread(target=self._kerja_optimasi,
+                         args=(self.id_proses, argumen, instrumen, path_profil, self.combo_produk.get()),
+                         daemon=True).start()
+        self._set_sibuk(True)
+
+    def _buat_instrumen(self):
+        if not self.instrumentasi_var.get():
+            return None
+        try:
+            aktifkan_log_file(self.path_log_instrumentasi)
+        except OSError:
+            pass  # Status bar tetap berjalan walau log tidak bisa ditulis
+        return Instrumentasi()
+
+    def _kerja_optimasi(self, id_proses, argumen, instrumen=None, path_profil=None, produk=None):
+        """Dijalankan di thread worker: tidak boleh menyentuh widget Tk"""
+        try:
+            mulai = time.perf_counter()
+            if path_profil:
+                hasil, _ = profil(self.cache.hitung, **argumen, instrumen=instrumen, path=path_profil)
+            else:
+                hasil = self.cache.hitung(**argumen, instrumen=instrumen)
+            durasi_ms = (time.perf_counter() - mulai) * 1000
+            # Riwayat disimpan di thread UI setelah cek id_proses, jadi run usang/dibatalkan tidak tercatat
+            self.antrian_hasil.put((id_proses, hasil, None, instrumen, path_profil, (argumen, produk, durasi_ms)))
+        except Exception as e:
+            self.antrian_hasil.put((id_proses, None, e, instrumen, path_profil, None))
+
+    def _periksa_antrian(self):
+        self.jadwal_periksa = None
+        try:
+            while True:
+                id_proses, hasil, error, instrumen, path_profil, run = self.antrian_hasil.get_nowait()
+                if id_proses != self.id_proses:
+                    continue  # Hasil usang dari klik sebelumnya atau proses yang dibatalkan
+                self._set_sibuk(False)
+                if error is not None:
+                    if isinstance(error, ValueError):
+                        messagebox.showerror("Input Tidak Valid", str(error))
+                    else:
+                        messagebox.showerror("Error", f"Terjadi kesalahan: {str(error)}")
+                    return
+                self._simpan_riwayat(hasil, instrumen, *run)
+                self.tampilkan_hasil(hasil, instrumen)
+                if path_profil:
+                    self.label_status.config(text=f"{self.label_status.cget('text')} | Profil: {path_profil}")
+        except queue.Empty:
+            pass
+        if self.sedang_menghitung:
+            self.jadwal_periksa = self.after(50, self._periksa_antrian)
+
+    def _simpan_riwayat(self, hasil, instrumen, argumen, produk, durasi_ms):
+        try:
+            self.riwayat.simpan(hasil, argumen, produk, durasi_ms,
+                                instrumen.ringkasan()["fase"] if instrumen is not None else None)
+            self.riwayat_berubah = True
+        except Exception:
+            pass  # Riwayat yang gagal ditulis tidak membatalkan hasil perhitungan
+
+    def _set_sibuk(self, sibuk):
+        if sibuk and self.jadwal_periksa is None:
+            self.jadwal_periksa = self.after(50, self._periksa_antrian)
+        self.sedang_menghitung = sibuk
+        if sibuk:
+            self.progress.start(10)
+            self.tombol_batal.config(state="normal")
+        else:
+            self.progress.stop()
+            self.tombol_batal.config(state="disabled")
+
+    def batalkan_optimasi(self):
+        # Thread tidak bisa dihentikan paksa; hasilnya cukup ditandai usang
+        self.id_proses += 1
+        self._set_sibuk(False)
+
+    def tampilkan_hasil(self, hasil_optimasi, instrumen=None, keuntungan_per_pakaian=None):
+        """keuntungan_per_pakaian: keuntungan tersimpan (run riwayat); None memakai dataset sekarang"""
+        try:
+            self._pastikan_tab_hasil()
+            total_kain = hasil_optimasi.total_kain
+            _, keuntungan_total, sisa_kain = hasil_optimasi
+
+            self._perbarui_tabel(hasil_optimasi, keuntungan_per_pakaian)
+            self._perbarui_grafik(hasil_optimasi, instrumen=instrumen)
+
+            self._perbarui_ringkasan(keuntungan_total, sisa_kain, total_kain, hasil_optimasi.kendala)
+            self.solver_inkremental.hasil_terakhir = hasil_optimasi  # Acuan diff pratinjau berikutnya
             self.notebook.select(self.tab_hasil)
+            self._laporkan_instrumen(instrumen, "hitung", hasil_optimasi)
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Terjadi kesalahan: {str(e)}")
+
+    def _nilai_baris(self, ukuran, jumlah, meter, keuntungan):
+        total_meter_ukuran = meter * jumlah
+        return (
+            ukuran.upper(),
+            jumlah,
+            f"{meter:.2f} m",
+            f"{total_meter_ukuran:.2f} m",
+            f"Rp{int(keuntungan):,}".replace(",", ".") if keuntungan is not None else "-",
+            f"Rp{int(keuntungan * jumlah):,}".replace(",", ".") if keuntungan is not None else "-"
+        )
 
+    def _perbarui_tabel(self, hasil_optimasi, keuntungan_per_pakaian=None):
+        """
+        Diff baris lama vs baru: hapus, sisipkan, pindahkan, atau ubah hanya yang berbeda.
+
+        Meter per ukuran diambil dari hasil itu sendiri; keuntungan per pakaian dari
+        keuntungan_per_pakaian (run riwayat) atau dataset sekarang, "-" jika tidak ada.
+        """
+        hasil = hasil_optimasi.hasil_produksi
+        if keuntungan_per_pakaian is None:
+            data_kain = self.dataset.get(hasil_optimasi.jenis_kain) or {}
+            keuntungan_per_pakaian = data_kain.get("keuntungan_per_pakaian", {})
+        for item in self.tabel_hasil.get_children():
+            if item not in hasil:
+                self.tabel_hasil.delete(item)
+                self.nilai_tabel.pop(item, None)
+        for posisi, (ukuran, jumlah) in enumerate(hasil.items()):
+            nilai = self._nilai_baris(ukuran, jumlah, hasil_optimasi.meter_per_ukuran[ukuran],
+                                      keuntungan_per_pakaian.get(ukuran))
+            if not self.tabel_hasil.exists(ukuran):
+                self.tabel_hasil.insert("", posisi, iid=ukuran, values=nilai)
+            else:
+                if self.nilai_tabel.get(ukuran) != nilai:
+                    self.tabel_hasil.item(ukuran, values=nilai)
+                if self.tabel_hasil.index(ukuran) != posisi:
+                    self.tabel_hasil.move(ukuran, "", posisi)
+            self.nilai_tabel[ukuran] = nilai
+
+    def _perbarui_grafik(self, hasil_optimasi, berubah=None, instrumen=None):
+        """Satu figure/canvas per tab hasil; artist diperbarui di tempat lalu draw_idle"""
+        with fase_instrumen(instrumen, "grafik"):
+            if self.grafik is None:
+                self.grafik = GrafikProduksi(self.graph_container)
+                self.grafik.gambar_ulang(hasil_optimasi)
+            else:
+                self.grafik.perbarui(hasil_optimasi, berubah)
+        if instrumen is not None:
+            # Saat diukur, canvas digambar sinkron agar waktu render Tk ikut tercatat
+            with instrumen.fase("render_canvas"):
+                self.grafik.canvas.draw()
+
+    def _laporkan_instrumen(self, instrumen, sumber, hasil_optimasi):
+        if instrumen is None:
+            return
+        self.label_status.config(text=f"[{sumber}] {instrumen.teks_status()}")
+        instrumen.log_json(sumber=sumber, jenis_kain=hasil_optimasi.jenis_kain,
+                           total_kain=hasil_optimasi.total_kain, cache=self.cache.statistik())
+
+    def hitung_kurva(self):
+        """Kurva keuntungan optimal (solver eksak, tanpa persentase) untuk kain dan fokus ukuran saat ini"""
+        try:
+            argumen = self._baca_input()
+            total_kain, jenis_kain = argumen["total_kain"], argumen["jenis_kain"]
+            panjang_maks = float(self.entri_kurva_maks.get())
+            resolusi = float(self.entri_kurva_resolusi.get())
+            if panjang_maks <= 0 or resolusi <= 0:
+                raise ValueError("Panjang maksimum dan resolusi harus lebih besar dari 0")
+            if panjang_maks / resolusi > 100000:
+                raise ValueError("Terlalu banyak titik kurva (maksimal 100.000); perbesar resolusi")
+            kurva = kurva_keuntungan(jenis_kain, self.dataset, panjang_maks, resolusi, argumen["ukuran_fokus"])
         except ValueError as e:
             messagebox.showerror("Input Tidak Valid", str(e))
-            self.entri_kain.focus_set()
-        except Exception as e:
-            messagebox.showerror("Error", f"Terjadi kesalahan: {str(e)}")
\ No newline at end of file
+            return
+
+        if self.grafik_kurva is None:
+            self.grafik_kurva = GrafikKurva(self.kurva_container)
+        penanda = total_kain if total_kain <= panjang_maks else None
+        self.grafik_kurva.gambar(kurva, penanda)
+
+        i = kurva.indeks_terdekat(total_kain)
+        self.label_kurva.config(
+            text=f"Di {kurva.panjang[i]:g} m: Rp{int(kurva.keuntungan[i]):,} | "
+                 f"Meter berikutnya: +Rp{int(kurva.nilai_marjinal[i]):,} | Sisa {kurva.sisa_kain[i]:.2f} m"
+        )
+
+    def hitung_pareto(self):
+        """Frontier Pareto untuk kain, panjang, fokus ukuran, dan persentase saat ini"""
+        try:
+            argumen = self._baca_input()
+            frontier = frontier_pareto(argumen["total_kain"], argumen["jenis_kain"], self.dataset,
+                                       argumen["persentase"], argumen["ukuran_fokus"], indeks=self.indeks)
+        except ValueError as e:
+            messagebox.showerror("Input Tidak Valid", str(e))
+            return
+
+        self.frontier = frontier
+        if self.grafik_pareto is None:
+            self.grafik_pareto = GrafikPareto(self.pareto_container, self.pilih_titik_pareto)
+        self.grafik_pareto.gambar(frontier)
+        self.label_pareto.config(
+            text=f"{len(frontier)} rencana tak terdominasi dari {frontier.statistik['kandidat']:,} kandidat | "
+                 f"Keuntungan maks Rp{int(frontier.keuntungan[0]):,} | Klik titik untuk memuat rencananya"
+        )
+
+    def pilih_titik_pareto(self, i):
+        """Memuat rencana titik frontier ke-i ke tabel, grafik, dan ringkasan tab hasil"""
+        frontier = self.frontier
+        self.tampilkan_hasil(frontier.hasil(i))
+        self.grafik_pareto.tandai(frontier.sisa_kain[i], frontier.keuntungan[i])
+        self.label_pareto.config(
+            text=f"Titik {i + 1}/{len(frontier)}: Rp{int(frontier.keuntungan[i]):,} | "
+                 f"Sisa {frontier.sisa_kain[i]:.2f} m | Deviasi campuran {frontier.deviasi[i]:.2f}%"
+        )
+
+    def _pastikan_tab_riwayat(self):
+        """Membangun isi tab riwayat (filter, tabel virtual, perbandingan) sekali saja"""
+        if self.tab_riwayat_siap:
+            return
+        self.tab_riwayat_siap = True
+        container = ttk.Frame(self.tab_riwayat)
+        container.pack(fill="both", expand=True, padx=20, pady=20)
+
+        filter_frame = ttk.LabelFrame(container, text="Filter", padding=10)
+        filter_frame.pack(fill="x")
+        ttk.Label(filter_frame, text="Kain:").pack(side="left", padx=(0, 5))
+        self.combo_filter_kain = ttk.Combobox(filter_frame, width=14, state="readonly")
+        self.combo_filter_kain.pack(side="left", padx=(0, 10))
+        ttk.Label(filter_frame, text="Produk:").pack(side="left", padx=(0, 5))
+        self.combo_filter_produk = ttk.Combobox(filter_frame, width=14, state="readonly")
+        self.combo_filter_produk.pack(side="left", padx=(0, 10))
+        ttk.Label(filter_frame, text="Sejak:").pack(side="left", padx=(0, 5))
+        self.entri_filter_sejak = ttk.Entry(filter_frame, width=11)
+        self.entri_filter_sejak.pack(side="left", padx=(0, 10))
+        ttk.Label(filter_frame, text="Sampai:").pack(side="left", padx=(0, 5))
+        self.entri_filter_sampai = ttk.Entry(filter_frame, width=11)
+        self.entri_filter_sampai.pack(side="left", padx=(0, 10))
+        ttk.Label(filter_frame, text="Urut:").pack(side="left", padx=(0, 5))
+        self.combo_urut_riwayat = ttk.Combobox(filter_frame, values=list(URUTAN_RIWAYAT), width=10,
+                                               state="readonly")
+        self.combo_urut_riwayat.current(0)
+        self.combo_urut_riwayat.pack(side="left", padx=(0, 10))
+        ttk.Button(filter_frame, text="Terapkan", command=self.muat_riwayat, style="TButton").pack(side="left")
+        for widget in (self.combo_filter_kain, self.combo_filter_produk, self.combo_urut_riwayat):
+            widget.bind("<<ComboboxSelected>>", lambda e: self.muat_riwayat())
+        for widget in (self.entri_filter_sejak, self.entri_filter_sampai):
+            widget.bind("<Return>", lambda e: self.muat_riwayat())
+
+        self.label_riwayat = ttk.Label(container, text="", style="TLabel")
+        self.label_riwayat.pack(anchor="w", pady=(10, 5))
+        kolom = [
+            ("waktu", 140, "Waktu"),
+            ("produk", 110, "Produk"),
+            ("kain", 100, "Kain"),
+            ("total", 90, "Total Kain"),
+            ("solver", 70, "Solver"),
+            ("untung", 140, "Keuntungan"),
+            ("sisa", 90, "Sisa"),
+            ("durasi", 90, "Durasi"),
+        ]
+        self.tabel_riwayat = TabelVirtual(container, kolom, self._ambil_blok_riwayat, self._format_baris_riwayat,
+                                          saat_pilih=self._saat_riwayat_dipilih)
+        self.tabel_riwayat.tree.bind("<Double-1>", lambda e: self.buka_run())
+
+        tombol_frame = ttk.Frame(container)
+        tombol_frame.pack(fill="x", pady=10)
+        ttk.Button(tombol_frame, text="Buka Run", command=self.buka_run, style="TButton").pack(side="left")
+        ttk.Button(tombol_frame, text="Bandingkan 2 Run", command=self.bandingkan_riwayat,
+                   style="TButton").pack(side="left", padx=10)
+        ttk.Button(tombol_frame, text="Hapus", command=self.hapus_riwayat, style="TButton").pack(side="left")
+
+        diff_frame = ttk.LabelFrame(container, text="Perbandingan (B - A)", padding=10)
+        diff_frame.pack(fill="both", expand=True)
+        self.tabel_diff = ttk.Treeview(diff_frame, columns=("ukuran", "a", "b", "selisih"), show="headings",
+                                       height=6)
+        for ident, judul in (("ukuran", "Ukuran"), ("a", "Run A"), ("b", "Run B"), ("selisih", "Selisih")):
+            self.tabel_diff.heading(ident, text=judul, anchor="center")
+            self.tabel_diff.column(ident, width=120, anchor="center")
+        self.tabel_diff.pack(fill="x")
+        self.label_diff = ttk.Label(diff_frame, text="Pilih dua run lalu klik 'Bandingkan 2 Run'", style="TLabel",
+                                    justify="left")
+        self.label_diff.pack(anchor="w", pady=(10, 0))
+        self.muat_riwayat()
+
+    def _filter_riwayat(self):
+        return dict(jenis_kain=self.combo_filter_kain.get() or None, produk=self.combo_filter_produk.get() or None,
+                    sejak=self.entri_filter_sejak.get().strip() or None,
+                    sampai=self.entri_filter_sampai.get().strip() or None)
+
+    def _ambil_blok_riwayat(self, offset, batas):
+        return self.riwayat.halaman(offset, batas, self.combo_urut_riwayat.get(), **self.filter_riwayat)
+
+    @staticmethod
+    def _format_baris_riwayat(baris):
+        _, waktu, produk, jenis_kain, total_kain, solver, keuntungan, sisa_kain, durasi_ms = baris
+        return (
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(waktu)),
+            produk or "-",
+            jenis_kain,
+            f"{total_kain:g} m",
+            solver,
+            f"Rp{int(keuntungan):,}".replace(",", "."),
+            f"{sisa_kain:.2f} m",
+            f"{durasi_ms:.1f} ms" if durasi_ms is not None else "-",
+        )
+
+    def muat_riwayat(self):
+        """Menerapkan filter: hanya COUNT dan blok baris yang terlihat yang dibaca dari SQLite"""
+        self._pastikan_tab_riwayat()
+        self.riwayat_berubah = False
+        try:
+            self.filter_riwayat = self._filter_riwayat()
+            total = self.riwayat.jumlah(**self.filter_riwayat)
+        except ValueError as e:
+            messagebox.showerror("Input Tidak Valid", str(e))
+            return
+        self.combo_filter_kain.config(values=[""] + self.riwayat.nilai_kolom("jenis_kain"))
+        self.combo_filter_produk.config(values=[""] + self.riwayat.nilai_kolom("produk"))
+        self.tabel_riwayat.muat_ulang(total)
+        self.label_riwayat.config(text=f"{total:,} run")
+
+    def _saat_riwayat_dipilih(self, terpilih):
+        self.label_riwayat.config(text=f"{self.tabel_riwayat.total:,} run | {len(terpilih)} dipilih")
+
+    def buka_run(self):
+        """Menampilkan run terpilih di tab hasil dari data tersimpan, tanpa menghitung ulang"""
+        if not self.tabel_riwayat.terpilih:
+            return
+        try:
+            entri = self.riwayat.muat(self.tabel_riwayat.terpilih[-1])
+        except KeyError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.tampilkan_hasil(entri.hasil(), keuntungan_per_pakaian=entri.keuntungan_per_pakaian)
+        self.label_status.config(
+            text=f"[riwayat] Run #{entri.id} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(entri.waktu))}), "
+                 f"dihitung {entri.durasi_ms or 0:.1f} ms")
+
+    def bandingkan_riwayat(self):
+        """Diff dua run terpilih terakhir: jumlah per ukuran, keuntungan, sisa kain, dan input yang berbeda"""
+        terpilih = self.tabel_riwayat.terpilih
+        if len(terpilih) < 2:
+            messagebox.showinfo("Perbandingan", "Pilih dua run (Ctrl+klik) untuk dibandingkan")
+            return
+        try:
+            a, b = self.riwayat.muat(terpilih[-2]), self.riwayat.muat(terpilih[-1])
+        except KeyError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        diff = bandingkan_run(a, b)
+        self.tabel_diff.delete(*self.tabel_diff.get_children())
+        for ukuran, (na, nb, selisih) in diff["ukuran"].items():
+            self.tabel_diff.insert("", "end", values=(ukuran.upper(), na, nb, f"{selisih:+d}"))
+        ua, ub, su = diff["total_keuntungan"]
+        sa, sb, ss = diff["sisa_kain"]
+        teks = (f"A = run #{a.id}, B = run #{b.id}\n"
+                f"Keuntungan: Rp{int(ua):,} → Rp{int(ub):,} ({'+' if su >= 0 else '-'}Rp{abs(int(su)):,})\n"
+                f"Sisa kain: {sa:.2f} m → {sb:.2f} m ({ss:+.2f} m)")
+        if diff["input"]:
+            teks += "\nInput berbeda: " + "; ".join(f"{k}: {va} → {vb}" for k, (va, vb) in diff["input"].items())
+        self.label_diff.config(text=teks)
+
+    def hapus_riwayat(self):
+        terpilih = self.tabel_riwayat.terpilih
+        if not terpilih or not messagebox.askyesno("Hapus Riwayat", f"Hapus {len(terpilih)} run terpilih?"):
+            return
+        for id_run in terpilih:
+            self.riwayat.hapus(id_run)
+        self.muat_riwayat()
+
+    def _perbarui_ringkasan(self, keuntungan_total, sisa_kain, total_kain, kendala=None):
+        efisiensi = (total_kain - sisa_kain) / total_kain * 100
+        teks = (f"Total Keuntungan: Rp{int(keuntungan_total):,} | "
+                f"Sisa Kain: {sisa_kain:.2f} m | Efisiensi: {efisiensi:.1f}%")
+        warna = "#27ae60"
+        if kendala:
+            label_status = {"tidak_layak": "TIDAK LAYAK", "mengikat_min": "mengikat min",
+                            "mengikat_max": "mengikat maks"}
+            daftar = [f"{uk.upper()} {label_status[info['status']]}" for uk, info in kendala.items()
+                      if info["status"] != "longgar"]
+            if daftar:
+                teks += "\nBatas: " + ", ".join(daftar)
+            if any(info["status"] == "tidak_layak" for info in kendala.values()):
+                warna = "#e67e22"
+        self.label_total.config(text=teks, foreground=warna)
+
+    def jadwalkan_pratinjau(self):
+        """Debounce: pratinjau dijalankan 120 ms setelah ketikan terakhir"""
+        if self.jadwal_pratinjau is not None:
+            self.after_cancel(self.jadwal_pratinjau)
+            self.jadwal_pratinjau = None
+        if self.pratinjau_var.get():
+            self.jadwal_pratinjau = self.after(120, self.jalankan_pratinjau)
+
+    def jalankan_pratinjau(self):
+        self.jadwal_pratinjau = None
+        mulai = time.perf_counter()
+        instrumen = self._buat_instrumen()
+        try:
+            hasil_optimasi, berubah = self.solver_inkremental.hitung(**self._baca_input(), instrumen=instrumen)
+        except ValueError as e:
+            self.label_pratinjau.config(text=f"Pratinjau: {e}")
+            return
+
+        # Hanya baris tabel dan batang grafik yang berubah yang disentuh
+        self._pastikan_tab_hasil()
+        self._perbarui_tabel(hasil_optimasi)
+        self._perbarui_grafik(hasil_optimasi, berubah, instrumen)
+        self._laporkan_instrumen(instrumen, "pratinjau", hasil_optimasi)
+
+        self._perbarui_ringkasan(hasil_optimasi.total_keuntungan, hasil_optimasi.sisa_kain, hasil_optimasi.total_kain,
+                                 hasil_optimasi.kendala)
+        ringkasan = (f"Pratinjau: Rp{int(hasil_optimasi.total_keuntungan):,} | "
+                     f"Sisa {hasil_optimasi.sisa_kain:.2f} m | {len(berubah)} ukuran berubah")
+
+        # Callback idle berjalan setelah draw_idle canvas, jadi latensi mencakup render
+        def selesai():
+            latensi = (time.perf_counter() - mulai) * 1000
+            self.label_pratinjau.config(
+                text=f"{ringkasan} | Latensi: {latensi:.1f} ms",
+                foreground="#27ae60" if latensi <= 50 else "#e74c3c"
+            )
+        self.after_idle(selesai)